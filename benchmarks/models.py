@@ -0,0 +1,135 @@
+#! coding=utf-8
+"""
+DOClient model benchmark.
+
+Measures construction time, retained memory and missing attribute
+reads for schema-declared slotted models against the dynamic
+attribute objects they replaced, building image and droplet network
+models from stand-in API payloads:
+
+    dynamic     per-instance __dict__ and props list, recursive
+                __getattr__ for missing attributes
+    slotted     schema-compiled __slots__ models
+
+Usage::
+
+    python benchmarks/models.py --counts 10000 100000
+"""
+__author__ = "Sriram Velamur <sriram.velamur@gmail.com>"
+
+import sys
+sys.dont_write_bytecode = True
+from argparse import ArgumentParser
+from json import dumps
+from os.path import abspath, dirname
+from time import perf_counter
+from tracemalloc import start, stop, take_snapshot
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+from doclient.droplet import Image
+from doclient.meta import DropletNetwork
+
+
+class DynamicObject(object):
+
+    """Dynamic attribute object, as models were before schemas"""
+
+    props = []
+    private_props = ("id", "token")
+
+    def __init__(self, **kwargs):
+        if not self.props:
+            self.props = []
+        for name, value in kwargs.items():
+            if name in self.private_props:
+                name = "_{}".format(name)
+            setattr(self, name, value)
+            if name not in self.props:
+                self.props.append(name)
+
+    def __getattr__(self, key):
+        try:
+            if key == "id":
+                return self._id
+            return self.key
+        except RuntimeError:
+            return None
+
+
+def payloads(count):
+    r"""Image and network payloads shaped like APIv2 responses"""
+    images = [{
+        "id": 50000 + idx, "name": "image-{0}".format(idx),
+        "slug": "image-{0}".format(idx), "distribution": "Ubuntu",
+        "type": "snapshot", "public": False, "regions": ["nyc3"],
+        "min_disk_size": 20, "size_gigabytes": 2.4,
+        "created_at": "2018-01-17T00:00:00Z"
+    } for idx in range(count)]
+    networks = [{
+        "network_type": "ipv4", "ip_address": "10.0.{0}.{1}".format(
+            idx // 250 % 250, idx % 250),
+        "netmask": "255.255.0.0", "gateway": "10.0.0.1",
+        "is_public": bool(idx % 2)
+    } for idx in range(count)]
+    return {"image": images, "network": networks}
+
+
+def measure(cls, items, missing_reads):
+    r"""Construction seconds, retained bytes and missing read seconds"""
+    start()
+    began = perf_counter()
+    objects = [cls(**item) for item in items]
+    built = perf_counter() - began
+    retained = sum(stat.size for stat in
+                   take_snapshot().statistics("filename"))
+    stop()
+    began = perf_counter()
+    for obj in objects[:missing_reads]:
+        obj.status
+    missing = perf_counter() - began
+    return built, retained, missing
+
+
+def main():
+    r"""Benchmark entry point"""
+    parser = ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--counts", type=int, nargs="+",
+                        default=[10000, 100000])
+    parser.add_argument("--missing-reads", type=int, default=1000)
+    parser.add_argument("--json", action="store_true",
+                        help="Emit machine-readable results")
+    args = parser.parse_args()
+
+    models = {"image": Image, "network": DropletNetwork}
+    results = []
+    for count in args.counts:
+        for kind, items in payloads(count).items():
+            for variant, cls in (("dynamic", DynamicObject),
+                                 ("slotted", models[kind])):
+                built, retained, missing = measure(
+                    cls, items, args.missing_reads)
+                results.append({
+                    "model": kind, "variant": variant, "count": count,
+                    "construct_seconds": built,
+                    "retained_bytes": retained,
+                    "missing_read_us": missing * 1e6 / min(
+                        count, args.missing_reads),
+                })
+
+    if args.json:
+        print(dumps({"benchmark": "models", "results": results}))
+        return
+    print("{0:<8} {1:<8} {2:>8} {3:>12} {4:>12} {5:>14}".format(
+        "model", "variant", "count", "construct ms", "retained MB",
+        "missing read us"))
+    for result in results:
+        print("{0:<8} {1:<8} {2:>8} {3:>12.1f} {4:>12.1f} {5:>14.2f}"
+              .format(result["model"], result["variant"],
+                      result["count"], result["construct_seconds"] * 1000,
+                      result["retained_bytes"] / 1048576.0,
+                      result["missing_read_us"]))
+
+
+if __name__ == "__main__":
+    main()
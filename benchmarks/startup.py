@@ -0,0 +1,84 @@
+#! coding=utf-8
+"""
+DOClient start-up benchmark.
+
+Measures time-to-first-call (client construction followed by a single
+droplet power action) against a local stand-in API with simulated
+network latency, for each start-up mode:
+
+    sequential  droplets, account and keys loaded one after another
+    eager       droplets, account and keys loaded in parallel (default)
+    lazy        nothing loaded until first accessed
+
+Usage::
+
+    python benchmarks/startup.py --droplets 500 --latency 0.05
+"""
+__author__ = "Sriram Velamur <sriram.velamur@gmail.com>"
+
+import sys
+sys.dont_write_bytecode = True
+from argparse import ArgumentParser
+from json import dumps
+from os.path import abspath, dirname
+from time import perf_counter
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+from doclient import DOClient
+from doclient.testing import FakeAPIServer
+
+
+def first_call(server, mode):
+    r"""
+    Construct a client in the requested mode and place one
+    power action. Returns the elapsed time in seconds.
+    """
+    start = perf_counter()
+    client = DOClient(server.token, api_base=server.api_base,
+                      lazy=mode != "eager")
+    if mode == "sequential":
+        client.get_droplets()
+        client.get_user_information()
+        client.get_ssh_keys()
+    client.poweroff_droplet(100000)
+    elapsed = perf_counter() - start
+    client.close()
+    return elapsed
+
+
+def main():
+    r"""Benchmark entry point"""
+    parser = ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--droplets", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--json", action="store_true",
+                        help="Emit machine-readable results")
+    args = parser.parse_args()
+
+    results = {}
+    with FakeAPIServer(droplets=args.droplets, ssh_keys=10,
+                       latency=args.latency) as server:
+        for mode in ("sequential", "eager", "lazy"):
+            timings = sorted(first_call(server, mode)
+                             for _ in range(args.rounds))
+            results[mode] = {
+                "min": timings[0],
+                "median": timings[len(timings) // 2],
+                "max": timings[-1],
+            }
+
+    if args.json:
+        print(dumps({"benchmark": "startup", "droplets": args.droplets,
+                     "latency": args.latency, "results": results}))
+        return
+    print("Time to first call, {0} droplets, {1:.0f}ms latency".format(
+        args.droplets, args.latency * 1000))
+    for mode, timing in results.items():
+        print("  {0:<11} median {1:8.1f}ms  min {2:8.1f}ms".format(
+            mode, timing["median"] * 1000, timing["min"] * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+#! coding=utf-8
+"""
+DOClient offline benchmark suite.
+
+Runs the client's main code paths against a local stand-in API
+(doclient.testing.FakeAPIServer) serving a synthetic account, and
+reports min / median / max timings per scenario:
+
+    construct       DOClient construction, loading droplets, account
+                    and keys
+    warm_start      DOClient construction restored from an inventory
+                    store snapshot
+    hydrate         get_droplets over the whole inventory
+    get_droplet     ID lookups over the loaded inventory
+    filter          name substring, prefix and pattern lookups
+    bulk_power      poweroff_droplets on a batch of droplets
+    create          create_droplets with a batch of names
+
+Results can be written as JSON and compared against a baseline run
+to catch regressions between releases; the exit status is 1 when any
+median is slower than the baseline by more than the tolerance.
+
+Usage::
+
+    python benchmarks/suite.py --droplets 2000 --latency 0.005 \\
+        --output results.json
+    python benchmarks/suite.py --baseline results.json
+    python benchmarks/suite.py --transport memory
+"""
+__author__ = "Sriram Velamur <sriram.velamur@gmail.com>"
+
+import sys
+sys.dont_write_bytecode = True
+from argparse import ArgumentParser
+from json import dump, dumps, load
+from os.path import abspath, dirname, join
+from platform import python_implementation, python_version
+from tempfile import TemporaryDirectory
+from time import perf_counter, time
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+from doclient import DOClient
+from doclient import codec
+from doclient.store import InventoryStore
+from doclient.testing import FakeAPIServer
+from doclient.transport import Urllib3Transport
+
+
+def timed(server, function, rounds, setup=None):
+    r"""
+    Time a scenario over several rounds, counting the API requests
+    it places.
+
+    :param server: Stand-in API the scenario runs against.
+    :param function: Scenario, called with setup's return value.
+    :param rounds: Number of rounds.
+    :param setup: Untimed per-round preparation.
+    :rtype: dict
+    """
+    timings, requests = [], 0
+    for _ in range(rounds):
+        state = setup() if setup else None
+        server.reset_log()
+        start = perf_counter()
+        function(state)
+        timings.append(perf_counter() - start)
+        requests += server.count()
+    timings.sort()
+    return {"min": timings[0], "median": timings[len(timings) // 2],
+            "max": timings[-1], "rounds": rounds,
+            "requests": requests // rounds}
+
+
+def run(args):
+    r"""Run every scenario and return the results"""
+    results = {}
+    server = FakeAPIServer(droplets=args.droplets, images=args.images,
+                           snapshots=args.snapshots, domains=args.domains,
+                           ssh_keys=10, latency=args.latency)
+    if args.transport != "memory":
+        server.start()
+
+    def make_client(lazy=False, store=None):
+        if args.transport == "memory":
+            return DOClient(server.token, api_base=server.memory_api_base,
+                            transport=server.transport(), lazy=lazy,
+                            store=store)
+        transport = Urllib3Transport() \
+            if args.transport == "urllib3" else None
+        return DOClient(server.token, api_base=server.api_base,
+                        transport=transport, lazy=lazy, store=store)
+
+    try:
+        results["construct"] = timed(
+            server, lambda _: make_client().close(), args.rounds)
+        with TemporaryDirectory() as directory:
+            path = join(directory, "inventory.db")
+            make_client(store=InventoryStore(path)).close()
+            results["warm_start"] = timed(
+                server, lambda store: (make_client(store=store).close(),
+                                       store.close()),
+                args.rounds, lambda: InventoryStore(path))
+        results["hydrate"] = timed(
+            server, lambda client: client.get_droplets(), args.rounds,
+            lambda: make_client(lazy=True))
+
+        client = make_client()
+        ids = [droplet.id for droplet in client.droplets]
+        probes = [ids[idx % len(ids)] for idx in range(args.lookups)]
+        results["get_droplet"] = timed(
+            server, lambda _: [client.get_droplet(droplet_id)
+                               for droplet_id in probes],
+            args.rounds)
+
+        queries = [("droplet-0012", False), ("droplet-00", True),
+                   ("t-00[1-3]4$", False), ("12", False)]
+        queries = queries * max(args.lookups // 100, 1)
+        results["filter"] = timed(
+            server, lambda _: [client.filter_droplets(query, prefix=prefix)
+                               for query, prefix in queries],
+            args.rounds)
+
+        batch = ids[:args.batch]
+        results["bulk_power"] = timed(
+            server, lambda _: client.poweroff_droplets(batch),
+            args.rounds)
+
+        names = ["bench-{0:04d}".format(idx) for idx in range(args.batch)]
+        results["create"] = timed(
+            server, lambda _: client.create_droplets(
+                names, "nyc3", "s-1vcpu-1gb", "ubuntu-18-04-x64"),
+            args.rounds)
+        client.close()
+    finally:
+        server.stop()
+    return results
+
+
+def regressions(results, baseline, tolerance):
+    r"""Scenarios whose median is slower than the baseline's"""
+    slower = {}
+    for name, result in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous or not previous.get("median"):
+            continue
+        ratio = result["median"] / previous["median"]
+        if ratio > 1 + tolerance:
+            slower[name] = ratio
+    return slower
+
+
+def main():
+    r"""Benchmark entry point"""
+    parser = ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--droplets", type=int, default=1000)
+    parser.add_argument("--images", type=int, default=200)
+    parser.add_argument("--snapshots", type=int, default=2)
+    parser.add_argument("--domains", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--lookups", type=int, default=10000)
+    parser.add_argument("--batch", type=int, default=50)
+    parser.add_argument("--transport", default="requests",
+                        choices=("requests", "urllib3", "memory"),
+                        help="Transport placing requests; memory serves "
+                             "the stand-in API in-process, with no "
+                             "network")
+    parser.add_argument("--json", action="store_true",
+                        help="Emit machine-readable results")
+    parser.add_argument("--output", help="Write JSON results to a file")
+    parser.add_argument("--baseline",
+                        help="JSON results of a previous run to compare")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed median slowdown against the "
+                             "baseline, as a fraction")
+    args = parser.parse_args()
+
+    report = {
+        "benchmark": "suite",
+        "timestamp": int(time()),
+        "python": "{0} {1}".format(python_implementation(),
+                                   python_version()),
+        "json_backend": codec.backend,
+        "config": {name: getattr(args, name) for name in (
+            "droplets", "images", "snapshots", "domains", "latency",
+            "rounds", "lookups", "batch", "transport")},
+        "results": run(args),
+    }
+    if args.output:
+        with open(args.output, "w") as output:
+            dump(report, output, indent=2, sort_keys=True)
+
+    slower = {}
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            slower = regressions(report["results"], load(baseline),
+                                 args.tolerance)
+        report["regressions"] = slower
+
+    if args.json:
+        print(dumps(report, sort_keys=True))
+    else:
+        print("{0} droplets, {1:.1f}ms latency, {2}, {3} JSON, {4} "
+              "transport".format(args.droplets, args.latency * 1000,
+                                 report["python"], codec.backend,
+                                 args.transport))
+        for name, result in report["results"].items():
+            print("  {0:<12} median {1:9.2f}ms  min {2:9.2f}ms{3}".format(
+                name, result["median"] * 1000, result["min"] * 1000,
+                "  SLOWER x{0:.2f}".format(slower[name])
+                if name in slower else ""))
+    if slower:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,17 @@
 #! coding=utf-8
 """DigitalOcean APIv2 client package"""
 __author__ = "Sriram Velamur<sriram.velamur@gmail.com>"
-__all__ = ("APIAuthError", "DOClient", "Droplet")
+__all__ = ("APIAuthError", "AsyncDOClient", "DOClient", "DOClientPool",
+           "Droplet")
 
 import sys
 sys.dont_write_bytecode = True
+from logging import getLogger, NullHandler
 
 from .errors import APIAuthError
 from .client import DOClient
 from .droplet import Droplet
+from .aio import AsyncDOClient
+from .pool import DOClientPool
+
+getLogger(__name__).addHandler(NullHandler())
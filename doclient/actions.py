@@ -0,0 +1,270 @@
+#! coding=utf-8
+"""
+DigitalOcean APIv2 actions module.
+Provides action handles and the action completion polling engine.
+"""
+__author__ = "Sriram Velamur <sriram.velamur@gmail.com>"
+__all__ = ("Action", "AsyncAction", "async_wait_all", "wait_all")
+
+import sys
+sys.dont_write_bytecode = True
+import asyncio
+from time import monotonic, sleep
+
+from .base import BaseObject
+from .errors import ActionError
+
+
+class Action(BaseObject):
+
+    r"""
+    DigitalOcean action handle. Returned by droplet actions and
+    refreshed from the /v2/actions/{id} resource.
+
+    :property status: in-progress, completed or errored.
+    :property type: Action type, e.g. power_off.
+    :property resource_id: ID of the resource acted upon.
+    """
+
+    client, status, type, started_at, completed_at = (None,) * 5
+    resource_id, resource_type, region_slug = (None,) * 3
+
+    def __repr__(self):
+        return "Action {0} [{1}: {2}]".format(
+            self.id, self.type, self.status)
+
+    def __str__(self):
+        return "Action {0} [{1}: {2}]".format(
+            self.id, self.type, self.status)
+
+    def as_dict(self):
+        """Returns a dictionary representation of an Action"""
+        return {"id": self.id, "type": self.type,
+                "status": self.status,
+                "resource_id": self.resource_id}
+
+    @property
+    def done(self):
+        r"""True once the action has completed or errored"""
+        return self.status in ("completed", "errored")
+
+    @property
+    def failed(self):
+        r"""True if the action errored"""
+        return self.status == "errored"
+
+    def apply(self, payload):
+        r"""
+        Update the handle from an APIv2 action payload.
+
+        :param payload: Action payload.
+        :type  payload: dict
+        """
+        for name in ("status", "type", "started_at", "completed_at",
+                     "resource_id", "resource_type", "region_slug"):
+            if name in payload:
+                setattr(self, name, payload[name])
+
+    def refresh(self):
+        r"""
+        Refresh the action's status from the API.
+
+        :rtype: :class:`Action <.Action>`
+        """
+        response = self.client.api_request(
+            url=self.client.action_url % self.id)
+        self.apply(response.get("action") or {})
+        return self
+
+    def wait(self, timeout=None):
+        r"""
+        Wait for the action to complete.
+
+        :param timeout: Seconds to wait before giving up.
+        :type  timeout: float
+        :rtype: :class:`Action <.Action>`
+        """
+        return self.client.wait_for_action(self, timeout=timeout)
+
+
+class AsyncAction(Action):
+
+    r"""
+    Action handle returned by the asyncio client, whose refresh and
+    wait are coroutines.
+    """
+
+    async def refresh(self):
+        r"""
+        Refresh the action's status from the API.
+
+        :rtype: :class:`AsyncAction <.AsyncAction>`
+        """
+        response = await self.client.api_request(
+            self.client.action_url % self.id)
+        self.apply(response.get("action") or {})
+        return self
+
+    async def wait(self, timeout=None):
+        r"""
+        Wait for the action to complete.
+
+        :param timeout: Seconds to wait before giving up.
+        :type  timeout: float
+        :rtype: :class:`AsyncAction <.AsyncAction>`
+        """
+        return await self.client.wait_for_action(self, timeout=timeout)
+
+
+def wait_all(client, actions, timeout=None, raise_on_error=True):
+    r"""
+    Poll until all of the actions have completed or errored.
+
+    Polling starts at client.action_poll_interval seconds and backs
+    off by client.action_poll_backoff up to
+    client.action_poll_max_interval. With fewer than
+    client.action_batch_threshold actions pending, each one is
+    refreshed on its own; beyond that one pass over the account's
+    action listing (newest first) refreshes all of them, stopping as
+    soon as every pending action has been seen.
+
+    :param client: Client to poll through.
+    :type  client: :class:`DOClient <doclient.client.DOClient>`
+    :param actions: Action handles to wait on.
+    :type  actions: list (:class:`Action <.Action>`)
+    :param timeout: Seconds to wait before giving up.
+    :type  timeout: float
+    :param raise_on_error: Raise if any action errored.
+    :type  raise_on_error: bool
+    :raises: :class:`ActionError <doclient.errors.ActionError>`
+    :rtype: list (:class:`Action <.Action>`)
+    """
+    for delay, pending, batched in _polls(client, actions, timeout):
+        sleep(delay)
+        if batched:
+            _refresh_from_listing(client, pending)
+        else:
+            for action in list(pending.values()):
+                action.refresh()
+    return _settled(actions, raise_on_error)
+
+
+async def async_wait_all(client, actions, timeout=None,
+                         raise_on_error=True):
+    r"""
+    Coroutine polling until all of the actions have completed or
+    errored, as :func:`wait_all` does, for the asyncio client.
+
+    :param client: Client to poll through.
+    :type  client: :class:`AsyncDOClient <doclient.aio.AsyncDOClient>`
+    :param actions: Action handles to wait on.
+    :type  actions: list (:class:`AsyncAction <.AsyncAction>`)
+    :param timeout: Seconds to wait before giving up.
+    :type  timeout: float
+    :param raise_on_error: Raise if any action errored.
+    :type  raise_on_error: bool
+    :raises: :class:`ActionError <doclient.errors.ActionError>`
+    :rtype: list (:class:`AsyncAction <.AsyncAction>`)
+    """
+    for delay, pending, batched in _polls(client, actions, timeout):
+        await asyncio.sleep(delay)
+        if batched:
+            await _async_refresh_from_listing(client, pending)
+        else:
+            await asyncio.gather(*[action.refresh()
+                                   for action in pending.values()])
+    return _settled(actions, raise_on_error)
+
+
+def _polls(client, actions, timeout):
+    r"""
+    Polling schedule of :func:`wait_all` and :func:`async_wait_all`.
+    Yields (delay, pending, batched) while any action is pending:
+    the caller sleeps for delay seconds, then refreshes the pending
+    actions (a dict by ID), from the action listing when batched.
+
+    :raises: :class:`ActionError <doclient.errors.ActionError>` once
+             the timeout has passed.
+    """
+    pending = dict((action.id, action) for action in actions
+                   if not action.done)
+    deadline = monotonic() + timeout if timeout is not None else None
+    interval = client.action_poll_interval
+
+    while pending:
+        delay = interval
+        if deadline is not None:
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                raise ActionError("Timed out waiting for actions {0}".format(
+                    ", ".join(str(_id) for _id in sorted(pending))))
+            delay = min(delay, remaining)
+        yield delay, pending, \
+            len(pending) >= client.action_batch_threshold
+        interval = min(interval * client.action_poll_backoff,
+                       client.action_poll_max_interval)
+
+        for action_id in [_id for _id, action in pending.items()
+                          if action.done]:
+            pending.pop(action_id)
+
+
+def _settled(actions, raise_on_error):
+    r"""Return settled actions, raising if any errored"""
+    failed = [action for action in actions if action.failed]
+    if failed and raise_on_error:
+        raise ActionError("Actions errored: {0}".format(
+            ", ".join(str(action.id) for action in failed)))
+    return actions
+
+
+def _refresh_from_listing(client, pending):
+    r"""
+    Refresh pending actions from the account's action listing.
+    Actions not found in the listing are refreshed on their own.
+    """
+    unseen = set(pending)
+    oldest = min(unseen)
+    listing = client.iter_pages(client.actions_url, "actions",
+                                concurrency=1)
+    try:
+        for payload in listing:
+            if _apply_listed(pending, unseen, oldest, payload):
+                break
+    finally:
+        listing.close()
+    for action_id in unseen:
+        pending[action_id].refresh()
+
+
+async def _async_refresh_from_listing(client, pending):
+    r"""
+    Refresh pending actions from the account's action listing,
+    for the asyncio client.
+    """
+    unseen = set(pending)
+    oldest = min(unseen)
+    listing = client.iter_pages(client.actions_url, "actions",
+                                concurrency=1)
+    try:
+        async for payload in listing:
+            if _apply_listed(pending, unseen, oldest, payload):
+                break
+    finally:
+        await listing.aclose()
+    await asyncio.gather(*[pending[action_id].refresh()
+                           for action_id in unseen])
+
+
+def _apply_listed(pending, unseen, oldest, payload):
+    r"""
+    Apply an action listing payload to its pending action. Returns
+    whether the listing scan is done: every pending action has been
+    seen, or the newest first listing has passed the oldest one.
+    """
+    action_id = payload.get("id")
+    if action_id in unseen:
+        pending[action_id].apply(payload)
+        unseen.discard(action_id)
+    return not unseen or (isinstance(action_id, int)
+                          and action_id < oldest)
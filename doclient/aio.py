@@ -0,0 +1,995 @@
+#! coding=utf-8
+#pylint: disable=R0904,R0913,C0413
+"""
+DigitalOcean APIv2 asyncio client module.
+Requires aiohttp, available with the do-client[async] extra.
+"""
+__author__ = "Sriram Velamur <sriram.velamur@gmail.com>"
+__all__ = ("AsyncDOClient",)
+
+import sys
+sys.dont_write_bytecode = True
+import asyncio
+from collections import deque
+from itertools import islice
+from math import ceil
+from time import perf_counter
+from urllib.parse import quote
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+from .client import BaseClient
+from .droplet import Image, DropletSize
+from .meta import Domain, Kernel, SSHKey, Snapshot
+from .dns import DomainRecord, diff_records, parse_zone_file
+from .errors import APIAuthError, InvalidArgumentError, \
+    APIError, NetworkError, BaseError
+from .user import DOUser
+from .actions import AsyncAction, async_wait_all
+from .helpers import get_next_page
+from .codec import dumps as json_dumps, loads
+from .singleflight import AsyncSingleFlight
+from .keys import SSHKeyRegistry
+
+
+class AsyncDOClient(BaseClient):
+
+    r"""
+    DigitalOcean APIv2 asyncio client.
+
+    Mirrors the :class:`DOClient <doclient.client.DOClient>` surface
+    with awaitable methods placed over one shared aiohttp connection
+    pool. Account state is loaded on entering the client's context::
+
+        async with AsyncDOClient(token) as client:
+            droplets = await client.get_droplets()
+            await client.poweroff_droplets([d.id for d in droplets])
+    """
+
+    _session = None
+    domains_url = "domains"
+
+    def __init__(self, token, pool_size=None, keep_alive=None,
+                 api_base=None, page_concurrency=None, lazy=False,
+                 rate_limiter=None, catalog_cache=None):
+        r"""
+        DigitalOcean APIv2 asyncio client init
+
+        :param token: DigitalOcean API authentication token
+        :type  token: str
+        :param pool_size: Maximum number of pooled connections kept
+                          open to the API. Also bounds bulk helper
+                          concurrency. Defaults to 10.
+        :type  pool_size: int
+        :param keep_alive: Reuse connections across requests.
+                           Defaults to True.
+        :type  keep_alive: bool
+        :param api_base: Base URL of the APIv2 endpoint.
+        :type  api_base: str
+        :param page_concurrency: Maximum number of listing pages
+                                 fetched in parallel. Defaults to 4.
+        :type  page_concurrency: int
+        :param lazy: Skip loading droplets, account information and
+                     SSH keys when entering the client's context.
+        :type  lazy: bool
+        :param rate_limiter: Request scheduler. Defaults to a new
+                             limiter per client.
+        :type  rate_limiter: :class:`RateLimiter
+                             <doclient.ratelimit.RateLimiter>`
+        :param catalog_cache: Catalog cache. Defaults to a new
+                              in-memory cache per client.
+        :type  catalog_cache: :class:`CatalogCache
+                              <doclient.cache.CatalogCache>`
+        """
+        if aiohttp is None:
+            raise ImportError(
+                "AsyncDOClient requires aiohttp. "
+                "Install do-client[async]")
+        super(AsyncDOClient, self).__init__(
+            token, pool_size=pool_size, keep_alive=keep_alive,
+            api_base=api_base, page_concurrency=page_concurrency,
+            rate_limiter=rate_limiter, catalog_cache=catalog_cache)
+        self.lazy = lazy
+        self.single_flight = AsyncSingleFlight()
+        self._session = None
+        self.droplets = None
+        self.user = None
+        self.ssh_keys = None
+        self.ssh_key_registry = SSHKeyRegistry()
+
+    def __repr__(self):
+        return "DigitalOcean API Async Client {0}".format(self._id)
+
+    def __str__(self):
+        return "DigitalOcean API Async Client {0}".format(self._id)
+
+    async def __aenter__(self):
+        if not self.lazy:
+            await self.load()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    @property
+    def session(self):
+        r"""
+        Pooled aiohttp session used for all of the client's requests.
+        Created on first use from within a running event loop.
+
+        :rtype: aiohttp.ClientSession
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size, force_close=not self.keep_alive)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def close(self):
+        r"""
+        Close the client's connection pool.
+
+        :rtype: NoneType
+        """
+        session, self._session = self._session, None
+        if session is not None:
+            await session.close()
+
+    async def load(self):
+        r"""
+        Load droplets, account information and SSH keys concurrently.
+
+        :raises: APIAuthError
+        """
+        await asyncio.gather(self.get_droplets(),
+                             self.get_user_information(),
+                             self.get_ssh_keys())
+        self.user.droplet_count = len(self.droplets)
+
+    async def _request(self, url, method="GET", data=None):
+        r"""
+        Place a request and return its status code and decoded body.
+        GETs are revalidated and coalesced as in
+        :meth:`DOClient.api_request <doclient.client.DOClient.api_request>`,
+        with HTTP 304 replies returned as status 200 and the stored
+        payload.
+
+        :rtype: tuple (int, dict)
+        """
+        method = (method or "GET").upper()
+        if method not in self.http_methods:
+            raise InvalidArgumentError(
+                "Invalid HTTP method requested")
+
+        url = self.resolve_url(url)
+        if method == "GET" and self.coalesce_requests:
+            return await self.single_flight.do(
+                url, lambda: self._send(url))
+        return await self._send(url, method, data)
+
+    async def _send(self, url, method="GET", data=None):
+        r"""Place a request for _request, retrying HTTP 429s"""
+        if isinstance(data, dict):
+            data = json_dumps(data)
+
+        conditional = method == "GET"
+        request_headers = self.request_headers
+        if conditional:
+            request_headers = dict(
+                request_headers,
+                **self.validator_cache.request_headers(url))
+
+        event = self.request_event(method, url)
+        started = perf_counter()
+        attempt, status = 0, None
+        try:
+            while True:
+                delay = self.reserve_request()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                try:
+                    async with self.session.request(
+                            method, url, headers=request_headers,
+                            data=data) as response:
+                        body = await response.read()
+                        status = response.status
+                        headers = response.headers
+                except aiohttp.ClientConnectionError:
+                    raise NetworkError("".join([
+                        "No available network to ",
+                        "connect to DigitalOcean API."
+                    ]))
+
+                self.track_rate_limit(headers)
+                if status != 429:
+                    break
+                await asyncio.sleep(self.retry_delay(attempt, headers))
+                attempt += 1
+
+            self.check_status(status)
+        except BaseError as error:
+            if event is not None:
+                self.finish_event(event, started, status, 0, attempt,
+                                  error)
+            raise
+        if event is not None:
+            self.finish_event(event, started, status, len(body), attempt)
+        if conditional and status == 304:
+            payload = self.validator_cache.revalidated(url)
+            if payload is not None:
+                return 200, payload
+            return await self._send(url)
+        payload = loads(body) if body else {}
+        if conditional and status == 200:
+            self.validator_cache.store(url, headers, payload)
+        return status, payload
+
+    async def api_request(self, url, method="GET", data=None):
+        r"""
+        DigitalOcean API request helper coroutine.
+
+        :param url: REST API url or endpoint path.
+        :type  url: str
+        :param method: HTTP method
+        :type  method: str
+        :param data: HTTP payload (JSON dumpable)
+        :type  data: dict
+        :rtype: dict
+        """
+        _, payload = await self._request(url, method=method, data=data)
+        return payload
+
+    async def iter_pages(self, url, key, concurrency=None):
+        r"""
+        Asynchronously iterate over the items of a paginated APIv2
+        listing. Pages after the first are fetched concurrently, at
+        most `concurrency` at a time, and yielded in page order.
+
+        :param url: Listing endpoint path or URL.
+        :type  url: str
+        :param key: Response key holding the listing items.
+        :type  key: str
+        :param concurrency: Maximum number of pages fetched in
+                            parallel. Defaults to page_concurrency.
+        :type  concurrency: int
+        :rtype: async generator (dict)
+        """
+        concurrency = concurrency or self.page_concurrency
+        response = await self.api_request(self.page_url(url, 1))
+        items = response.get(key) or []
+        for item in items:
+            yield item
+
+        next_url = get_next_page(response)
+        if not next_url:
+            return
+
+        total = (response.get("meta") or {}).get("total")
+        if not isinstance(total, int) or concurrency < 2 or not items:
+            while next_url:
+                response = await self.api_request(next_url)
+                for item in response.get(key) or []:
+                    yield item
+                next_url = get_next_page(response)
+            return
+
+        per_page = len(items)
+        last_page = int(ceil(total / float(per_page)))
+        pages = iter(range(2, last_page + 1))
+        pending = deque()
+
+        def fetch(page):
+            """Schedule a single listing page fetch"""
+            return asyncio.ensure_future(self.api_request(
+                self.page_url(url, page, per_page)))
+
+        try:
+            for page in islice(pages, concurrency):
+                pending.append(fetch(page))
+            while pending:
+                response = await pending.popleft()
+                for page in islice(pages, 1):
+                    pending.append(fetch(page))
+                for item in response.get(key) or []:
+                    yield item
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def gather(self, coroutines, concurrency=None):
+        r"""
+        Run coroutines concurrently, at most `concurrency` at a time.
+        Results are returned in order; failures are returned in
+        place as exception instances.
+
+        :param coroutines: Coroutines to run.
+        :type  coroutines: iterable
+        :param concurrency: Maximum coroutines in flight.
+                            Defaults to pool_size.
+        :type  concurrency: int
+        :rtype: list
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.pool_size)
+
+        async def bounded(coroutine):
+            """Run a coroutine under the semaphore"""
+            async with semaphore:
+                return await coroutine
+
+        return await asyncio.gather(
+            *[bounded(coroutine) for coroutine in coroutines],
+            return_exceptions=True)
+
+    async def get_user_information(self):
+        r"""DigitalOcean APIv2 user information helper coroutine"""
+        status, response = await self._request(self.userinfo_url)
+        if status != 200:
+            raise APIAuthError("Unable to authenticate session")
+        payload = dict(response.get("account"), droplet_count=len(
+            self.droplets) if self.droplets is not None else None)
+        self.user = DOUser(**payload)
+        self._id = self.user.uuid
+        return self.user
+
+    async def iter_ssh_keys(self, concurrency=None):
+        r"""
+        Iterate over the account's SSH keys across all result pages.
+
+        :rtype: async generator (:class:`SSHKey <doclient.meta.SSHKey>`)
+        """
+        async for key in self.iter_pages(self.keys_url, "ssh_keys",
+                                         concurrency=concurrency):
+            yield SSHKey(**key)
+
+    async def get_ssh_keys(self):
+        r"""
+        Retrieve the list of SSH keys associated with the account,
+        syncing the key registry with it.
+
+        :rtype: list (:class:`SSHKey <doclient.meta.SSHKey>`)
+        """
+        self.ssh_key_registry.sync(
+            [key async for key in self.iter_ssh_keys()])
+        self.ssh_keys = list(self.ssh_key_registry)
+        return self.ssh_keys
+
+    async def resolve_ssh_keys(self, references):
+        r"""
+        Key IDs for SSH key IDs, fingerprints or names. See
+        :meth:`DOClient.resolve_ssh_keys
+        <doclient.client.DOClient.resolve_ssh_keys>`.
+
+        :rtype: list (int)
+        """
+        if self.ssh_keys is None:
+            await self.get_ssh_keys()
+        key_ids, missing = self.ssh_key_registry.resolve(references)
+        if missing:
+            await self.get_ssh_keys()
+            key_ids, missing = self.ssh_key_registry.resolve(references)
+        if missing:
+            raise InvalidArgumentError("Unknown SSH keys {0}".format(
+                ", ".join(str(reference) for reference in missing)))
+        return key_ids
+
+    async def iter_droplets(self, concurrency=None):
+        r"""
+        Iterate over droplets for the account across all result
+        pages. Droplets are yielded as each page arrives.
+
+        :rtype: async generator (:class:`Droplet <doclient.droplet.Droplet>`)
+        """
+        async for droplet in self.iter_pages(
+                self.droplet_url, "droplets", concurrency=concurrency):
+            yield self._make_droplet(droplet)
+
+    async def get_droplets(self):
+        r"""
+        Get list of droplets for the account.
+
+        :rtype: list (:class:`Droplet <doclient.droplet.Droplet>`)
+        """
+        self.droplets = [droplet async for droplet in
+                         self.iter_droplets()]
+        return self.droplets
+
+    async def iter_images(self, concurrency=None):
+        r"""
+        Iterate over images available in the account.
+
+        :rtype: async generator (:class:`Image <doclient.droplet.Image>`)
+        """
+        async for image in self.iter_pages(self.images_url, "images",
+                                           concurrency=concurrency):
+            yield Image(**image)
+
+    async def get_catalog(self, key, url, items_key):
+        r"""
+        Catalog listing payloads, served from the catalog cache
+        while fresh and fetched in full otherwise.
+
+        :rtype: list (dict)
+        """
+        items = self.catalog_cache.get(key)
+        if items is None:
+            items = [item async for item in
+                     self.iter_pages(url, items_key)]
+            self.catalog_cache.set(key, items)
+        return items
+
+    def invalidate_catalog(self, resource=None):
+        r"""
+        Drop cached catalog data.
+
+        :param resource: sizes, regions, images or kernels. Drops
+                         all catalogs when omitted.
+        :type  resource: str
+        """
+        self.catalog_cache.invalidate(resource)
+
+    async def get_images(self):
+        r"""
+        Get list of images available in the account.
+
+        :rtype: list (:class:`Image <doclient.droplet.Image>`)
+        """
+        return [Image(**image) for image in await self.get_catalog(
+            "images", self.images_url, "images")]
+
+    async def get_sizes(self):
+        r"""
+        Get list of droplet sizes available.
+
+        :rtype: list (:class:`DropletSize <doclient.droplet.DropletSize>`)
+        """
+        return [DropletSize(**size) for size in await self.get_catalog(
+            "sizes", self.sizes_url, "sizes")]
+
+    async def get_regions(self):
+        r"""
+        Get list of regions available.
+
+        :rtype: list (:class:`Region <doclient.meta.Region>`)
+        """
+        return [self._make_region(region) for region in
+                await self.get_catalog("regions", self.regions_url,
+                                       "regions")]
+
+    async def validate_size(self, size):
+        r"""
+        Check a size slug against the cached sizes catalog.
+
+        :rtype: :class:`DropletSize <doclient.droplet.DropletSize>`
+        """
+        sizes = await self.get_catalog("sizes", self.sizes_url, "sizes")
+        return DropletSize(**self.find_catalog_item(sizes, size, "Size"))
+
+    async def validate_region(self, region, size=None):
+        r"""
+        Check a region slug against the cached regions catalog, and
+        optionally that a size is offered in it.
+
+        :rtype: :class:`Region <doclient.meta.Region>`
+        """
+        regions = await self.get_catalog("regions", self.regions_url,
+                                         "regions")
+        region = self._make_region(
+            self.find_catalog_item(regions, region, "Region"))
+        if size is not None and region.sizes and \
+                size not in region.sizes:
+            raise InvalidArgumentError(
+                "Size {0} is not available in region {1}".format(
+                    size, region.slug))
+        return region
+
+    async def validate_image(self, image):
+        r"""
+        Check an image ID or slug against the cached images catalog.
+
+        :rtype: :class:`Image <doclient.droplet.Image>`
+        """
+        images = await self.get_catalog("images", self.images_url,
+                                        "images")
+        return Image(**self.find_catalog_item(
+            images, image, "Image", keys=("slug", "id")))
+
+    async def iter_snapshots(self, droplet_id, concurrency=None):
+        r"""
+        Iterate over snapshots created for the requested droplet.
+
+        :rtype: async generator (:class:`Snapshot <doclient.meta.Snapshot>`)
+        """
+        url = self.droplet_snapshot_url % droplet_id
+        async for snapshot in self.iter_pages(
+                url, "snapshots", concurrency=concurrency):
+            yield Snapshot(**snapshot)
+
+    async def get_droplet_snapshots(self, droplet_id):
+        r"""
+        Get list of snapshots created for the requested droplet.
+
+        :param droplet_id: ID of droplet to get snapshots for.
+        :type  droplet_id: int
+        :rtype: list (:class:`Snapshot <doclient.meta.Snapshot>`)
+        """
+        return [snapshot async for snapshot in
+                self.iter_snapshots(droplet_id)]
+
+    async def get_droplet_kernels(self, droplet_id):
+        r"""
+        Get list of kernels available for the requested droplet.
+
+        :param droplet_id: ID of droplet to get available kernels for.
+        :type  droplet_id: int
+        :rtype: list (:class:`Kernel <doclient.meta.Kernel>`)
+        """
+        kernels = await self.get_catalog(
+            "kernels:{0}".format(droplet_id),
+            self.droplet_kernels_url % droplet_id, "kernels")
+        return [Kernel(**kernel) for kernel in kernels]
+
+    async def _droplet_action(self, droplet_id, data, message):
+        r"""Post a droplet action and return a status message"""
+        try:
+            status, response = await self._request(
+                self.power_onoff_url % droplet_id,
+                method="post", data=data)
+        except APIAuthError as error:
+            return {"message": error.message}
+        if status != 201:
+            return {"message": response.get("message")}
+        return {"message": message,
+                "action": AsyncAction(client=self,
+                                      **response.get("action"))}
+
+    async def get_action(self, action_id):
+        r"""
+        Get an action by ID.
+
+        :param action_id: Action ID.
+        :type  action_id: int
+        :rtype: :class:`AsyncAction <doclient.actions.AsyncAction>`
+        """
+        response = await self.api_request(self.action_url % action_id)
+        action = response.get("action")
+        if not action:
+            raise InvalidArgumentError("Action not found")
+        return AsyncAction(client=self, **action)
+
+    async def wait_for_action(self, action, timeout=None):
+        r"""
+        Wait for an action to complete, polling with backoff.
+
+        :param action: Action handle or ID.
+        :type  action: :class:`AsyncAction
+                       <doclient.actions.AsyncAction>`, int
+        :param timeout: Seconds to wait before giving up.
+        :type  timeout: float
+        :raises: :class:`ActionError <doclient.errors.ActionError>`
+        :rtype: :class:`AsyncAction <doclient.actions.AsyncAction>`
+        """
+        if not isinstance(action, AsyncAction):
+            action = await self.get_action(action)
+        return (await async_wait_all(self, [action], timeout=timeout))[0]
+
+    async def wait_all(self, actions, timeout=None, raise_on_error=True):
+        r"""
+        Wait for many actions to complete. Polling is batched into
+        action listing calls when several actions are pending.
+
+        :param actions: Action handles.
+        :type  actions: list (:class:`AsyncAction
+                        <doclient.actions.AsyncAction>`)
+        :param timeout: Seconds to wait before giving up.
+        :type  timeout: float
+        :param raise_on_error: Raise if any action errored.
+        :type  raise_on_error: bool
+        :raises: :class:`ActionError <doclient.errors.ActionError>`
+        :rtype: list (:class:`AsyncAction <doclient.actions.AsyncAction>`)
+        """
+        return await async_wait_all(self, list(actions), timeout=timeout,
+                                    raise_on_error=raise_on_error)
+
+    def poweroff_droplet(self, droplet_id):
+        r"""
+        Droplet power off coroutine.
+
+        :param droplet_id: ID of the droplet to turn off.
+        :type  droplet_id: int
+        :rtype: dict
+        """
+        return self._droplet_action(droplet_id, self.poweroff_data,
+                                    "Initiated droplet poweroff")
+
+    def poweron_droplet(self, droplet_id):
+        r"""
+        Droplet power on coroutine.
+
+        :param droplet_id: ID of the droplet to turn on.
+        :type  droplet_id: int
+        :rtype: dict
+        """
+        return self._droplet_action(droplet_id, self.poweron_data,
+                                    "Initiated droplet poweron")
+
+    def powercycle_droplet(self, droplet_id):
+        r"""
+        Droplet power cycle coroutine.
+
+        :param droplet_id: ID of the droplet to power cycle.
+        :type  droplet_id: int
+        :rtype: dict
+        """
+        return self._droplet_action(droplet_id, self.powercycle_data,
+                                    "Initiated droplet power cycle")
+
+    def poweroff_droplets(self, droplet_ids, concurrency=None):
+        r"""
+        Power off many droplets concurrently.
+
+        :param droplet_ids: IDs of the droplets to turn off.
+        :type  droplet_ids: list<int>
+        :param concurrency: Maximum requests in flight.
+        :type  concurrency: int
+        :rtype: list (dict)
+        """
+        return self.gather([self.poweroff_droplet(droplet_id)
+                            for droplet_id in droplet_ids],
+                           concurrency=concurrency)
+
+    def poweron_droplets(self, droplet_ids, concurrency=None):
+        r"""
+        Power on many droplets concurrently.
+
+        :param droplet_ids: IDs of the droplets to turn on.
+        :type  droplet_ids: list<int>
+        :param concurrency: Maximum requests in flight.
+        :type  concurrency: int
+        :rtype: list (dict)
+        """
+        return self.gather([self.poweron_droplet(droplet_id)
+                            for droplet_id in droplet_ids],
+                           concurrency=concurrency)
+
+    def powercycle_droplets(self, droplet_ids, concurrency=None):
+        r"""
+        Power cycle many droplets concurrently.
+
+        :param droplet_ids: IDs of the droplets to power cycle.
+        :type  droplet_ids: list<int>
+        :param concurrency: Maximum requests in flight.
+        :type  concurrency: int
+        :rtype: list (dict)
+        """
+        return self.gather([self.powercycle_droplet(droplet_id)
+                            for droplet_id in droplet_ids],
+                           concurrency=concurrency)
+
+    async def tag_action(self, tag_name, data, message):
+        r"""
+        Initiate an action on all droplets carrying a tag with one
+        request.
+
+        :param tag_name: Droplet tag.
+        :type  tag_name: str
+        :rtype: dict
+        """
+        if not isinstance(tag_name, str) or not tag_name:
+            raise InvalidArgumentError(
+                "Method requires a valid tag name")
+        url = self.tag_actions_url % quote(tag_name, safe="")
+        try:
+            status, response = await self._request(
+                url, method="post", data=data)
+        except APIAuthError as error:
+            return {"message": error.message}
+        if status != 201:
+            return {"message": response.get("message")}
+        return {"message": message,
+                "actions": [AsyncAction(client=self, **action)
+                            for action in response.get("actions", [])]}
+
+    def poweroff_tag(self, tag_name):
+        r"""
+        Power off all droplets carrying a tag with one request.
+
+        :param tag_name: Droplet tag.
+        :type  tag_name: str
+        :rtype: dict
+        """
+        return self.tag_action(tag_name, self.poweroff_data,
+                               "Initiated tagged droplets poweroff")
+
+    def poweron_tag(self, tag_name):
+        r"""
+        Power on all droplets carrying a tag with one request.
+
+        :param tag_name: Droplet tag.
+        :type  tag_name: str
+        :rtype: dict
+        """
+        return self.tag_action(tag_name, self.poweron_data,
+                               "Initiated tagged droplets poweron")
+
+    def powercycle_tag(self, tag_name):
+        r"""
+        Power cycle all droplets carrying a tag with one request.
+
+        :param tag_name: Droplet tag.
+        :type  tag_name: str
+        :rtype: dict
+        """
+        return self.tag_action(tag_name, self.powercycle_data,
+                               "Initiated tagged droplets power cycle")
+
+    async def delete_droplet(self, droplet_id):
+        r"""
+        Delete a requested droplet.
+
+        :param droplet_id: ID of droplet to delete.
+        :type  droplet_id: int, str
+        :rtype: dict
+        """
+        droplet_id = self._droplet_id(droplet_id)
+        if self.droplets is not None and not any(
+                droplet.id == droplet_id for droplet in self.droplets):
+            raise InvalidArgumentError("Unknown droplet")
+        url = "{0}{1}".format(self.droplet_base_url, droplet_id)
+        try:
+            status, response = await self._request(url, method="delete")
+        except APIAuthError as error:
+            return {"message": error.message}
+        if status != 204:
+            return {"message": response.get("message")}
+        if self.droplets is not None:
+            self.droplets = [droplet for droplet in self.droplets
+                             if droplet.id != droplet_id]
+        return {
+            "message": "Successfully initiated droplet delete for "
+                       "droplet {0}".format(droplet_id)
+        }
+
+    async def _validate_spec(self, region, size, image):
+        r"""Validate droplet create arguments against the catalogs"""
+        await self.validate_size(size)
+        await self.validate_region(region, size)
+        await self.validate_image(image)
+
+    async def _create(self, payload, key):
+        r"""Post a droplet create payload and build its droplets"""
+        status, response = await self._request(
+            self.droplet_base_url, method="POST", data=payload)
+        if status != 202:
+            raise APIError(
+                "Unable to create a droplet with requested data")
+        droplets = response.get(key)
+        if isinstance(droplets, dict):
+            droplets = [droplets]
+        droplets = [self._make_droplet(droplet)
+                    for droplet in droplets or []]
+        if self.droplets is not None:
+            self.droplets = self._merged(self.droplets, droplets)
+        return droplets
+
+    async def create_droplet(self, name, region, size, image,
+                             ssh_keys=None, backups=False, ipv6=False,
+                             user_data=None, private_networking=False,
+                             validate=False):
+        r"""
+        Create a droplet with requested payload features. Takes the
+        same arguments as :meth:`DOClient.create_droplet
+        <doclient.client.DOClient.create_droplet>`.
+
+        :rtype: :class:`Droplet <doclient.droplet.Droplet>`
+        """
+        if self._key_references(ssh_keys):
+            ssh_keys = await self.resolve_ssh_keys(ssh_keys)
+        payload = self._create_payload(
+            name, region, size, image, ssh_keys=ssh_keys,
+            backups=backups, ipv6=ipv6, user_data=user_data,
+            private_networking=private_networking)
+        if validate:
+            await self._validate_spec(region, size, image)
+        droplets = await self._create(payload, "droplet")
+        return droplets[0] if droplets else None
+
+    async def create_droplets(self, names, region, size, image,
+                              ssh_keys=None, backups=False, ipv6=False,
+                              user_data=None, private_networking=False,
+                              validate=False):
+        r"""
+        Create a list of droplets all with the same requested payload
+        features. Takes the same arguments as
+        :meth:`DOClient.create_droplets
+        <doclient.client.DOClient.create_droplets>`.
+
+        :rtype: list (:class:`Droplet <doclient.droplet.Droplet>`)
+        """
+        if not isinstance(names, list):
+            raise InvalidArgumentError(
+                "Invalid droplet name. Requires a list of strings")
+        if self._key_references(ssh_keys):
+            ssh_keys = await self.resolve_ssh_keys(ssh_keys)
+        payload = self._create_payload(
+            names, region, size, image, ssh_keys=ssh_keys,
+            backups=backups, ipv6=ipv6, user_data=user_data,
+            private_networking=private_networking)
+        if validate:
+            await self._validate_spec(region, size, image)
+        return await self._create(payload, "droplets")
+
+    async def _domain_request(self, url, expected, method="GET",
+                              data=None):
+        r"""Place a domain request and map unexpected statuses"""
+        status, response = await self._request(
+            url, method=method, data=data)
+        if status != expected:
+            raise InvalidArgumentError(response.get("message"))
+        return response
+
+    async def get_domains(self):
+        r"""
+        Get all domain maps generated through DigitalOcean's DNS.
+
+        :rtype: list (:class:`Domain <doclient.meta.Domain>`)
+        """
+        return [Domain(**domain) async for domain in
+                self.iter_pages(self.domains_url, "domains")]
+
+    async def get_domain(self, name):
+        r"""
+        Get information for a particular domain.
+
+        :param name: Domain name
+        :type  name: str
+        :rtype: :class:`Domain <doclient.meta.Domain>`
+        """
+        url = "{0}/{1}".format(self.domains_url, name)
+        response = await self._domain_request(url, 200)
+        return Domain(**response.get("domain"))
+
+    async def create_domain(self, name, ip_address):
+        r"""
+        Create a domain name mapping.
+
+        :param name: Domain name
+        :type  name: str
+        :param ip_address: IP address to map domain name to.
+        :type  ip_address: str
+        :rtype: dict
+        """
+        if not isinstance(name, str):
+            raise InvalidArgumentError(
+                "name needs to be a valid domain name string")
+        if not isinstance(ip_address, str):
+            raise InvalidArgumentError(
+                "ip_address needs to be a valid IPV4/IPV6 address")
+        response = await self._domain_request(
+            self.domains_url, 201, method="POST",
+            data={"name": name, "ip_address": ip_address})
+        return {
+            "message": "Domain mapping created successfully",
+            "data": Domain(**response.get("domain")).as_dict()
+        }
+
+    async def delete_domain(self, name):
+        r"""
+        Delete a domain mapping.
+
+        :param name: Domain name
+        :type  name: str
+        :rtype: dict
+        """
+        url = "{0}/{1}".format(self.domains_url, name)
+        await self._domain_request(url, 204, method="DELETE")
+        return {
+            "message": "Successfully initiated domain mapping delete"
+        }
+
+    async def get_domain_records(self, name):
+        r"""
+        Fetch a domain's records across all result pages.
+
+        :param name: Domain name
+        :type  name: str
+        :rtype: list (:class:`DomainRecord <doclient.dns.DomainRecord>`)
+        """
+        return [DomainRecord(**record) async for record in
+                self.iter_pages(Domain.records_url.format(name),
+                                "domain_records")]
+
+    async def create_domain_record(self, name, record):
+        r"""
+        Create a domain record.
+
+        :param name: Domain name
+        :type  name: str
+        :param record: Record to create.
+        :type  record: :class:`DomainRecord <doclient.dns.DomainRecord>`, dict
+        :rtype: :class:`DomainRecord <doclient.dns.DomainRecord>`
+        """
+        response = await self._domain_request(
+            Domain.records_url.format(name), 201, method="POST",
+            data=DomainRecord.coerce(record).as_payload())
+        return DomainRecord(**response.get("domain_record"))
+
+    async def update_domain_record(self, name, record_id, record):
+        r"""
+        Update a domain record.
+
+        :param name: Domain name
+        :type  name: str
+        :param record_id: ID of the record to update.
+        :type  record_id: int
+        :param record: Desired state of the record.
+        :type  record: :class:`DomainRecord <doclient.dns.DomainRecord>`, dict
+        :rtype: :class:`DomainRecord <doclient.dns.DomainRecord>`
+        """
+        response = await self._domain_request(
+            Domain.record_url.format(name, record_id), 200, method="PUT",
+            data=DomainRecord.coerce(record).as_payload())
+        return DomainRecord(**response.get("domain_record"))
+
+    async def delete_domain_record(self, name, record_id):
+        r"""
+        Delete a domain record.
+
+        :param name: Domain name
+        :type  name: str
+        :param record_id: ID of the record to delete.
+        :type  record_id: int
+        :rtype: dict
+        """
+        await self._domain_request(
+            Domain.record_url.format(name, record_id), 204,
+            method="DELETE")
+        return {"message": "Successfully deleted domain record"}
+
+    async def sync_domain_records(self, name, desired, types=None,
+                                  concurrency=None, dry_run=False):
+        r"""
+        Bring a domain's records in line with a desired record set.
+        See :meth:`Domain.sync_records
+        <doclient.meta.Domain.sync_records>`.
+
+        :rtype: dict
+        """
+        if isinstance(desired, str):
+            desired = parse_zone_file(desired, name)
+        desired = [DomainRecord.coerce(record) for record in desired]
+        creates, updates, deletes = diff_records(
+            await self.get_domain_records(name), desired, types=types)
+        result = {
+            "created": creates,
+            "updated": [record for _, record in updates],
+            "deleted": deletes,
+            "errors": [],
+        }
+        if dry_run:
+            return result
+
+        results = await self.gather(
+            [self.update_domain_record(name, current.id, record)
+             for current, record in updates] +
+            [self.delete_domain_record(name, record.id)
+             for record in deletes], concurrency=concurrency)
+        results += await self.gather(
+            [self.create_domain_record(name, record)
+             for record in creates], concurrency=concurrency)
+        writes = len(updates) + len(deletes)
+        result.update({
+            "created": [record for record in results[writes:]
+                        if isinstance(record, DomainRecord)],
+            "updated": [record for record in results[:len(updates)]
+                        if isinstance(record, DomainRecord)],
+            "deleted": [record for record, outcome in
+                        zip(deletes, results[len(updates):writes])
+                        if isinstance(outcome, dict)],
+            "errors": [outcome for outcome in results
+                       if isinstance(outcome, BaseException)],
+        })
+        return result
+
@@ -1,11 +1,11 @@
 #! coding=utf-8
 """DigitalOcean APIv2 base model module"""
 __author__ = "Sriram Velamur <sriram.velamur@gmail.com>"
-__all__ = ("BaseObject",)
+__all__ = ("BaseObject", "Model", "ModelMeta")
 
 import sys
 sys.dont_write_bytecode = True
-from json import dumps
+from .codec import dumps
 
 
 class BaseObject:
@@ -17,13 +17,16 @@ class BaseObject:
 
     _id = None
     props = []
+    # Payload keys stored with a leading underscore, for names that
+    # are exposed through read-only properties.
+    private_props = ("id", "token")
 
     def __init__(self, **kwargs):
         """BaseObject class init"""
         if not self.props:
             self.props = []
         for name, value in kwargs.items():
-            if name in ("id", "token"):
+            if name in self.private_props:
                 name = "_{}".format(name)
             setattr(self, name, value)
             if name not in self.props:
@@ -41,19 +44,150 @@ class BaseObject:
         """JSON repr method for BaseObject objects"""
         data = self.as_dict()
         _data = {}
-        for name, value in data.iteritems():
-            if isinstance(value, BaseObject):
-                value = value.as_json()
+        for name, value in data.items():
+            if isinstance(value, (BaseObject, Model)):
+                value = value.as_dict()
             _data[name] = value
         return dumps(_data)
 
     def __getattr__(self, key):
         """
-        Overridden __getattr__ method to work with id property
+        Overridden __getattr__ method to work with id property.
+        Only called once regular lookup fails; unset attributes
+        read as None.
         """
-        try:
-            if key == "id":
-                return self._id
-            return self.key
-        except RuntimeError:
-            return None
+        if key.startswith("__"):
+            raise AttributeError(key)
+        if key == "id":
+            return self._id
+        return None
+
+
+class ModelMeta(type):
+
+    r"""
+    Metaclass compiling a model's declared field schema.
+
+    For the payload keys listed in a class's fields it generates
+    __slots__, an __init__ assigning every field from keyword
+    arguments in one pass, an as_dict building the payload back, and
+    read-only properties for the keys in private_props (stored with a
+    leading underscore). Methods defined on the class itself are left
+    in place.
+    """
+
+    def __new__(mcs, name, bases, namespace):
+        inherited = ()
+        for base in bases:
+            inherited += tuple(field for field in
+                               getattr(base, "_fields", ())
+                               if field not in inherited)
+        declared = tuple(field for field in namespace.get("fields", ())
+                         if field not in inherited)
+        private_props = namespace["private_props"] \
+            if "private_props" in namespace else next(
+                (base.private_props for base in bases
+                 if hasattr(base, "private_props")), ())
+        namespace["__slots__"] = tuple(
+            _slot(field, private_props) for field in declared) + \
+            tuple(namespace.get("__slots__", ()))
+        namespace["_fields"] = fields = inherited + declared
+        cls = super(ModelMeta, mcs).__new__(mcs, name, bases, namespace)
+        if not fields:
+            return cls
+
+        for field in declared:
+            if field in private_props and field not in namespace:
+                setattr(cls, field, property(
+                    _getter(_slot(field, private_props)),
+                    doc="{0} {1} property".format(name, field)))
+        if "__init__" not in namespace:
+            cls.__init__ = _compile_init(cls, fields, private_props)
+        if "as_dict" not in namespace:
+            cls.as_dict = _compile_as_dict(cls, fields, private_props)
+        return cls
+
+
+class Model(metaclass=ModelMeta):
+
+    r"""
+    Base class for schema-declared doclient models.
+
+    Subclasses list their payload keys in fields. Instances carry
+    no per-instance __dict__: each field lives in a slot, and payload
+    keys outside the schema are kept in a single _extra dict (None
+    when there are none). Reading an attribute that was never set
+    returns None, as with :class:`BaseObject <.BaseObject>`.
+
+    :property fields: Payload keys held in slots.
+    :property private_props: Keys stored with a leading underscore
+                             and exposed through read-only properties.
+    """
+
+    __slots__ = ("_extra",)
+    fields = ()
+    private_props = ("id",)
+
+    def __getattr__(self, key):
+        r"""Unset fields and unknown names read as None"""
+        if key.startswith("__") or key == "_extra":
+            raise AttributeError(key)
+        extra = self._extra
+        if extra is not None and key in extra:
+            return extra[key]
+        return None
+
+    def as_json(self):
+        """JSON repr method for models"""
+        return dumps(self.as_dict())
+
+
+def _slot(field, private_props):
+    r"""Slot name for a schema field"""
+    return "_" + field if field in private_props else field
+
+
+def _getter(slot):
+    r"""Read-only property getter for a private field slot"""
+    def getter(self):
+        return getattr(self, slot)
+    return getter
+
+
+def _compile(cls, name, source, namespace=None):
+    r"""Compile a generated method for a model class"""
+    scope = dict(namespace or {})
+    exec(compile(source, "<{0}.{1}>".format(cls.__name__, name),
+                 "exec"), scope)
+    function = scope[name]
+    function.__qualname__ = "{0}.{1}".format(cls.__qualname__, name)
+    return function
+
+
+def _compile_init(cls, fields, private_props):
+    r"""Generate a model's __init__ from its fields"""
+    lines = ["def __init__(self, **kwargs):", "    pop = kwargs.pop"]
+    lines.extend("    self.{0} = pop({1!r}, None)".format(
+        _slot(field, private_props), field) for field in fields)
+    lines.append("    self._extra = kwargs or None")
+    function = _compile(cls, "__init__", "\n".join(lines))
+    function.__doc__ = "{0} init".format(cls.__name__)
+    return function
+
+
+def _compile_as_dict(cls, fields, private_props):
+    r"""Generate a model's as_dict from its fields"""
+    items = ", ".join(
+        "{0!r}: self.{1}".format(field, _slot(field, private_props))
+        for field in fields if field != "client")
+    source = "\n".join([
+        "def as_dict(self):",
+        "    data = {{{0}}}".format(items),
+        "    if self._extra:",
+        "        data.update(self._extra)",
+        "    return data",
+    ])
+    function = _compile(cls, "as_dict", source)
+    function.__doc__ = "Returns a dictionary representation of a {0}" \
+        .format(cls.__name__)
+    return function
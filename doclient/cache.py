@@ -0,0 +1,266 @@
+#! coding=utf-8
+"""
+DigitalOcean APIv2 cache module.
+Caches near-static catalog listings (sizes, regions, images and
+kernels) with per-resource time-to-live values, and the validators
+of GET responses for conditional revalidation.
+"""
+__author__ = "Sriram Velamur <sriram.velamur@gmail.com>"
+__all__ = ("CatalogCache", "ValidatorCache")
+
+import sys
+sys.dont_write_bytecode = True
+from collections import OrderedDict
+from json import dump, load
+from os import replace
+from os.path import exists
+from threading import Lock
+from time import time
+
+
+class CatalogCache(object):
+
+    r"""
+    TTL and LRU bounded cache for catalog payloads.
+
+    Entries are keyed by resource, optionally qualified with an
+    identifier (e.g. "kernels:1234"), and expire after the TTL of
+    their resource. The least recently used entries are evicted
+    once max_entries is exceeded. With a path, entries are written
+    through to a JSON file and fresh ones are loaded from it on init,
+    so new processes start warm. Images include an account's private
+    images, so on-disk stores should not be shared between accounts.
+    """
+
+    ttls = {
+        "sizes": 24 * 3600,
+        "regions": 24 * 3600,
+        "images": 3600,
+        "kernels": 6 * 3600,
+    }
+    default_ttl = 3600
+
+    def __init__(self, ttls=None, max_entries=256, path=None):
+        r"""
+        Catalog cache init
+
+        :param ttls: Per-resource TTLs in seconds, overriding the
+                     class defaults.
+        :type  ttls: dict
+        :param max_entries: Maximum entries held before evicting the
+                            least recently used.
+        :type  max_entries: int
+        :param path: JSON file backing the cache.
+        :type  path: str
+        """
+        self.ttls = dict(self.ttls, **(ttls or {}))
+        self.max_entries = max_entries
+        self.path = path
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        if path and exists(path):
+            self._load()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return "CatalogCache [{0} entries]".format(len(self))
+
+    def ttl(self, key):
+        r"""TTL in seconds for a cache key's resource"""
+        return self.ttls.get(key.split(":", 1)[0], self.default_ttl)
+
+    def get(self, key):
+        r"""
+        Cached value for a key, if present and fresh.
+
+        :param key: Cache key.
+        :type  key: str
+        :rtype: object, NoneType
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time() - stored_at > self.ttl(key):
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        r"""
+        Cache a JSON serialisable value.
+
+        :param key: Cache key.
+        :type  key: str
+        :param value: Value to cache.
+        :type  value: list, dict
+        """
+        with self._lock:
+            self._entries[key] = (time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._save(key)
+
+    def invalidate(self, resource=None):
+        r"""
+        Drop cached entries.
+
+        :param resource: Resource ("sizes") or key ("kernels:1234")
+                         to drop. Drops all entries when omitted.
+        :type  resource: str
+        """
+        with self._lock:
+            if resource is None:
+                self._entries.clear()
+            else:
+                for key in list(self._entries):
+                    if key == resource or \
+                            key.split(":", 1)[0] == resource:
+                        del self._entries[key]
+            self._save()
+
+    def _load(self):
+        r"""Load fresh entries from the backing file"""
+        try:
+            with open(self.path) as store:
+                entries = load(store).get("entries", {})
+        except (IOError, OSError, ValueError, AttributeError):
+            return
+        now = time()
+        for key, (stored_at, value) in sorted(
+                entries.items(), key=lambda item: item[1][0]):
+            if now - stored_at <= self.ttl(key):
+                self._entries[key] = (stored_at, value)
+
+    def _save(self, key=None):
+        r"""
+        Write entries through to the backing file.
+
+        :param key: Key just set, if the write follows a set.
+        :type  key: str
+        """
+        if not self.path:
+            return
+        temp_path = "{0}.tmp".format(self.path)
+        with open(temp_path, "w") as store:
+            dump({"entries": self._entries}, store)
+        replace(temp_path, self.path)
+
+
+class ValidatorCache(object):
+
+    r"""
+    LRU bounded store of GET response validators.
+
+    Keeps the ETag and Last-Modified headers of GET replies along
+    with their decoded payloads, keyed by URL. Later GETs of the URL
+    are sent as conditional requests and a HTTP 304 reply is served
+    from the stored payload, skipping both the body download and the
+    JSON decode. Stored payloads are shared between the callers they
+    are served to and must not be modified.
+
+    :property hits: Requests answered with HTTP 304 and served from
+                    the store.
+    :property misses: Requests that downloaded a full response body.
+    """
+
+    def __init__(self, max_entries=512):
+        r"""
+        Validator cache init
+
+        :param max_entries: Maximum URLs tracked before evicting the
+                            least recently used.
+        :type  max_entries: int
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return "ValidatorCache [{0} hits, {1} misses]".format(
+            self.hits, self.misses)
+
+    def request_headers(self, url):
+        r"""
+        Conditional request headers for a URL.
+
+        :param url: Request URL.
+        :type  url: str
+        :rtype: dict
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+        if entry is None:
+            return {}
+        etag, last_modified, _ = entry
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def revalidated(self, url):
+        r"""
+        Stored payload for a URL answered with HTTP 304.
+
+        :param url: Request URL.
+        :type  url: str
+        :rtype: dict, NoneType
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                return None
+            self._entries.move_to_end(url)
+            self.hits += 1
+            return entry[2]
+
+    def store(self, url, headers, payload):
+        r"""
+        Record a full GET response, keeping its payload if the
+        response carries a validator.
+
+        :param url: Request URL.
+        :type  url: str
+        :param headers: HTTP response headers
+        :type  headers: dict
+        :param payload: Decoded response body.
+        :type  payload: dict
+        """
+        etag = headers.get("etag")
+        last_modified = headers.get("last-modified")
+        with self._lock:
+            self.misses += 1
+            if not (etag or last_modified):
+                self._entries.pop(url, None)
+                return
+            self._entries[url] = (etag, last_modified, payload)
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        r"""Drop all stored validators and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        r"""
+        Hit and miss counters.
+
+        :rtype: dict
+        """
+        return {"hits": self.hits, "misses": self.misses,
+                "entries": len(self)}
@@ -2,75 +2,108 @@
 #pylint: disable=R0904,R0913,W0142,C0413
 """DigitalOcean APIv2 client module"""
 __author__ = "Sriram Velamur<sriram.velamur@gmail.com>"
-__all__ = ("DOClient",)
+__all__ = ("BaseClient", "DOClient")
 
 
 import sys
 sys.dont_write_bytecode = True
-from json import dumps as json_dumps
-from re import compile as re_compile, match as re_match
-from ast import literal_eval
-# from datetime import datetime as dt
-# from time import mktime, gmtime
-
-import requests
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from math import ceil
+from threading import Lock, RLock
+from urllib.parse import quote, urlsplit
+from datetime import datetime as dt
+from time import perf_counter, sleep, time
+from logging import getLogger
 
 from .base import BaseObject
 from .droplet import Droplet, Image, DropletSize
-from .meta import Domain, Kernel, \
-    Region, SSHKey, DropletNetwork
+from .meta import DomainManager, Kernel, \
+    Region, SSHKey, Snapshot
 from .errors import APIAuthError, InvalidArgumentError, \
-    APIError, NetworkError
+    APIError, RateLimitError, BaseError
 from .user import DOUser
+from .helpers import get_next_page
+from .ratelimit import RateLimiter
+from .actions import Action, wait_all
+from .index import DropletIndex
+from .keys import SSHKeyRegistry
+from .cache import CatalogCache, ValidatorCache
+from .codec import ArrayStreamDecoder, dumps as json_dumps, loads
+from .hooks import HookRegistry, RequestEvent
+from .singleflight import SingleFlight
+from .store import InventoryStore
+from .watch import DropletWatcher
+from .transport import RequestsTransport, Transport
 
 
-class DOClient(BaseObject):
+logger = getLogger(__name__)
 
-    r"""DigitalOcean APIv2 client"""
+
+class BaseClient(BaseObject):
+
+    r"""
+    DigitalOcean APIv2 client base class. Holds endpoint and
+    connection configuration shared by the blocking and asyncio
+    clients.
+    """
 
     api_calls_left = None
     api_quota_reset_at = None
-    user = None
-
-    droplet_url = "".join([
-        "https://api.digitalocean.com/v2/",
-        "droplets?page=1&per_page=100"
-    ])
-    images_url = "".join([
-        "https://api.digitalocean.com/v2/",
-        "images?page=1&per_page=100"
-    ])
-    sizes_url = "".join([
-        "https://api.digitalocean.com/v2/",
-        "sizes?page=1&per_page=100"
-    ])
-
-    power_onoff_url = "".join([
-        "https://api.digitalocean.com/v2/",
-        "droplets/%s/actions"
-    ])
-
-    regions_url = "https://api.digitalocean.com/v2/regions"
-
-    userinfo_url = "https://api.digitalocean.com/v2/account"
+    # Share one in-flight request between concurrent identical GETs.
+    coalesce_requests = True
+
+    # Rate limiting. Requests are paced by a RateLimiter and 429
+    # replies retried up to max_retries times.
+    max_retries = 5
+
+    # Connection pool defaults. Each client holds one pooled
+    # keep-alive session shared by every request it places.
+    pool_size = 10
+    keep_alive = True
+    http_methods = ("GET", "POST", "PUT", "PATCH", "DELETE", "HEAD")
+
+    # Endpoint paths. Relative paths are resolved against api_base
+    # by api_request, which allows pointing a client at any
+    # APIv2 compatible endpoint.
+    api_base = "https://api.digitalocean.com/v2/"
+
+    droplet_url = "droplets"
+    images_url = "images"
+    sizes_url = "sizes"
+
+    power_onoff_url = "droplets/%s/actions"
+    tag_actions_url = "droplets/actions?tag_name=%s"
+
+    regions_url = "regions"
+
+    userinfo_url = "account"
     keys_url = userinfo_url + "/keys"
 
-    droplet_base_url = "https://api.digitalocean.com/v2/droplets/"
-    droplet_snapshot_url = "".join([
-        droplet_base_url,
-        "%s/snapshots?page=1&per_page=100"
-    ])
-    droplet_kernels_url = "".join([
-        droplet_base_url,
-        "%s/kernels?page=1&per_page=100"
-    ])
-    droplet_neighbours_url = "".join([
-        droplet_base_url,
-        "%s/neighbors"
-    ])
-
-    ssh_keys = []
-    networks = []
+    droplet_base_url = "droplets/"
+    droplet_snapshot_url = droplet_base_url + "%s/snapshots"
+    droplet_kernels_url = droplet_base_url + "%s/kernels"
+    droplet_neighbours_url = droplet_base_url + "%s/neighbors"
+    neighbours_report_url = "reports/droplet_neighbors_ids"
+
+    actions_url = "actions"
+    action_url = actions_url + "/%s"
+
+    # Action polling. Waits start polling every action_poll_interval
+    # seconds, backing off to action_poll_max_interval. Waits on
+    # action_batch_threshold or more actions poll the account's
+    # action listing instead of each action.
+    action_poll_interval = 1.0
+    action_poll_max_interval = 15.0
+    action_poll_backoff = 1.5
+    action_batch_threshold = 3
+
+    # Pagination. Listings request per_page items per page and
+    # prefetch up to page_concurrency pages in parallel once the
+    # total item count is known.
+    per_page = 100
+    page_concurrency = 4
 
     # Metadata
 
@@ -86,63 +119,71 @@ class DOClient(BaseObject):
         "type": "power_cycle"
     })
 
-    def __init__(self, token):
+    def __init__(self, token, pool_size=None, keep_alive=None,
+                 api_base=None, page_concurrency=None,
+                 rate_limiter=None, catalog_cache=None):
         r"""
-        DigitalOcean APIv2 client init
+        DigitalOcean APIv2 client base init
         :param token: DigitalOcean API authentication token
         :type  token: str
+        :param pool_size: Maximum number of pooled connections kept
+                          open to the API. Defaults to 10.
+        :type  pool_size: int
+        :param keep_alive: Reuse connections across requests.
+                           Defaults to True.
+        :type  keep_alive: bool
+        :param api_base: Base URL of the APIv2 endpoint.
+        :type  api_base: str
+        :param page_concurrency: Maximum number of listing pages
+                                 fetched in parallel. Defaults to 4.
+        :type  page_concurrency: int
+        :param rate_limiter: Request scheduler. Defaults to a new
+                             limiter per client; share one between
+                             clients using the same token.
+        :type  rate_limiter: :class:`RateLimiter
+                             <doclient.ratelimit.RateLimiter>`
+        :param catalog_cache: Cache for sizes, regions, images and
+                              kernels. Defaults to a new in-memory
+                              cache per client.
+        :type  catalog_cache: :class:`CatalogCache
+                              <doclient.cache.CatalogCache>`
         """
-        super(DOClient, self).__init__(**{"token": token})
-        self.droplets = None
-        self.user = None
+        super(BaseClient, self).__init__(**{"token": token})
+        if pool_size is not None:
+            if not isinstance(pool_size, int) or pool_size < 1:
+                raise InvalidArgumentError(
+                    "pool_size needs to be a positive integer")
+            self.pool_size = pool_size
+        if keep_alive is not None:
+            self.keep_alive = bool(keep_alive)
+        if api_base is not None:
+            if not isinstance(api_base, str) or not api_base:
+                raise InvalidArgumentError(
+                    "api_base needs to be a valid URL string")
+            self.api_base = api_base.rstrip("/") + "/"
+        if page_concurrency is not None:
+            if not isinstance(page_concurrency, int) \
+                    or page_concurrency < 1:
+                raise InvalidArgumentError(
+                    "page_concurrency needs to be a positive integer")
+            self.page_concurrency = page_concurrency
+        if rate_limiter is not None \
+                and not isinstance(rate_limiter, RateLimiter):
+            raise InvalidArgumentError(
+                "rate_limiter needs to be a RateLimiter instance")
+        self.rate_limiter = rate_limiter or RateLimiter()
+        if catalog_cache is not None \
+                and not isinstance(catalog_cache, CatalogCache):
+            raise InvalidArgumentError(
+                "catalog_cache needs to be a CatalogCache instance")
+        self.catalog_cache = catalog_cache or CatalogCache()
+        self.validator_cache = ValidatorCache()
+        self.hooks = HookRegistry()
+        self._session = None
         self._request_headers = {
             "Content-Type": "application/json",
             "Authorization": "Bearer {0}".format(self.token)
         }
-        self.get_droplets()
-        self.get_user_information()
-        self._id = self.user.uuid
-        self.get_ssh_keys()
-
-    def get_user_information(self):
-        r"""DigitalOcean APIv2 user information helper method"""
-
-        response = self.api_request(url=self.userinfo_url,
-                                    return_json=False)
-
-        if not response.status_code == 200:
-            raise APIAuthError("Unable to authenticate session")
-
-        payload = response.json().get("account")
-        payload.update({
-            "droplet_count": len(self.droplets)
-        })
-
-        user = DOUser(**payload)
-        self.user = user
-        return user
-
-    def get_ssh_keys(self):
-        r"""
-        Helper method to retrieve the list of SSH keys associated
-        with a DigitalOcean user account.
-        """
-        response = self.api_request(
-            url=self.keys_url, return_json=True)
-
-        keys = response.get("ssh_keys", [])
-        for key in keys:
-            key_object = SSHKey(**key)
-            if key_object not in self.ssh_keys:
-                self.ssh_keys.append(key_object)
-
-        return self.ssh_keys
-
-    def __repr__(self):
-        return "DigitalOcean API Client {0}".format(self._id)
-
-    def __str__(self):
-        return "DigitalOcean API Client {0}".format(self._id)
 
     @property
     def token(self):
@@ -186,93 +227,1080 @@ class DOClient(BaseObject):
         elif is_valid_tuple:
             self._request_headers[header_data[0]] = header_data[1]
 
-    def api_request(self, url, method="GET",
-                    data=None, return_json=True):
+    def resolve_url(self, url):
         r"""
-        DigitalOcean API request helper method.
+        Resolve an endpoint path against the client's api_base.
+        Absolute URLs are returned unchanged.
 
-        :param url: REST API url to place a HTTP request to.
+        :param url: Endpoint path or absolute URL.
         :type  url: str
-        :param method: HTTP method
+        :rtype: str
+        """
+        if url.startswith(("http://", "https://")):
+            return url
+        return "{0}{1}".format(self.api_base, url.lstrip("/"))
+
+    def endpoint_template(self, url):
+        r"""
+        Templated endpoint path of a request URL, with the query
+        dropped and IDs and names replaced by placeholders, e.g.
+        droplets/{id}/actions or domains/{name}.
+
+        :param url: Request URL.
+        :type  url: str
+        :rtype: str
+        """
+        path = urlsplit(url).path
+        base = urlsplit(self.api_base).path
+        if path.startswith(base):
+            path = path[len(base):]
+        segments = path.strip("/").split("/")
+        for idx, segment in enumerate(segments):
+            if segment.isdigit():
+                segments[idx] = "{id}"
+            elif idx and segments[idx - 1] == "domains":
+                segments[idx] = "{name}"
+        return "/".join(segments)
+
+    def request_event(self, method, url):
+        r"""
+        Start a request event for the hooks, emitting before_request.
+        Returns None when no hooks are registered.
+
+        :param method: HTTP method.
         :type  method: str
-        :param data: HTTP payload (JSON dumpable)
-        :type  data: dict
-        :param return_json: Specifies return data format.
-                            If false, returns bare response.
-                            Else returns an APIResponse object.
-        :type  return_json: bool
-        :rtype: dict, requests.models.Response
+        :param url: Request URL.
+        :type  url: str
+        :rtype: :class:`RequestEvent <doclient.hooks.RequestEvent>`
+        """
+        if not self.hooks:
+            return None
+        event = RequestEvent(method, self.endpoint_template(url), url)
+        self.hooks.emit("before_request", event)
+        return event
+
+    def finish_event(self, event, started, status, size, retries,
+                     error=None):
+        r"""
+        Complete a request event, emitting after_response or on_error.
+
+        :param event: Event started by request_event.
+        :type  event: :class:`RequestEvent <doclient.hooks.RequestEvent>`
+        :param started: perf_counter value at the request's start.
+        :type  started: float
+        :param status: HTTP status of the final response.
+        :type  status: int
+        :param size: Response body size.
+        :type  size: int
+        :param retries: Number of HTTP 429 retries.
+        :type  retries: int
+        :param error: Exception raised for the request.
+        :type  error: Exception
         """
+        event.latency = perf_counter() - started
+        event.status = status
+        event.bytes = size or 0
+        event.retries = retries
+        event.error = error
+        self.hooks.emit("on_error" if error is not None
+                        else "after_response", event)
+
+    def page_url(self, url, page, per_page=None):
+        r"""
+        Build the URL for a single page of a paginated listing.
 
-        if self.api_calls_left is not None \
-                and self.api_calls_left < 1:
-            raise APIAuthError("Rate limit exceeded.")
+        :param url: Listing endpoint path or URL.
+        :type  url: str
+        :param page: 1-based page number.
+        :type  page: int
+        :param per_page: Items per page. Defaults to per_page.
+        :type  per_page: int
+        :rtype: str
+        """
+        separator = "&" if "?" in url else "?"
+        return "{0}{1}page={2}&per_page={3}".format(
+            url, separator, page, per_page or self.per_page)
 
-        method = method or "GET"
-        method = method.lower()
-        http_method = getattr(requests, method, None)
+    def reserve_request(self):
+        r"""
+        Reserve a rate limit slot for one request.
 
-        if http_method is None:
-            raise InvalidArgumentError(
-                "Invalid HTTP method requested")
+        :return: Seconds to wait before placing the request.
+        :rtype: float
+        :raises: RateLimitError
+        """
+        delay = self.rate_limiter.reserve()
+        if delay > self.rate_limiter.max_wait:
+            self.rate_limiter.refund()
+            raise RateLimitError(
+                "Rate limit exceeded. Next request slot in "
+                "{0:.0f} seconds".format(delay))
+        return delay
+
+    def track_rate_limit(self, headers):
+        r"""
+        Update the rate limit scheduler and the client's remaining
+        quota from a response's headers.
 
-        kwargs = {
-            "url": url,
-            "headers": self.request_headers,
-        }
+        :param headers: HTTP response headers
+        :type  headers: dict
+        """
+        limiter = self.rate_limiter
+        limiter.update(headers)
+        self.api_calls_left = limiter.remaining
+        if limiter.reset_at is not None:
+            self.api_quota_reset_at = dt.fromtimestamp(limiter.reset_at)
 
-        if data:
-            if isinstance(data, dict):
-                data = json_dumps(data)
-            kwargs.update({"data": data})
+    def retry_delay(self, attempt, headers):
+        r"""
+        Seconds to wait before retrying a request rejected with
+        HTTP 429.
+
+        :param attempt: 0-based retry attempt.
+        :type  attempt: int
+        :param headers: HTTP response headers
+        :type  headers: dict
+        :rtype: float
+        :raises: RateLimitError
+        """
+        if attempt >= self.max_retries:
+            raise RateLimitError("Rate limit exceeded.")
+        delay = self.rate_limiter.backoff(
+            attempt, headers.get("retry-after"))
+        if delay > self.rate_limiter.max_wait:
+            raise RateLimitError(
+                "Rate limit exceeded. Retry after "
+                "{0:.0f} seconds".format(delay))
+        return delay
 
-        try:
-            response = http_method(**kwargs)
-        except requests.exceptions.ConnectionError:
-            error_msg = "".join([
-                "No available network to ",
-                "connect to DigitalOcean API."
-            ])
-            raise NetworkError(error_msg)
-
-        if response.status_code == 400:
+    @staticmethod
+    def check_status(status_code):
+        r"""
+        Map failure HTTP status codes of an APIv2 response to
+        doclient errors.
+
+        :param status_code: HTTP status code
+        :type  status_code: int
+        :raises: APIError, APIAuthError
+        """
+        if status_code == 400:
             raise APIError("Invalid request data. Please check data")
 
-        if response.status_code in (401, 403):
+        if status_code in (401, 403):
             raise APIAuthError(
                 "Invalid authorization bearer. Please check token"
             )
-        if response.status_code == 500:
+        if status_code == 500:
             raise APIError("DigitalOcean API error. Please try later")
 
-        # Tuesday 23 July 2019 11:44:38 AM IST
-        # Breaking since the ratelimit-reset key is missing in the
-        # headers!
-        # reset_timestamp = response.headers.get("ratelimit-reset")
-        # reset_timestamp = float(reset_timestamp)
-        # reset_timestamp = dt.fromtimestamp(
-        #     mktime(gmtime(reset_timestamp)))
+    @staticmethod
+    def find_catalog_item(items, value, name, keys=("slug",)):
+        r"""
+        Find a catalog payload by slug (or another key) and check
+        it is available.
+
+        :param items: Catalog payloads.
+        :type  items: list (dict)
+        :param value: Value to match.
+        :type  value: str, int
+        :param name: Catalog item name used in error messages.
+        :type  name: str
+        :param keys: Payload keys to match the value against.
+        :type  keys: tuple
+        :raises: :class:`InvalidArgumentError <doclient.errors.InvalidArgumentError>`
+        :rtype: dict
+        """
+        for item in items:
+            if any(item.get(key) == value for key in keys):
+                if item.get("available") is False:
+                    raise InvalidArgumentError(
+                        "{0} {1} is not available".format(name, value))
+                return item
+        raise InvalidArgumentError(
+            "Invalid {0} specified. {1} must be one of {2}".format(
+                name.lower(), name, ", ".join(
+                    str(item.get(keys[0])) for item in items)))
+
+    def _make_droplet(self, droplet):
+        r"""
+        Build a Droplet object from an APIv2 droplet payload. The
+        payload is wrapped, not decoded; see :class:`Droplet
+        <doclient.droplet.Droplet>`.
+
+        :param droplet: Droplet payload.
+        :type  droplet: dict
+        :rtype: :class:`Droplet <doclient.droplet.Droplet>`
+        """
+        return Droplet.from_payload(droplet, client=self)
+
+    @staticmethod
+    def _droplet_id(droplet_id):
+        r"""
+        Integer droplet ID of an int or numeric string.
+
+        :raises: :class:`InvalidArgumentError <doclient.errors.InvalidArgumentError>`
+        :rtype: int
+        """
+        if not isinstance(droplet_id, int):
+            try:
+                droplet_id = int(str(droplet_id).strip())
+            except (TypeError, ValueError):
+                droplet_id = None
+
+        if not isinstance(droplet_id, int):
+            raise InvalidArgumentError(
+                "Method requires a valid integer droplet id")
+        return droplet_id
+
+    @staticmethod
+    def _merged(inventory, droplets):
+        r"""
+        Inventory with droplets merged in: droplets replace the held
+        ones with the same IDs in place, and new ones are appended.
+
+        :rtype: list (:class:`Droplet <doclient.droplet.Droplet>`)
+        """
+        merged = dict((droplet.id, droplet) for droplet in droplets)
+        inventory = [merged.pop(droplet.id, droplet)
+                     for droplet in inventory]
+        inventory.extend(droplet for droplet in droplets
+                         if droplet.id in merged)
+        return inventory
+
+    @staticmethod
+    def _make_region(region):
+        r"""
+        Build a Region object from an APIv2 region payload.
+
+        :param region: Region payload.
+        :type  region: dict
+        :rtype: :class:`Region <doclient.meta.Region>`
+        """
+        return Region(**{
+            "name": region.get("name"),
+            "slug": region.get("slug"),
+            "features": region.get("features", []),
+            "sizes": region.get("sizes", []),
+            "available": region.get("available", False)
+        })
+
+    @staticmethod
+    def _key_references(ssh_keys):
+        r"""Whether ssh_keys is a non-empty list of key references"""
+        return isinstance(ssh_keys, list) and bool(ssh_keys) and \
+            all(isinstance(key, (int, str)) for key in ssh_keys)
+
+    def _create_payload(self, names, region, size, image,
+                        ssh_keys=None, backups=False, ipv6=False,
+                        user_data=None, private_networking=False):
+        r"""
+        Validate droplet create arguments and build the APIv2
+        create payload. A list of names builds a multiple droplet
+        create payload.
+
+        :raises: :class:`InvalidArgumentError <doclient.errors.InvalidArgumentError>`
+        :rtype: str
+        """
+        try:
+            if isinstance(names, list):
+                assert all((isinstance(x, str) for x in names)), \
+                    "".join([
+                        "One or more invalid droplet names.",
+                        "Requires a string name"
+                    ])
+            else:
+                assert isinstance(names, str), \
+                    "Invalid droplet name. Requires a string name"
+            assert isinstance(region, str), \
+                "Invalid droplet region. Requires a string region id"
+            assert isinstance(size, str), \
+                "Invalid droplet size. Requires a string size"
+            assert isinstance(image, (int, str)), \
+                "Invalid base image id. Requires a numeric ID or slug"
+        except AssertionError as err:
+            raise InvalidArgumentError(err)
+
+        backups = backups if isinstance(backups, bool) else False
+        private_networking = private_networking if \
+            isinstance(private_networking, bool) else False
+        ipv6 = ipv6 if isinstance(ipv6, bool) else False
+        user_data = user_data if \
+            isinstance(user_data, str) else None
+        ssh_keys = ssh_keys if isinstance(ssh_keys, list) and \
+            all((isinstance(x, (int, str))
+                 for x in ssh_keys)) else False
+        return json_dumps({
+            "names" if isinstance(names, list) else "name": names,
+            "region": region,
+            "size": size,
+            "image": image,
+            "ssh_keys": ssh_keys,
+            "backups": backups,
+            "private_networking": private_networking,
+            "ipv6": ipv6,
+            "user_data": user_data,
+        })
+
 
-        # self.api_calls_left = \
-        #     response.headers.get("ratelimit-remaining")
-        # self.api_quota_reset_at = reset_timestamp
+class DOClient(BaseClient):
 
-        return response.json() if return_json else response
+    r"""DigitalOcean APIv2 client"""
+
+    # Bytes read at a time by incrementally decoded listings.
+    stream_chunk_size = 65536
+
+    def __init__(self, token, pool_size=None, keep_alive=None,
+                 api_base=None, page_concurrency=None, lazy=False,
+                 rate_limiter=None, catalog_cache=None, session=None,
+                 transport=None, store=None, reconcile=False):
+        r"""
+        DigitalOcean APIv2 client init
+        :param token: DigitalOcean API authentication token
+        :type  token: str
+        :param pool_size: Maximum number of pooled connections kept
+                          open to the API. Defaults to 10.
+        :type  pool_size: int
+        :param keep_alive: Reuse connections across requests.
+                           Defaults to True.
+        :type  keep_alive: bool
+        :param api_base: Base URL of the APIv2 endpoint.
+        :type  api_base: str
+        :param page_concurrency: Maximum number of listing pages
+                                 fetched in parallel. Defaults to 4.
+        :type  page_concurrency: int
+        :param lazy: Defer loading droplets, account information and
+                     SSH keys until first accessed. By default they
+                     are loaded in parallel during init.
+        :type  lazy: bool
+        :param rate_limiter: Request scheduler. Defaults to a new
+                             limiter per client.
+        :type  rate_limiter: :class:`RateLimiter
+                             <doclient.ratelimit.RateLimiter>`
+        :param catalog_cache: Catalog cache. Defaults to a new
+                              in-memory cache per client.
+        :type  catalog_cache: :class:`CatalogCache
+                              <doclient.cache.CatalogCache>`
+        :param session: Pooled session to place requests on, e.g. one
+                        shared between the clients of a
+                        :class:`DOClientPool <doclient.pool.DOClientPool>`.
+                        Left open by :meth:`close`. Defaults to a new
+                        session per client.
+        :type  session: requests.Session
+        :param transport: HTTP transport placing the client's
+                          requests. Defaults to a
+                          :class:`RequestsTransport
+                          <doclient.transport.RequestsTransport>` on
+                          session.
+        :type  transport: :class:`Transport
+                          <doclient.transport.Transport>`
+        :param store: Persistent inventory store. Droplets, account
+                      information and SSH keys are restored from its
+                      snapshot during init when fresh, written back
+                      whenever they are fetched, and catalogs are
+                      cached in it unless catalog_cache is passed.
+        :type  store: :class:`InventoryStore
+                      <doclient.store.InventoryStore>`
+        :param reconcile: Reconcile an inventory restored from the
+                          store with the API in the background. By
+                          default it is reconciled on demand, with
+                          :meth:`reconcile`.
+        :type  reconcile: bool
+        """
+        if store is not None and not isinstance(store, InventoryStore):
+            raise InvalidArgumentError(
+                "store needs to be an InventoryStore instance")
+        super(DOClient, self).__init__(
+            token, pool_size=pool_size, keep_alive=keep_alive,
+            api_base=api_base, page_concurrency=page_concurrency,
+            rate_limiter=rate_limiter, catalog_cache=catalog_cache)
+        if transport is None:
+            transport = RequestsTransport(session, self.pool_size,
+                                          self.keep_alive)
+        elif not isinstance(transport, Transport):
+            raise InvalidArgumentError(
+                "transport needs to be a Transport instance")
+        self.transport = transport
+        self.store = store
+        self.inventory_version = 0
+        self.fetched_at = {}
+        self._droplets = None
+        self._index = DropletIndex()
+        self._user = None
+        self._ssh_keys = None
+        self._ssh_key_registry = SSHKeyRegistry()
+        self._load_lock = RLock()
+        self.single_flight = SingleFlight()
+        self.domains = DomainManager(self)
+        self._store_key = None
+        self._reconciling = None
+        self._watcher = None
+        restored = False
+        if store is not None:
+            self._store_key = store.account_key(self.token, self.api_base)
+            if catalog_cache is None:
+                self.catalog_cache = store.catalog_cache(self._store_key)
+            restored = self.restore()
+        if restored and reconcile:
+            self.reconcile(background=True)
+        elif not lazy and not restored:
+            self.load()
+
+    def load(self):
+        r"""
+        Load droplets, account information and SSH keys, placing
+        the three requests in parallel.
+
+        :raises: APIAuthError
+        :rtype: NoneType
+        """
+        executor = ThreadPoolExecutor(max_workers=3)
+        try:
+            futures = [executor.submit(method) for method in (
+                self.get_droplets, self.get_user_information,
+                self.get_ssh_keys)]
+            for future in futures:
+                future.result()
+        finally:
+            executor.shutdown(wait=False)
+        self._user.droplet_count = len(self._droplets)
+
+    def restore(self):
+        r"""
+        Restore droplets, account information and SSH keys from the
+        store's snapshot, skipping any older than the store's
+        max_age. No requests are placed.
+
+        :return: Whether all three were restored.
+        :rtype: bool
+        """
+        if self.store is None:
+            return False
+        snapshot = dict((resource, self.store.get(self._store_key,
+                                                  resource))
+                        for resource in ("droplets", "account",
+                                         "ssh_keys"))
+        if snapshot["droplets"] is not None:
+            stored_at, count = snapshot["droplets"]
+            droplets = sorted(
+                (payload for _, payload in self.store.get_many(
+                    self._store_key, "droplet:").values()),
+                key=lambda payload: payload["id"])
+            snapshot["droplets"] = (stored_at, droplets) \
+                if len(droplets) == count else None
+        with self._load_lock:
+            if snapshot["droplets"] is not None:
+                self.fetched_at["droplets"], droplets = \
+                    snapshot["droplets"]
+                self.droplets = [self._make_droplet(droplet)
+                                 for droplet in droplets]
+            if snapshot["account"] is not None:
+                self.fetched_at["account"], payload = snapshot["account"]
+                self._user = DOUser(**dict(payload, droplet_count=len(
+                    self._droplets) if self._droplets is not None
+                    else None))
+                self._id = self._user.uuid
+            if snapshot["ssh_keys"] is not None:
+                self.fetched_at["ssh_keys"], keys = snapshot["ssh_keys"]
+                self._ssh_key_registry.sync(SSHKey(**key) for key in keys)
+                self._ssh_keys = list(self._ssh_key_registry)
+        restored = [resource for resource, entry in snapshot.items()
+                    if entry is not None]
+        logger.debug("Restored %s from the inventory store",
+                     ", ".join(restored) or "nothing")
+        return len(restored) == len(snapshot)
+
+    def reconcile(self, background=False):
+        r"""
+        Reconcile droplets, account information and SSH keys with
+        the API, writing them through to the store. Until a
+        background reconcile completes, readers keep being served
+        the restored snapshot.
+
+        :param background: Reconcile in a background thread. Only
+                           one background reconcile runs at a time.
+        :type  background: bool
+        :return: The background reconcile's future, whose result
+                 raises the error it failed with.
+        :rtype: concurrent.futures.Future, NoneType
+        """
+        if not background:
+            self.load()
+            return None
+        with self._load_lock:
+            if self._reconciling is None or self._reconciling.done():
+                executor = ThreadPoolExecutor(max_workers=1)
+                self._reconciling = executor.submit(self.load)
+                self._reconciling.add_done_callback(self._reconciled)
+                executor.shutdown(wait=False)
+            return self._reconciling
 
     @staticmethod
-    def get_domain(name):
+    def _reconciled(future):
+        r"""Log the failure of a background reconcile"""
+        error = future.exception()
+        if error is not None:
+            logger.warning("Background reconcile failed: %s", error)
+
+    @property
+    def inventory_age(self):
+        r"""
+        Seconds since the oldest of the loaded droplets, account
+        information and SSH keys was fetched from the API, which
+        for a restored inventory is the age of its snapshot.
+
+        :rtype: float, NoneType
+        """
+        fetched_at = self.fetched_at.values()
+        return time() - min(fetched_at) if fetched_at else None
+
+    def _persist(self, resource, payload):
+        r"""Write a fetched resource through to the store"""
+        self.fetched_at[resource] = fetched_at = time()
+        if self.store is not None:
+            self.store.set(self._store_key, resource, payload,
+                           stored_at=fetched_at)
+
+    def _load_once(self, name, loader):
+        r"""
+        Run a loader for a lazily loaded attribute unless another
+        caller already did.
+        """
+        with self._load_lock:
+            if getattr(self, name) is None:
+                loader()
+        return getattr(self, name)
+
+    @property
+    def droplets(self):
+        r"""
+        Droplets for the requested account. Loaded on first access.
+
+        :rtype: list (:class:`Droplet <doclient.droplet.Droplet>`)
+        """
+        if self._droplets is None:
+            return self._load_once("_droplets", self.get_droplets)
+        return self._droplets
+
+    @droplets.setter
+    def droplets(self, droplets):
+        self._droplets = droplets
+        self.inventory_version += 1
+        self._index = DropletIndex(droplets or ())
+        if self._user is not None and droplets is not None:
+            self._user.droplet_count = len(droplets)
+
+    def refresh(self):
+        r"""
+        Reconcile the local droplet inventory with the API by
+        fetching the full droplet listing.
+
+        :rtype: list (:class:`Droplet <doclient.droplet.Droplet>`)
+        """
+        return self.get_droplets()
+
+    def merge_droplets(self, droplets):
+        r"""
+        Write droplets through to the local inventory, replacing
+        any held with the same IDs. No-op until the inventory has
+        been loaded.
+
+        :param droplets: Droplets to merge.
+        :type  droplets: list (:class:`Droplet <doclient.droplet.Droplet>`)
+        """
+        with self._load_lock:
+            if self._droplets is None:
+                return
+            for droplet in droplets:
+                self._index.add(droplet)
+            self._set_inventory(self._merged(self._droplets, droplets),
+                                changed=droplets)
+
+    def forget_droplets(self, droplet_ids):
+        r"""
+        Remove droplets from the local inventory.
+
+        :param droplet_ids: IDs of the droplets to remove.
+        :type  droplet_ids: list (int)
+        """
+        with self._load_lock:
+            if self._droplets is None:
+                return
+            droplet_ids = set(droplet_ids)
+            for droplet_id in droplet_ids:
+                self._index.remove(droplet_id)
+            self._set_inventory([droplet for droplet in self._droplets
+                                 if droplet.id not in droplet_ids],
+                                removed=droplet_ids)
+
+    def _set_inventory(self, droplets, changed=(), removed=()):
+        r"""
+        Swap in an updated inventory without reindexing it, writing
+        the changed and removed droplets through to the store
+        """
+        self._droplets = droplets
+        self.inventory_version += 1
+        if self._user is not None:
+            self._user.droplet_count = len(droplets)
+        self._store_droplets(changed, removed)
+
+    def _store_droplets(self, droplets, removed=(), replace=False):
+        r"""
+        Write droplets through to the store, one row each, along with
+        the droplet count of the inventory they belong to.
+
+        :param droplets: Droplets to write.
+        :type  droplets: list (:class:`Droplet <doclient.droplet.Droplet>`)
+        :param removed: IDs of droplets to drop.
+        :type  removed: iterable (int)
+        :param replace: Drop every other stored droplet.
+        :type  replace: bool
+        """
+        if self.store is None:
+            return
+        stored_at = self.fetched_at.get("droplets") or time()
+        entries = dict(("droplet:{0}".format(droplet.id),
+                        (stored_at, droplet._extra))
+                       for droplet in droplets)
+        entries["droplets"] = (stored_at, len(self._droplets))
+        self.store.set_many(
+            self._store_key, entries,
+            drop=["droplet:{0}".format(droplet_id)
+                  for droplet_id in removed],
+            prefix="droplet:" if replace else None)
+
+    @property
+    def droplet_index(self):
+        r"""
+        Index over the droplet inventory, kept in step with
+        :attr:`droplets`. Loads droplets on first access.
+
+        :rtype: :class:`DropletIndex <doclient.index.DropletIndex>`
+        """
+        if self._droplets is None:
+            self._load_once("_droplets", self.get_droplets)
+        return self._index
+
+    @property
+    def watcher(self):
+        r"""
+        Change feed over the droplet inventory, shared by every
+        subscriber of the client. Created on first access.
+
+        :rtype: :class:`DropletWatcher <doclient.watch.DropletWatcher>`
+        """
+        if self._watcher is None:
+            with self._load_lock:
+                if self._watcher is None:
+                    self._watcher = DropletWatcher(self)
+        return self._watcher
+
+    @property
+    def user(self):
+        r"""
+        Account information. Loaded on first access.
+
+        :rtype: :class:`DOUser <doclient.user.DOUser>`
+        """
+        if self._user is None:
+            return self._load_once("_user", self.get_user_information)
+        return self._user
+
+    @property
+    def ssh_keys(self):
+        r"""
+        SSH keys associated with the account. Loaded on first access.
+
+        :rtype: list (:class:`SSHKey <doclient.meta.SSHKey>`)
+        """
+        if self._ssh_keys is None:
+            return self._load_once("_ssh_keys", self.get_ssh_keys)
+        return self._ssh_keys
+
+    @property
+    def ssh_key_registry(self):
+        r"""
+        Registry of the account's SSH keys by ID, fingerprint and
+        name, kept in step with :attr:`ssh_keys`. Loads SSH keys on
+        first access.
+
+        :rtype: :class:`SSHKeyRegistry <doclient.keys.SSHKeyRegistry>`
+        """
+        if self._ssh_keys is None:
+            self._load_once("_ssh_keys", self.get_ssh_keys)
+        return self._ssh_key_registry
+
+    @property
+    def id(self):
+        r"""Account UUID of the client's user"""
+        return self.user.uuid
+
+    def get_user_information(self):
+        r"""DigitalOcean APIv2 user information helper method"""
+
+        response = self.api_request(url=self.userinfo_url,
+                                    return_json=False)
+
+        if not response.status_code == 200:
+            raise APIAuthError("Unable to authenticate session")
+
+        payload = response.json().get("account")
+        droplets = self._droplets
+        payload.update({
+            "droplet_count": len(droplets)
+            if droplets is not None else None
+        })
+
+        user = DOUser(**payload)
+        self._user = user
+        self._id = user.uuid
+        self._persist("account", user.as_dict())
+        return user
+
+    def get_ssh_keys(self):
+        r"""
+        Helper method to retrieve the list of SSH keys associated
+        with a DigitalOcean user account. The key registry is synced
+        with the listing, applying only added, removed and changed
+        keys.
+
+        :rtype: list (:class:`SSHKey <doclient.meta.SSHKey>`)
+        """
+        listing = list(self.iter_ssh_keys())
+        with self._load_lock:
+            added, removed = self._ssh_key_registry.sync(listing)
+            if added or removed:
+                logger.debug("SSH keys synced: %d added or changed, "
+                             "%d removed", len(added), len(removed))
+            self._ssh_keys = list(self._ssh_key_registry)
+            self._persist("ssh_keys", [key.as_dict()
+                                       for key in self._ssh_keys])
+        return self._ssh_keys
+
+    def get_ssh_key(self, reference):
+        r"""
+        SSH key lookup by ID, fingerprint or name over the loaded
+        keys.
+
+        :param reference: Key ID, fingerprint or name.
+        :type  reference: int, str
+        :raises: :class:`InvalidArgumentError <doclient.errors.InvalidArgumentError>`
+                 if a name is shared by several keys.
+        :rtype: :class:`SSHKey <doclient.meta.SSHKey>`, NoneType
+        """
+        return self.ssh_key_registry.get(reference)
+
+    def resolve_ssh_keys(self, references):
+        r"""
+        Key IDs for SSH key IDs, fingerprints or names, resolved
+        against the loaded keys. The keys are synced once if a
+        reference is not found locally.
+
+        :param references: Key IDs, fingerprints or names.
+        :type  references: list (int, str)
+        :raises: :class:`InvalidArgumentError <doclient.errors.InvalidArgumentError>`
+        :rtype: list (int)
+        """
+        key_ids, missing = self.ssh_key_registry.resolve(references)
+        if missing:
+            self.get_ssh_keys()
+            key_ids, missing = self._ssh_key_registry.resolve(references)
+        if missing:
+            raise InvalidArgumentError("Unknown SSH keys {0}".format(
+                ", ".join(str(reference) for reference in missing)))
+        return key_ids
+
+    def iter_ssh_keys(self, concurrency=None):
+        r"""
+        Iterate over the SSH keys associated with a DigitalOcean
+        user account across all result pages.
+
+        :param concurrency: Maximum number of pages fetched in
+                            parallel.
+        :type  concurrency: int
+        :rtype: generator (:class:`SSHKey <doclient.meta.SSHKey>`)
+        """
+        for key in self.iter_pages(self.keys_url, "ssh_keys",
+                                   concurrency=concurrency):
+            yield SSHKey(**key)
+
+    def __repr__(self):
+        return "DigitalOcean API Client {0}".format(self._id)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __str__(self):
+        return "DigitalOcean API Client {0}".format(self._id)
+
+    @property
+    def session(self):
+        r"""
+        Pooled HTTP session used for all of the DOClient's requests,
+        when they go through a :class:`RequestsTransport
+        <doclient.transport.RequestsTransport>`. Created on first use
+        and after :meth:`close`.
+
+        :rtype: requests.Session, NoneType
+        """
+        return getattr(self.transport, "session", None)
+
+    @classmethod
+    def make_session(cls, pool_size=None, keep_alive=None):
+        r"""
+        Create a pooled HTTP session suitable for DOClient requests.
+
+        :param pool_size: Maximum number of pooled connections.
+                          Defaults to the class's pool_size.
+        :type  pool_size: int
+        :param keep_alive: Reuse connections across requests.
+                           Defaults to the class's keep_alive.
+        :type  keep_alive: bool
+        :rtype: requests.Session
+        """
+        return RequestsTransport.make_session(
+            pool_size or cls.pool_size,
+            cls.keep_alive if keep_alive is None else keep_alive)
+
+    def close(self):
+        r"""
+        Close the client's connection pool and stop its droplet
+        watcher. A new pool is opened if the client is used again.
+        A session passed in at init is left open for its owner to
+        close.
+
+        :rtype: NoneType
+        """
+        if self._watcher is not None:
+            self._watcher.close()
+        self.transport.close()
+
+    def iter_pages(self, url, key, concurrency=None, stream=False):
+        r"""
+        Iterate over the items of a paginated APIv2 listing.
+
+        Items of each page are yielded as soon as the page arrives.
+        Once the first page reports meta.total, the remaining pages
+        are fetched in parallel with at most `concurrency` requests
+        in flight and yielded in page order. Listings without a
+        total follow links.pages.next one page at a time.
+
+        :param url: Listing endpoint path or URL.
+        :type  url: str
+        :param key: Response key holding the listing items.
+        :type  key: str
+        :param concurrency: Maximum number of pages fetched in
+                            parallel. Defaults to page_concurrency.
+        :type  concurrency: int
+        :param stream: Decode each page incrementally, see
+                       :meth:`iter_stream`.
+        :type  stream: bool
+        :rtype: generator (dict)
+        """
+        if stream:
+            yield from self.iter_stream(url, key)
+            return
+
+        concurrency = concurrency or self.page_concurrency
+        response = self.api_request(url=self.page_url(url, 1))
+        items = response.get(key) or []
+        for item in items:
+            yield item
+
+        next_url = get_next_page(response)
+        if not next_url:
+            return
+
+        total = (response.get("meta") or {}).get("total")
+        if not isinstance(total, int) or concurrency < 2 or not items:
+            while next_url:
+                response = self.api_request(url=next_url)
+                for item in response.get(key) or []:
+                    yield item
+                next_url = get_next_page(response)
+            return
+
+        # The API may cap per_page, so size the remaining pages on
+        # what the (full) first page actually carried.
+        per_page = len(items)
+        last_page = int(ceil(total / float(per_page)))
+        pages = iter(range(2, last_page + 1))
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        pending = deque()
+
+        def fetch(page):
+            """Fetch a single listing page"""
+            return self.api_request(
+                url=self.page_url(url, page, per_page))
+
+        try:
+            for page in islice(pages, concurrency):
+                pending.append(executor.submit(fetch, page))
+            while pending:
+                response = pending.popleft().result()
+                for page in islice(pages, 1):
+                    pending.append(executor.submit(fetch, page))
+                for item in response.get(key) or []:
+                    yield item
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def iter_stream(self, url, key):
+        r"""
+        Iterate over the items of a paginated APIv2 listing, decoding
+        each page incrementally as its body arrives.
+
+        Items are yielded as soon as they have been received, and
+        only one page's undecoded tail is held in memory at a time,
+        so peak memory stays flat however large the listing. Pages
+        are fetched one after another, following links.pages.next.
+
+        :param url: Listing endpoint path or URL.
+        :type  url: str
+        :param key: Response key holding the listing items.
+        :type  key: str
+        :raises: :class:`APIError <doclient.errors.APIError>` on a
+                 truncated or malformed page body.
+        :rtype: generator (dict)
+        """
+        next_url = self.page_url(url, 1)
+        while next_url:
+            decoder = ArrayStreamDecoder(key)
+            response = self.api_request(url=next_url, stream=True)
+            try:
+                for chunk in response.iter_content(
+                        self.stream_chunk_size):
+                    yield from decoder.feed(chunk)
+                yield from decoder.close()
+            except ValueError as error:
+                raise APIError("Invalid listing response: {0}".format(
+                    error))
+            finally:
+                response.close()
+            next_url = get_next_page(decoder.rest)
+
+    def api_request(self, url, method="GET",
+                    data=None, return_json=True, stream=False):
+        r"""
+        DigitalOcean API request helper method.
+
+        :param url: REST API url to place a HTTP request to.
+        :type  url: str
+        :param method: HTTP method
+        :type  method: str
+        :param data: HTTP payload (JSON dumpable)
+        :type  data: dict
+        :param return_json: Specifies return data format.
+                            If false, returns bare response.
+                            Else returns an APIResponse object.
+        :type  return_json: bool
+        :param stream: Return the bare response without reading its
+                       body, for incremental decoding.
+        :type  stream: bool
+        :rtype: dict, requests.models.Response (or the response
+                type of the client's transport)
+
+        JSON GETs are revalidated with the ETag / Last-Modified
+        validators of the URL's previous response, and HTTP 304
+        replies are served from its stored payload (see
+        :class:`ValidatorCache <doclient.cache.ValidatorCache>`).
+        Concurrent JSON GETs of the same URL share one in-flight
+        request and its decoded payload (see :class:`SingleFlight
+        <doclient.singleflight.SingleFlight>`), unless
+        coalesce_requests is off.
+        """
+
+        method = (method or "GET").upper()
+
+        if method not in self.http_methods:
+            raise InvalidArgumentError(
+                "Invalid HTTP method requested")
+
+        url = self.resolve_url(url)
+        return_json = return_json and not stream
+        if method == "GET" and return_json and self.coalesce_requests:
+            return self.single_flight.do(url, lambda: self._send(url))
+        return self._send(url, method, data, return_json, stream)
+
+    def _send(self, url, method="GET", data=None, return_json=True,
+              stream=False):
+        r"""Place a request for api_request, retrying HTTP 429s"""
+        conditional = method == "GET" and return_json
+        headers = self.request_headers
+        if conditional:
+            headers = dict(headers,
+                           **self.validator_cache.request_headers(url))
+        if isinstance(data, dict):
+            data = json_dumps(data)
+
+        event = self.request_event(method, url)
+        started = perf_counter()
+        attempt, response = 0, None
+        try:
+            while True:
+                delay = self.reserve_request()
+                if delay > 0:
+                    sleep(delay)
+                response = self.transport.request(
+                    method, url, headers, data=data, stream=stream)
+
+                self.track_rate_limit(response.headers)
+                if response.status_code != 429:
+                    break
+                logger.debug("Rate limited on %s %s, retry %d",
+                             method, url, attempt + 1)
+                delay = self.retry_delay(attempt, response.headers)
+                if stream:
+                    # Release the throttled reply's connection
+                    # before retrying.
+                    response.close()
+                sleep(delay)
+                attempt += 1
+
+            self.check_status(response.status_code)
+        except BaseError as error:
+            if stream and response is not None:
+                response.close()
+            if event is not None:
+                self.finish_event(
+                    event, started,
+                    response.status_code if response is not None
+                    else None, 0, attempt, error)
+            raise
+        if event is not None:
+            self.finish_event(
+                event, started, response.status_code,
+                int(response.headers.get("content-length") or 0)
+                if stream else len(response.content), attempt)
+
+        if conditional:
+            if response.status_code == 304:
+                payload = self.validator_cache.revalidated(url)
+                if payload is not None:
+                    return payload
+                # Validators evicted while the request was in flight
+                return self._send(url)
+            payload = loads(response.content)
+            self.validator_cache.store(url, response.headers, payload)
+            return payload
+        return loads(response.content) if return_json else response
+
+    def get_domain(self, name):
         r"""
         Get information for a particular domain managed through
         DigitalOcean's DNS interface.
 
         :param name: Domain name
         :type  name: str
-        :rtype: dict
+        :rtype: :class:`Domain <doclient.meta.Domain>`
         """
-        return Domain.get(name)
+        return self.domains.get(name)
 
-    @staticmethod
-    def delete_domain(name):
+    def delete_domain(self, name):
         r"""
         Delete a domain mapping managed through DigitalOcean's DNS
         interface.
@@ -281,10 +1309,9 @@ class DOClient(BaseObject):
         :type  name: str
         :rtype: dict
         """
-        return Domain.delete(name)
+        return self.domains.delete(name)
 
-    @staticmethod
-    def create_domain(name, ip_address):
+    def create_domain(self, name, ip_address):
         r"""
         Helper method to create domain name mapping for domains
         managed through DigitalOcean's DNS interface.
@@ -295,18 +1322,11 @@ class DOClient(BaseObject):
         :type ip_address: str
         :rtype: dict
         """
-        try:
-            assert isinstance(name, str), \
-                "name needs to be a valid domain name string"
-            assert isinstance(ip_address, str), \
-                "ip_address needs to be a valid IPV4/IPV6 address"
-            domain = Domain.create(name, ip_address)
-            return {
-                "message": "Domain mapping created successfully",
-                "data": domain.as_json()
-            }
-        except AssertionError as error:
-            raise InvalidArgumentError(error)
+        domain = self.domains.create(name, ip_address)
+        return {
+            "message": "Domain mapping created successfully",
+            "data": domain.as_json()
+        }
 
     def get_domains(self):
         r"""
@@ -314,7 +1334,90 @@ class DOClient(BaseObject):
 
         :rtype: list (:class: `Domain <doclient.meta.Domain>` )
         """
-        return Domain.get_all()
+        return self.domains.all()
+
+    def get_catalog(self, key, url, items_key):
+        r"""
+        Catalog listing payloads, served from the catalog cache
+        while fresh and fetched in full otherwise.
+
+        :param key: Catalog cache key.
+        :type  key: str
+        :param url: Listing endpoint path.
+        :type  url: str
+        :param items_key: Response key holding the listing items.
+        :type  items_key: str
+        :rtype: list (dict)
+        """
+        items = self.catalog_cache.get(key)
+        if items is None:
+            items = list(self.iter_pages(url, items_key))
+            self.catalog_cache.set(key, items)
+        return items
+
+    def invalidate_catalog(self, resource=None):
+        r"""
+        Drop cached catalog data.
+
+        :param resource: sizes, regions, images or kernels. Drops
+                         all catalogs when omitted.
+        :type  resource: str
+        """
+        self.catalog_cache.invalidate(resource)
+
+    def validate_size(self, size):
+        r"""
+        Check a size slug against the cached sizes catalog.
+
+        :param size: Size slug.
+        :type  size: str
+        :raises: :class:`InvalidArgumentError <doclient.errors.InvalidArgumentError>`
+        :rtype: :class:`DropletSize <doclient.droplet.DropletSize>`
+        """
+        sizes = self.get_catalog("sizes", self.sizes_url, "sizes")
+        return DropletSize(**self.find_catalog_item(sizes, size, "Size"))
+
+    def validate_region(self, region, size=None):
+        r"""
+        Check a region slug against the cached regions catalog, and
+        optionally that a size is offered in it.
+
+        :param region: Region slug.
+        :type  region: str
+        :param size: Size slug.
+        :type  size: str
+        :raises: :class:`InvalidArgumentError <doclient.errors.InvalidArgumentError>`
+        :rtype: :class:`Region <doclient.meta.Region>`
+        """
+        regions = self.get_catalog("regions", self.regions_url,
+                                   "regions")
+        region = self._make_region(
+            self.find_catalog_item(regions, region, "Region"))
+        if size is not None and region.sizes and \
+                size not in region.sizes:
+            raise InvalidArgumentError(
+                "Size {0} is not available in region {1}".format(
+                    size, region.slug))
+        return region
+
+    def validate_image(self, image):
+        r"""
+        Check an image ID or slug against the cached images catalog.
+
+        :param image: Image ID or slug.
+        :type  image: int, str
+        :raises: :class:`InvalidArgumentError <doclient.errors.InvalidArgumentError>`
+        :rtype: :class:`Image <doclient.droplet.Image>`
+        """
+        images = self.get_catalog("images", self.images_url, "images")
+        return Image(**self.find_catalog_item(
+            images, image, "Image", keys=("slug", "id")))
+
+    def _validate_spec(self, region, size, image):
+        r"""Validate droplet create arguments against the catalogs"""
+        self.validate_size(size)
+        self.validate_region(region, size)
+        self.validate_image(image)
 
     def get_images(self):
         r"""
@@ -322,9 +1425,26 @@ class DOClient(BaseObject):
 
         :raises: APIAuthError
         """
-        response = self.api_request(url=self.images_url)
-        images = response.get("images")
-        return [Image(**image) for image in images]
+        return [Image(**image) for image in
+                self.get_catalog("images", self.images_url, "images")]
+
+    def iter_images(self, concurrency=None, stream=False):
+        r"""
+        Iterate over images available in your DigitalOcean account
+        across all result pages.
+
+        :param concurrency: Maximum number of pages fetched in
+                            parallel.
+        :type  concurrency: int
+        :param stream: Decode pages incrementally, yielding images
+                       as they arrive.
+        :type  stream: bool
+        :rtype: generator (:class:`Image <doclient.droplet.Image>`)
+        """
+        for image in self.iter_pages(self.images_url, "images",
+                                     concurrency=concurrency,
+                                     stream=stream):
+            yield Image(**image)
 
     def get_sizes(self):
         r"""
@@ -332,9 +1452,22 @@ class DOClient(BaseObject):
 
         :raises: APIAuthError
         """
-        response = self.api_request(url=self.sizes_url)
-        sizes = response.get("sizes")
-        return [DropletSize(**size) for size in sizes]
+        return [DropletSize(**size) for size in
+                self.get_catalog("sizes", self.sizes_url, "sizes")]
+
+    def iter_sizes(self, concurrency=None):
+        r"""
+        Iterate over available droplet sizes across all result pages.
+
+        :param concurrency: Maximum number of pages fetched in
+                            parallel.
+        :type  concurrency: int
+        :rtype: generator (:class:`DropletSize
+                <doclient.droplet.DropletSize>`)
+        """
+        for size in self.iter_pages(self.sizes_url, "sizes",
+                                    concurrency=concurrency):
+            yield DropletSize(**size)
 
     def get_droplets(self):
         r"""
@@ -342,82 +1475,365 @@ class DOClient(BaseObject):
 
         :raises: APIAuthError
         """
+        droplets = list(self.iter_droplets())
+        with self._load_lock:
+            self.droplets = droplets
+            self.fetched_at["droplets"] = time()
+            self._store_droplets(droplets, replace=True)
+        return droplets
+
+    def iter_droplets(self, concurrency=None, stream=False):
+        r"""
+        Iterate over droplets for the requested account across all
+        result pages. Droplets are yielded as each page arrives.
+
+        :param concurrency: Maximum number of pages fetched in
+                            parallel.
+        :type  concurrency: int
+        :param stream: Decode pages incrementally, yielding droplets
+                       as they arrive.
+        :type  stream: bool
+        :rtype: generator (:class:`Droplet <doclient.droplet.Droplet>`)
+        """
+        for droplet in self.iter_pages(self.droplet_url, "droplets",
+                                       concurrency=concurrency,
+                                       stream=stream):
+            yield self._make_droplet(droplet)
 
-        response = self.api_request(url=self.droplet_url)
-
-        droplets = response.get("droplets", [])
-        _droplets = []
-
-        for droplet in droplets:
-
-            droplet_networks = droplet.get("networks", {})
-            v4_networks = droplet_networks.get("v4", [])
-            v6_networks = droplet_networks.get("v6", [])
-            droplet_network_objects = []
-            droplet_ipv4_ip, droplet_ipv6_ip = None, None
-
-            for idx, v4_network in enumerate(v4_networks):
-                ip = v4_network.get("ip_address")
-                netmask = v4_network.get("netmask")
-                gateway = v4_network.get("gateway")
-                is_public = v4_network.get("type") == "public"
-                network_type = "ipv4"
-                network = DropletNetwork(**{
-                    "ip_address": ip,
-                    "netmask": netmask,
-                    "gateway": gateway,
-                    "is_public": is_public,
-                    "network_type": network_type
-                })
-                droplet_network_objects.append(network)
-                if is_public:
-                    droplet_ipv4_ip = ip
-
-            for idx, v6_network in enumerate(v6_networks):
-                ip = v6_network.get("ip_address")
-                netmask = v6_network.get("netmask")
-                gateway = v6_network.get("gateway")
-                is_public = v6_network.get("type") == "public"
-                network_type = "ipv6"
-                network = DropletNetwork(**{
-                    "ip_address": ip,
-                    "netmask": netmask,
-                    "gateway": gateway,
-                    "is_public": is_public,
-                    "network_type": network_type
-                })
-                droplet_network_objects.append(network)
-                if is_public:
-                    droplet_ipv6_ip = ip
-
-            droplet = Droplet(**{
-                "name": droplet.get("name"),
-                "_id": droplet.get("id"),
-                "client": self,
-                "networks": droplet_network_objects,
-                "ipv4_ip": droplet_ipv4_ip,
-                "ipv6_ip": droplet_ipv6_ip
-            })
-            _droplets.append(droplet)
-
-        self.droplets = _droplets
-
-    def poweroff_droplet(self, instance_id):
+    def droplet_action(self, instance_id, data, message):
         r"""
-        Instance power off helper method.
+        Initiate a droplet action.
 
-        :param instance_id: ID of the instance to turn off.
+        :param instance_id: ID of the droplet to act on.
         :type  instance_id: int, str<int>
+        :param data: Action payload.
+        :type  data: str, dict
+        :param message: Status message for an initiated action.
+        :type  message: str
+        :return: Status message and, when initiated, the
+                 :class:`Action <doclient.actions.Action>` handle.
         :rtype: dict
         """
         url = self.power_onoff_url % instance_id
         try:
-            self.api_request(url=url,
-                             method="post",
-                             data=self.poweroff_data)
-            return {"message": "Initiated droplet poweroff"}
+            response = self.api_request(url=url,
+                                        method="post",
+                                        data=data)
         except APIAuthError as error:
             return {"message": error.message}
+        action = response.get("action")
+        if not action:
+            return {"message": response.get("message", message)}
+        return {"message": message,
+                "action": Action(client=self, **action)}
+
+    def tag_action(self, tag_name, data, message):
+        r"""
+        Initiate an action on all droplets carrying a tag with one
+        request.
+
+        :param tag_name: Droplet tag.
+        :type  tag_name: str
+        :param data: Action payload.
+        :type  data: str, dict
+        :param message: Status message for initiated actions.
+        :type  message: str
+        :return: Status message and, when initiated, the
+                 :class:`Action <doclient.actions.Action>` handles.
+        :rtype: dict
+        """
+        if not isinstance(tag_name, str) or not tag_name:
+            raise InvalidArgumentError(
+                "Method requires a valid tag name")
+        url = self.tag_actions_url % quote(tag_name, safe="")
+        try:
+            response = self.api_request(url=url, method="post",
+                                        data=data)
+        except APIAuthError as error:
+            return {"message": error.message}
+        actions = response.get("actions")
+        if actions is None:
+            return {"message": response.get("message", message)}
+        return {"message": message,
+                "actions": [Action(client=self, **action)
+                            for action in actions]}
+
+    def fan_out(self, function, items, concurrency=None, progress=None):
+        r"""
+        Call a function for each item on a bounded worker pool.
+
+        :param function: Callable taking one item.
+        :type  function: callable
+        :param items: Items to call the function with.
+        :type  items: iterable
+        :param concurrency: Maximum calls in flight. Defaults to
+                            the connection pool size.
+        :type  concurrency: int
+        :param progress: Callable taking the number of calls done
+                         and the total, called as each call ends.
+        :type  progress: callable
+        :return: Results in item order. Calls failing with a doclient
+                 error return the error in place.
+        :rtype: list
+        """
+        items = list(items)
+        if not items:
+            return []
+        total, done = len(items), [0]
+        lock = Lock()
+
+        def call(item):
+            """Call the function, returning doclient errors"""
+            try:
+                return function(item)
+            except BaseError as error:
+                return error
+            finally:
+                if progress is not None:
+                    with lock:
+                        done[0] += 1
+                        try:
+                            progress(done[0], total)
+                        except Exception:
+                            logger.exception("Progress callback %r "
+                                             "failed", progress)
+
+        workers = min(concurrency or self.pool_size, len(items))
+        if workers < 2:
+            return [call(item) for item in items]
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            return list(executor.map(call, items))
+        finally:
+            executor.shutdown(wait=True)
+
+    def map_droplets(self, function, droplets=None, concurrency=None,
+                     progress=None, reserve=0):
+        r"""
+        Run a per-droplet query over many droplets concurrently,
+        e.g. ``client.map_droplets(lambda d: d.get_snapshots())``.
+
+        Every request is paced by the client's rate limiter, which
+        holds requests once the API's budget is spent. With a
+        reserve, droplets not yet started once the budget reported
+        by the API falls to the reserve fail with RateLimitError
+        instead, leaving that many requests for other callers.
+
+        For neighbours, :meth:`get_all_neighbours` reads the whole
+        account with one request.
+
+        :param function: Callable taking one droplet.
+        :type  function: callable
+        :param droplets: Droplets to query. Defaults to the loaded
+                         inventory.
+        :type  droplets: iterable (:class:`Droplet
+                         <doclient.droplet.Droplet>`)
+        :param concurrency: Maximum droplets queried at once.
+                            Defaults to the connection pool size.
+        :type  concurrency: int
+        :param progress: Callable taking the number of droplets done
+                         and the total, called as each one ends.
+        :type  progress: callable
+        :param reserve: Requests of the API's remaining rate budget
+                        to leave unspent.
+        :type  reserve: int
+        :return: Results in droplet order. Droplets failing with a
+                 doclient error have the error in place.
+        :rtype: list
+        """
+        if not callable(function):
+            raise InvalidArgumentError("function needs to be callable")
+        if concurrency is not None and \
+                (not isinstance(concurrency, int) or concurrency < 1):
+            raise InvalidArgumentError(
+                "concurrency needs to be a positive integer")
+        if not isinstance(reserve, int) or reserve < 0:
+            raise InvalidArgumentError(
+                "reserve needs to be a non-negative integer")
+        droplets = self.droplets if droplets is None else droplets
+
+        def call(droplet):
+            """Query a droplet unless the budget is down to reserve"""
+            remaining = self.rate_limiter.remaining
+            if reserve and remaining is not None and remaining <= reserve:
+                raise RateLimitError(
+                    "Rate budget down to the reserve of {0} "
+                    "requests".format(reserve))
+            return function(droplet)
+
+        return self.fan_out(call, droplets, concurrency=concurrency,
+                            progress=progress)
+
+    def get_all_neighbours(self):
+        r"""
+        Droplets of the account sharing a physical server with
+        another of its droplets, from the account-wide neighbours
+        report. One request replaces a :meth:`Droplet.get_neighbours
+        <doclient.droplet.Droplet.get_neighbours>` call per droplet.
+        Droplets not in the loaded inventory are left out.
+
+        :return: Droplet IDs mapped to their neighbours.
+        :rtype: dict (int, list (:class:`Droplet
+                <doclient.droplet.Droplet>`))
+        """
+        response = self.api_request(url=self.neighbours_report_url)
+        index = self.droplet_index
+        neighbours = {}
+        for group in response.get("neighbor_ids") or ():
+            droplets = [droplet for droplet in
+                        (index.get(droplet_id) for droplet_id in group)
+                        if droplet is not None]
+            for droplet in droplets:
+                neighbours[droplet.id] = [
+                    neighbour for neighbour in droplets
+                    if neighbour is not droplet]
+        return neighbours
+
+    def _bulk_action(self, droplet_ids, data, message, concurrency):
+        r"""Fan a droplet action out over a list of droplet IDs"""
+        results = self.fan_out(
+            lambda droplet_id: self.droplet_action(
+                droplet_id, data, message),
+            droplet_ids, concurrency=concurrency)
+        return [result if isinstance(result, dict)
+                else {"message": result.message} for result in results]
+
+    def poweroff_droplets(self, droplet_ids, concurrency=None):
+        r"""
+        Power off many droplets concurrently.
+
+        :param droplet_ids: IDs of the droplets to turn off.
+        :type  droplet_ids: list<int>
+        :param concurrency: Maximum requests in flight.
+        :type  concurrency: int
+        :return: Per-droplet results, in droplet_ids order.
+        :rtype: list (dict)
+        """
+        return self._bulk_action(droplet_ids, self.poweroff_data,
+                                 "Initiated droplet poweroff",
+                                 concurrency)
+
+    def poweron_droplets(self, droplet_ids, concurrency=None):
+        r"""
+        Power on many droplets concurrently.
+
+        :param droplet_ids: IDs of the droplets to turn on.
+        :type  droplet_ids: list<int>
+        :param concurrency: Maximum requests in flight.
+        :type  concurrency: int
+        :return: Per-droplet results, in droplet_ids order.
+        :rtype: list (dict)
+        """
+        return self._bulk_action(droplet_ids, self.poweron_data,
+                                 "Initiated droplet poweron",
+                                 concurrency)
+
+    def powercycle_droplets(self, droplet_ids, concurrency=None):
+        r"""
+        Power cycle many droplets concurrently.
+
+        :param droplet_ids: IDs of the droplets to power cycle.
+        :type  droplet_ids: list<int>
+        :param concurrency: Maximum requests in flight.
+        :type  concurrency: int
+        :return: Per-droplet results, in droplet_ids order.
+        :rtype: list (dict)
+        """
+        return self._bulk_action(droplet_ids, self.powercycle_data,
+                                 "Initiated droplet power cycle",
+                                 concurrency)
+
+    def poweroff_tag(self, tag_name):
+        r"""
+        Power off all droplets carrying a tag with one request.
+
+        :param tag_name: Droplet tag.
+        :type  tag_name: str
+        :rtype: dict
+        """
+        return self.tag_action(tag_name, self.poweroff_data,
+                               "Initiated tagged droplets poweroff")
+
+    def poweron_tag(self, tag_name):
+        r"""
+        Power on all droplets carrying a tag with one request.
+
+        :param tag_name: Droplet tag.
+        :type  tag_name: str
+        :rtype: dict
+        """
+        return self.tag_action(tag_name, self.poweron_data,
+                               "Initiated tagged droplets poweron")
+
+    def powercycle_tag(self, tag_name):
+        r"""
+        Power cycle all droplets carrying a tag with one request.
+
+        :param tag_name: Droplet tag.
+        :type  tag_name: str
+        :rtype: dict
+        """
+        return self.tag_action(tag_name, self.powercycle_data,
+                               "Initiated tagged droplets power cycle")
+
+    def get_action(self, action_id):
+        r"""
+        Get an action by ID.
+
+        :param action_id: Action ID.
+        :type  action_id: int
+        :rtype: :class:`Action <doclient.actions.Action>`
+        """
+        response = self.api_request(url=self.action_url % action_id)
+        action = response.get("action")
+        if not action:
+            raise InvalidArgumentError("Action not found")
+        return Action(client=self, **action)
+
+    def wait_for_action(self, action, timeout=None):
+        r"""
+        Wait for an action to complete, polling with backoff.
+
+        :param action: Action handle or ID.
+        :type  action: :class:`Action <doclient.actions.Action>`, int
+        :param timeout: Seconds to wait before giving up.
+        :type  timeout: float
+        :raises: :class:`ActionError <doclient.errors.ActionError>`
+        :rtype: :class:`Action <doclient.actions.Action>`
+        """
+        if not isinstance(action, Action):
+            action = self.get_action(action)
+        return wait_all(self, [action], timeout=timeout)[0]
+
+    def wait_all(self, actions, timeout=None, raise_on_error=True):
+        r"""
+        Wait for many actions to complete. Polling is batched into
+        action listing calls when several actions are pending.
+
+        :param actions: Action handles.
+        :type  actions: list (:class:`Action <doclient.actions.Action>`)
+        :param timeout: Seconds to wait before giving up.
+        :type  timeout: float
+        :param raise_on_error: Raise if any action errored.
+        :type  raise_on_error: bool
+        :raises: :class:`ActionError <doclient.errors.ActionError>`
+        :rtype: list (:class:`Action <doclient.actions.Action>`)
+        """
+        return wait_all(self, list(actions), timeout=timeout,
+                        raise_on_error=raise_on_error)
+
+    def poweroff_droplet(self, instance_id):
+        r"""
+        Instance power off helper method.
+
+        :param instance_id: ID of the instance to turn off.
+        :type  instance_id: int, str<int>
+        :return: Status message and, when initiated, the
+                 :class:`Action <doclient.actions.Action>` handle.
+        :rtype: dict
+        """
+        return self.droplet_action(instance_id, self.poweroff_data,
+                                   "Initiated droplet poweroff")
 
     def poweron_droplet(self, instance_id):
         r"""
@@ -425,16 +1841,12 @@ class DOClient(BaseObject):
 
         :param instance_id: ID of the instance to turn on.
         :type  instance_id: int, str<int>
+        :return: Status message and, when initiated, the
+                 :class:`Action <doclient.actions.Action>` handle.
         :rtype: dict
         """
-        url = self.power_onoff_url % instance_id
-        try:
-            self.api_request(url=url,
-                             method="post",
-                             data=self.poweron_data)
-            return {"message": "Initiated droplet poweron"}
-        except APIAuthError as error:
-            return {"message": error.message}
+        return self.droplet_action(instance_id, self.poweron_data,
+                                   "Initiated droplet poweron")
 
     def powercycle_droplet(self, instance_id):
         r"""
@@ -442,51 +1854,36 @@ class DOClient(BaseObject):
 
         :param instance_id: ID of the instance to powercycle.
         :type  instance_id: int, str<int>
+        :return: Status message and, when initiated, the
+                 :class:`Action <doclient.actions.Action>` handle.
         :rtype: dict
         """
-        url = self.power_onoff_url % instance_id
-        try:
-            self.api_request(url=url,
-                             method="post",
-                             data=self.powercycle_data)
-            return {"message": "Initiated droplet power cycle"}
-        except APIAuthError as error:
-            return {"message": error.message}
+        return self.droplet_action(instance_id, self.powercycle_data,
+                                   "Initiated droplet power cycle")
 
     def get_droplet(self, droplet_id):
         r"""
         Basic droplet find helper.
-        Filters out droplets which match the provided droplet id.
-        [Essentially one droplet].
+        Finds the droplet which matches the provided droplet id.
 
         :param droplet_id: ID to match droplets against.
         :type  droplet_id: int, str
-        :rtype: list<Droplet>
+        :rtype: :class:`Droplet <doclient.droplet.Droplet>`, NoneType
         """
+        return self.droplet_index.get(self._droplet_id(droplet_id))
 
-        if not isinstance(droplet_id, int):
-            droplet_id = droplet_id or ""
-            try:
-                droplet_id = literal_eval(str(droplet_id))
-            except (TypeError, ValueError):
-                droplet_id = None
-
-        if not isinstance(droplet_id, int):
-            raise InvalidArgumentError(
-                "Method requires a valid integer droplet id")
-
-        droplet = [x for x in self.droplets if x.id == droplet_id]
-        return droplet[0] if droplet else None
-
-    def filter_droplets(self, matcher=None):
+    def filter_droplets(self, matcher=None, prefix=False):
         r"""
         Basic droplet filter helper.
         Filters out droplets which pass a substring match on the name
-        for the provided matcher.
+        for the provided matcher. Matchers holding regular expression
+        syntax (other than ".") are matched as patterns.
         Matcher defaults to empty string and returns all instances
 
         :param matcher: Token to match droplet names against.
         :type  matcher: str
+        :param prefix: Match the token as a name prefix.
+        :type  prefix: bool
         :rtype: list<Droplet>
         """
         if matcher is None:
@@ -496,18 +1893,7 @@ class DOClient(BaseObject):
             raise InvalidArgumentError(
                 "Method requires a string filter token or droplet ID")
 
-        if isinstance(matcher, int):
-            return [x for x in self.droplets if x.id == matcher]
-
-        # See if a Droplet ID is passed in (an integer) and filter
-        # based on ID.
-        try:
-            _id = literal_eval(matcher)
-            return [x for x in self.droplets if x.id == _id]
-        except (TypeError, ValueError):
-            matcher = re_compile(".*?{0}.*?".format(matcher))
-            return [x for x in self.droplets
-                    if re_match(matcher, x.name) is not None]
+        return self.droplet_index.match(matcher, prefix=prefix)
 
     def get_droplet_snapshots(self, droplet_id):
         r"""
@@ -532,11 +1918,45 @@ class DOClient(BaseObject):
         :type  droplet_id: int
         :rtype: list ( :class:`Kernel <doclient.droplet.Kernel>`)
         """
-        url = self.droplet_kernels_url % droplet_id
-        response = self.api_request(url=url)
-        kernels = response.get("kernels")
+        kernels = self.get_catalog(
+            "kernels:{0}".format(droplet_id),
+            self.droplet_kernels_url % droplet_id, "kernels")
         return [Kernel(**kernel) for kernel in kernels]
 
+    def iter_kernels(self, droplet_id, concurrency=None):
+        r"""
+        Iterate over kernels available for the requested droplet
+        across all result pages.
+
+        :param droplet_id: ID of droplet to get available kernels for.
+        :type  droplet_id: int
+        :param concurrency: Maximum number of pages fetched in
+                            parallel.
+        :type  concurrency: int
+        :rtype: generator (:class:`Kernel <doclient.meta.Kernel>`)
+        """
+        url = self.droplet_kernels_url % droplet_id
+        for kernel in self.iter_pages(url, "kernels",
+                                      concurrency=concurrency):
+            yield Kernel(**kernel)
+
+    def iter_snapshots(self, droplet_id, concurrency=None):
+        r"""
+        Iterate over snapshots created for the requested droplet
+        across all result pages.
+
+        :param droplet_id: ID of droplet to get snapshots for.
+        :type  droplet_id: int
+        :param concurrency: Maximum number of pages fetched in
+                            parallel.
+        :type  concurrency: int
+        :rtype: generator (:class:`Snapshot <doclient.meta.Snapshot>`)
+        """
+        url = self.droplet_snapshot_url % droplet_id
+        for snapshot in self.iter_pages(url, "snapshots",
+                                        concurrency=concurrency):
+            yield Snapshot(**snapshot)
+
     def delete_droplet(self, droplet_id):
         r"""
         DigitalOcean APIv2 droplet delete method. Deletes a requested droplet.
@@ -550,11 +1970,15 @@ class DOClient(BaseObject):
             raise InvalidArgumentError("Unknown droplet")
         url = "{0}{1}".format(self.droplet_base_url, droplet_id)
         try:
-            self.api_request(url=url,
-                             method="delete",
-                             return_json=False)
-            message = "Successfully initiated droplet delete for " \
-                      "droplet {0}".format(droplet)
+            response = self.api_request(url=url,
+                                        method="delete",
+                                        return_json=False)
+            if response.status_code == 204:
+                self.forget_droplets([droplet.id])
+                message = "Successfully initiated droplet delete " \
+                          "for droplet {0}".format(droplet)
+            else:
+                message = response.json().get("message")
         except APIAuthError as auth_error:
             message = auth_error.message
         except APIError:
@@ -566,7 +1990,8 @@ class DOClient(BaseObject):
 
     def create_droplet(self, name, region, size, image,
                        ssh_keys=None, backups=False, ipv6=False,
-                       user_data=None, private_networking=False):
+                       user_data=None, private_networking=False,
+                       validate=False):
         r"""
         DigitalOcean APIv2 droplet create method.
         Creates a droplet with requested payload features.
@@ -579,7 +2004,9 @@ class DOClient(BaseObject):
         :type  size: str
         :param image: Name or slug identifier of base image to use.
         :type  image: int, str
-        :param ssh_keys: SSH keys to add to created droplet
+        :param ssh_keys: SSH keys to add to created droplet, by ID,
+                         fingerprint or name. Names are resolved
+                         through the SSH key registry.
         :type  ssh_keys: list<str>, list<int>
         :param backups: Droplet backups enable state parameter
         :type  backups: bool
@@ -589,63 +2016,42 @@ class DOClient(BaseObject):
         :type  user_data: str
         :param private_networking: Droplet private networking enable parameter
         :type  private_networking: bool
+        :param validate: Check region, size and image against the
+                         cached catalogs before placing the request.
+        :type  validate: bool
 
         :rtype: :class:`Droplet <doclient.droplet.Droplet>`
         """
-        try:
-            assert isinstance(name, str), \
-                "Invalid droplet name. Requires a string name"
-            assert isinstance(region, str), \
-                "Invalid droplet region. Requires a string region id"
-            assert isinstance(size, str), \
-                "Invalid droplet size. Requires a string size"
-            assert isinstance(image, (int, str)), \
-                "Invalid base image id. Requires a numeric ID or slug"
-            backups = backups if isinstance(backups, bool) else False
-            private_networking = private_networking if \
-                isinstance(private_networking, bool) else False
-            ipv6 = ipv6 if isinstance(ipv6, bool) else False
-            user_data = user_data if \
-                isinstance(user_data, str) else None
-            ssh_keys = ssh_keys if isinstance(ssh_keys, list) and \
-                all((isinstance(x, (int, str))
-                     for x in ssh_keys)) else False
-            payload = json_dumps({
-                "name": name,
-                "region": region,
-                "size": size,
-                "image": image,
-                "ssh_keys": ssh_keys,
-                "backups": backups,
-                "private_networking": private_networking,
-                "ipv6": ipv6,
-                "user_data": user_data,
-            })
-
-            params = {
-                "url": self.droplet_base_url,
-                "method": "POST",
-                "data": payload,
-                "return_json": False
-            }
-
-            response = self.api_request(**params)
-
-            if response.status_code != 202:
-                raise APIError(
-                    "Unable to create a droplet with requested data")
-
-            droplet = response.json().get("droplet")
-            droplet["client"] = self
-            self.get_droplets()
-            return Droplet(**droplet)
+        if self._key_references(ssh_keys):
+            ssh_keys = self.resolve_ssh_keys(ssh_keys)
+        payload = self._create_payload(
+            name, region, size, image, ssh_keys=ssh_keys,
+            backups=backups, ipv6=ipv6, user_data=user_data,
+            private_networking=private_networking)
+        if validate:
+            self._validate_spec(region, size, image)
+
+        params = {
+            "url": self.droplet_base_url,
+            "method": "POST",
+            "data": payload,
+            "return_json": False
+        }
 
-        except AssertionError as err:
-            raise InvalidArgumentError(err)
+        response = self.api_request(**params)
+
+        if response.status_code != 202:
+            raise APIError(
+                "Unable to create a droplet with requested data")
+
+        droplet = self._make_droplet(response.json().get("droplet"))
+        self.merge_droplets([droplet])
+        return droplet
 
     def create_droplets(self, names, region, size, image,
                         ssh_keys=None, backups=False, ipv6=False,
-                        user_data=None, private_networking=False):
+                        user_data=None, private_networking=False,
+                        validate=False):
         r"""
         DigitalOcean APIv2 droplet create method.
         Creates a list of droplets all with the same requested
@@ -659,7 +2065,9 @@ class DOClient(BaseObject):
         :type  size: str
         :param image: Name or slug identifier of base image to use.
         :type  image: int, str
-        :param ssh_keys: SSH keys to add to created droplets
+        :param ssh_keys: SSH keys to add to created droplets, by ID,
+                         fingerprint or name. Names are resolved
+                         through the SSH key registry.
         :type  ssh_keys: list<str>, list<int>
         :param backups: Droplet backups enable state parameter
         :type  backups: bool
@@ -669,68 +2077,41 @@ class DOClient(BaseObject):
         :type  user_data: str
         :param private_networking: Droplet private networking enable parameter
         :type  private_networking: bool
+        :param validate: Check region, size and image against the
+                         cached catalogs before placing the request.
+        :type  validate: bool
         :raises: :class:`InvalidArgumentError <doclient.errors.InvalidArgumentError>`
-        :rtype: :class:`Droplet <doclient.droplet.Droplet>`
+        :rtype: list (:class:`Droplet <doclient.droplet.Droplet>`)
         """
-        try:
-            assert isinstance(names, list), \
-                "Invalid droplet name. Requires a list of strings"
-            assert all((isinstance(x, str) for x in names)), \
-                "".join([
-                    "One or more invalid droplet names.",
-                    "Requires a string name"
-                ])
-            assert isinstance(region, str), \
-                "Invalid droplet region. Requires a string region id"
-            assert isinstance(size, str), \
-                "Invalid droplet size. Requires a string size"
-            assert isinstance(image, (int, str)), \
-                "Invalid base image id. Requires a numeric ID or slug"
-            backups = backups if isinstance(backups, bool) else False
-            private_networking = private_networking if \
-                isinstance(private_networking, bool) else False
-            ipv6 = ipv6 if isinstance(ipv6, bool) else False
-            user_data = user_data if \
-                isinstance(user_data, str) else None
-            ssh_keys = ssh_keys if isinstance(ssh_keys, list) and \
-                all((isinstance(x, (int, str))
-                     for x in ssh_keys)) else False
-            payload = json_dumps({
-                "names": names,
-                "region": region,
-                "size": size,
-                "image": image,
-                "ssh_keys": ssh_keys,
-                "backups": backups,
-                "private_networking": private_networking,
-                "ipv6": ipv6,
-                "user_data": user_data,
-            })
-
-            params = {
-                "url": self.droplet_base_url,
-                "method": "POST",
-                "data": payload,
-                "return_json": False
-            }
-
-            response = self.api_request(**params)
-
-            if response.status_code != 202:
-                raise APIError(
-                    "Unable to create a droplet with requested data")
-
-            droplets = response.json().get("droplets", [])
-            _droplets = []
-            for droplet in droplets:
-                droplet["client"] = self
-                _droplets.append(Droplet(**droplet))
+        if not isinstance(names, list):
+            raise InvalidArgumentError(
+                "Invalid droplet name. Requires a list of strings")
+        if self._key_references(ssh_keys):
+            ssh_keys = self.resolve_ssh_keys(ssh_keys)
+        payload = self._create_payload(
+            names, region, size, image, ssh_keys=ssh_keys,
+            backups=backups, ipv6=ipv6, user_data=user_data,
+            private_networking=private_networking)
+        if validate:
+            self._validate_spec(region, size, image)
+
+        params = {
+            "url": self.droplet_base_url,
+            "method": "POST",
+            "data": payload,
+            "return_json": False
+        }
 
-            self.get_droplets()
-            return _droplets
+        response = self.api_request(**params)
 
-        except AssertionError as err:
-            raise InvalidArgumentError(err)
+        if response.status_code != 202:
+            raise APIError(
+                "Unable to create a droplet with requested data")
+
+        droplets = [self._make_droplet(droplet) for droplet
+                     in response.json().get("droplets", [])]
+        self.merge_droplets(droplets)
+        return droplets
 
     def get_regions(self):
         r"""
@@ -738,20 +2119,22 @@ class DOClient(BaseObject):
 
         :TODO: Add way to filter regions with pattern/features.
         """
-        response = self.api_request(url=self.regions_url)
-        regions = response.get("regions", [])
-        region_objects = []
-        for region in regions:
-            _region = Region(**{
-                "name": region.get("name"),
-                "slug": region.get("slug"),
-                "features": region.get("features", []),
-                "sizes": region.get("sizes", []),
-                "available": region.get("available", False)
-            })
-            region_objects.append(_region)
-
-        return region_objects
+        return [self._make_region(region) for region in
+                self.get_catalog("regions", self.regions_url,
+                                 "regions")]
+
+    def iter_regions(self, concurrency=None):
+        r"""
+        Iterate over available regions across all result pages.
+
+        :param concurrency: Maximum number of pages fetched in
+                            parallel.
+        :type  concurrency: int
+        :rtype: generator (:class:`Region <doclient.meta.Region>`)
+        """
+        for region in self.iter_pages(self.regions_url, "regions",
+                                      concurrency=concurrency):
+            yield self._make_region(region)
 
 
 if __name__ == "__main__":
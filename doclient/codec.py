@@ -0,0 +1,239 @@
+#! coding=utf-8
+"""
+DigitalOcean APIv2 JSON codec module.
+Provides the pluggable JSON backend used for request and response
+bodies, and an incremental decoder for large listing responses.
+"""
+__author__ = "Sriram Velamur <sriram.velamur@gmail.com>"
+__all__ = ("ArrayStreamDecoder", "backend", "dumps", "loads",
+           "set_backend")
+
+import sys
+sys.dont_write_bytecode = True
+import json
+from codecs import getincrementaldecoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+backend = None
+_loads = _dumps = None
+
+
+def set_backend(codec=None):
+    r"""
+    Select the JSON backend.
+
+    :param codec: "orjson", "json", or a module-like object with
+                  loads and dumps functions (e.g. ujson). Defaults
+                  to orjson when installed, the stdlib otherwise.
+    :type  codec: str, module
+    :raises: ImportError if orjson is requested but not installed.
+    """
+    global backend, _loads, _dumps
+    if codec is None:
+        codec = "orjson" if orjson is not None else "json"
+    if codec == "orjson":
+        if orjson is None:
+            raise ImportError("The orjson JSON backend is not installed")
+        backend, _loads = "orjson", orjson.loads
+        _dumps = lambda data: orjson.dumps(data).decode("utf-8")
+    elif codec == "json":
+        backend, _loads, _dumps = "json", json.loads, json.dumps
+    else:
+        backend = getattr(codec, "__name__", repr(codec))
+        _loads, _dumps = codec.loads, codec.dumps
+
+
+def loads(data):
+    r"""
+    Decode a JSON document with the selected backend.
+
+    :param data: JSON document.
+    :type  data: bytes, str
+    :rtype: dict, list
+    """
+    return _loads(data)
+
+
+def dumps(data):
+    r"""
+    Encode JSON with the selected backend.
+
+    :param data: JSON serialisable data.
+    :type  data: dict, list
+    :rtype: str
+    """
+    return _dumps(data)
+
+
+set_backend()
+
+
+class ArrayStreamDecoder(object):
+
+    r"""
+    Incremental decoder for APIv2 listing bodies.
+
+    Fed the body of a response (a JSON object) chunk by chunk, it
+    returns the items of one of its arrays as soon as each item has
+    fully arrived, so only the undecoded tail of the body is held in
+    memory. The object's other keys (links, meta, ...) are collected
+    in rest once the body is complete.
+
+    Usage::
+
+        decoder = ArrayStreamDecoder("droplets")
+        for chunk in response.iter_content(65536):
+            for droplet in decoder.feed(chunk):
+                ...
+        decoder.close()
+        next_url = decoder.rest["links"]["pages"].get("next")
+    """
+
+    _whitespace = " \t\n\r"
+
+    def __init__(self, key):
+        r"""
+        Incremental decoder init
+
+        :param key: Key of the array to stream.
+        :type  key: str
+        """
+        self.key = key
+        self.rest = {}
+        self._text = getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._position = 0
+        self._state = "start"
+        self._current = None
+        self._closed = False
+
+    def feed(self, chunk):
+        r"""
+        Add a chunk of the body.
+
+        :param chunk: Next chunk of the response body.
+        :type  chunk: bytes
+        :return: Array items completed by the chunk.
+        :rtype: list
+        """
+        self._buffer = self._buffer[self._position:] + \
+            self._text.decode(chunk)
+        self._position = 0
+        return self._parse()
+
+    def close(self):
+        r"""
+        Finish decoding once the body is complete.
+
+        :return: Array items still pending.
+        :rtype: list
+        :raises: ValueError if the body is incomplete or invalid.
+        """
+        self._buffer = self._buffer[self._position:] + \
+            self._text.decode(b"", final=True)
+        self._position = 0
+        self._closed = True
+        items = self._parse()
+        if self._state != "done" or \
+                self._buffer[self._position:].strip(self._whitespace):
+            raise ValueError("Incomplete or invalid JSON listing body")
+        return items
+
+    def _skip(self):
+        r"""Next non-whitespace character, or None at buffer end"""
+        buffer, position = self._buffer, self._position
+        while position < len(buffer) and \
+                buffer[position] in self._whitespace:
+            position += 1
+        self._position = position
+        return buffer[position] if position < len(buffer) else None
+
+    def _value(self):
+        r"""Decode the next complete value, or None if incomplete"""
+        try:
+            value, end = self._decoder.raw_decode(
+                self._buffer, self._position)
+        except ValueError:
+            if self._closed:
+                raise
+            return None
+        # A scalar ending at the buffer end may continue in the next
+        # chunk (e.g. a number split across chunks).
+        if end == len(self._buffer) and not self._closed:
+            return None
+        self._position = end
+        return (value,)
+
+    def _expect(self, char):
+        r"""Consume an expected structural character"""
+        if char is None:
+            return False
+        if self._buffer[self._position] != char:
+            raise ValueError("Unexpected {0!r} in JSON listing body "
+                             "at {1}".format(
+                                 self._buffer[self._position],
+                                 self._position))
+        self._position += 1
+        return True
+
+    def _parse(self):
+        r"""Advance the state machine over the buffered text"""
+        items = []
+        while True:
+            char = self._skip()
+            if char is None:
+                return items
+            state = self._state
+            if state == "start":
+                self._expect("{")
+                self._state = "key"
+            elif state in ("key", "next_key"):
+                if char == "}":
+                    self._position += 1
+                    self._state = "done"
+                    continue
+                if state == "next_key":
+                    self._expect(",")
+                    self._state = "key"
+                    continue
+                value = self._value()
+                if value is None:
+                    return items
+                self._current = value[0]
+                self._state = "colon"
+            elif state == "colon":
+                self._expect(":")
+                self._state = "value"
+            elif state == "value":
+                if self._current == self.key and char == "[":
+                    self._position += 1
+                    self._state = "item"
+                    continue
+                value = self._value()
+                if value is None:
+                    return items
+                self.rest[self._current] = value[0]
+                self._state = "next_key"
+            elif state in ("item", "next_item"):
+                if char == "]":
+                    self._position += 1
+                    self._state = "next_key"
+                    continue
+                if state == "next_item":
+                    self._expect(",")
+                    self._state = "item"
+                    continue
+                value = self._value()
+                if value is None:
+                    return items
+                items.append(value[0])
+                self._state = "next_item"
+            else:
+                raise ValueError("Unexpected data after JSON listing "
+                                 "body at {0}".format(self._position))
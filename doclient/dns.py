@@ -0,0 +1,427 @@
+#! coding=utf-8
+"""
+DigitalOcean APIv2 DNS records module.
+Provides the domain record model, a zone file parser, a local
+record index and the record diff used to sync a zone.
+"""
+__author__ = "Sriram Velamur <sriram.velamur@gmail.com>"
+__all__ = ("DomainRecord", "RecordIndex", "diff_records",
+           "parse_zone_file")
+
+import sys
+sys.dont_write_bytecode = True
+
+from .base import Model
+from .errors import InvalidArgumentError
+
+
+class DomainRecord(Model):
+
+    r"""
+    DigitalOcean domain record object.
+
+    Names are relative to the domain, with "@" for the domain
+    itself. Records parsed from a zone file or built locally have
+    no ID.
+
+    :property key: (type, name, data) identity of the record.
+    """
+
+    fields = ("id", "type", "name", "data", "priority", "port", "ttl",
+              "weight", "flags", "tag")
+
+    # Attributes compared when checking a record against its desired
+    # state. Unset desired attributes are not compared.
+    attributes = ("ttl", "priority", "port", "weight", "flags", "tag")
+
+    def __repr__(self):
+        return "DomainRecord {0} {1} {2}".format(
+            self.type, self.name, self.data)
+
+    def __str__(self):
+        return "DomainRecord {0} {1} {2}".format(
+            self.type, self.name, self.data)
+
+    @classmethod
+    def coerce(cls, record):
+        r"""
+        Domain record for a record or an APIv2 record payload.
+
+        :param record: Record or record payload.
+        :type  record: :class:`DomainRecord <.DomainRecord>`, dict
+        :raises: :class:`InvalidArgumentError <doclient.errors.InvalidArgumentError>`
+        :rtype: :class:`DomainRecord <.DomainRecord>`
+        """
+        if isinstance(record, cls):
+            return record
+        if isinstance(record, dict):
+            return cls(**dict(
+                record, type=(record.get("type") or "").upper() or None))
+        raise InvalidArgumentError(
+            "Domain records need to be DomainRecord objects or dicts")
+
+    @property
+    def key(self):
+        """Record identity property"""
+        return self.type, self.name, self.data
+
+    def differs(self, desired):
+        r"""
+        Whether the record's attributes differ from the set
+        attributes of a desired record.
+
+        :param desired: Desired state of the record.
+        :type  desired: :class:`DomainRecord <.DomainRecord>`
+        :rtype: bool
+        """
+        for attribute in self.attributes:
+            value = getattr(desired, attribute)
+            if value is not None and value != getattr(self, attribute):
+                return True
+        return False
+
+    def as_payload(self):
+        r"""
+        APIv2 create and update payload for the record.
+
+        :rtype: dict
+        """
+        return dict((field, value) for field, value in (
+            ("type", self.type), ("name", self.name), ("data", self.data),
+            ("priority", self.priority), ("port", self.port),
+            ("ttl", self.ttl), ("weight", self.weight),
+            ("flags", self.flags), ("tag", self.tag))
+            if value is not None)
+
+
+class RecordIndex(object):
+
+    r"""
+    In-memory index over a domain's records, by ID and by name.
+    Records iterate in their zone order.
+    """
+
+    def __init__(self, records=()):
+        r"""
+        Record index init
+
+        :param records: Records to index.
+        :type  records: iterable (:class:`DomainRecord <.DomainRecord>`)
+        """
+        self._records = list(records)
+        self._by_id = {}
+        self._by_name = {}
+        for record in self._records:
+            if record.id is not None:
+                self._by_id[record.id] = record
+            self._by_name.setdefault(record.name, []).append(record)
+
+    def __len__(self):
+        return len(self._records)
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def __repr__(self):
+        return "RecordIndex [{0} records]".format(len(self))
+
+    def add(self, record):
+        r"""
+        Index a record, replacing the indexed record with its ID in
+        place.
+
+        :param record: Record to index.
+        :type  record: :class:`DomainRecord <.DomainRecord>`
+        """
+        previous = self._by_id.get(record.id) \
+            if record.id is not None else None
+        if previous is None:
+            self._records.append(record)
+        else:
+            self._unname(previous)
+            self._records[next(
+                idx for idx, indexed in enumerate(self._records)
+                if indexed is previous)] = record
+        if record.id is not None:
+            self._by_id[record.id] = record
+        self._by_name.setdefault(record.name, []).append(record)
+
+    def remove(self, record_id):
+        r"""
+        Drop a record from the index.
+
+        :param record_id: Record ID.
+        :type  record_id: int
+        """
+        record = self._by_id.pop(record_id, None)
+        if record is None:
+            return
+        self._unname(record)
+        self._records = [indexed for indexed in self._records
+                         if indexed is not record]
+
+    def _unname(self, record):
+        r"""Drop a record from the by name index"""
+        named = [indexed for indexed in self._by_name.get(record.name, ())
+                 if indexed is not record]
+        if named:
+            self._by_name[record.name] = named
+        else:
+            self._by_name.pop(record.name, None)
+
+    def get(self, record_id):
+        r"""
+        Record lookup by ID.
+
+        :param record_id: Record ID.
+        :type  record_id: int
+        :rtype: :class:`DomainRecord <.DomainRecord>`, NoneType
+        """
+        return self._by_id.get(record_id)
+
+    def find(self, name=None, type=None):
+        r"""
+        Records with a name and/or type.
+
+        :param name: Record name, "@" for the domain itself.
+        :type  name: str
+        :param type: Record type, e.g. "A" or "MX".
+        :type  type: str
+        :rtype: list (:class:`DomainRecord <.DomainRecord>`)
+        """
+        records = self._records if name is None else \
+            self._by_name.get(name, [])
+        if type is not None:
+            type = type.upper()
+            records = [record for record in records
+                       if record.type == type]
+        return list(records)
+
+
+def diff_records(existing, desired, types=None):
+    r"""
+    Minimal set of writes turning existing records into desired.
+
+    Records are matched on (type, name, data) first; matches whose
+    set attributes differ become updates. Unmatched desired records
+    then take over unmatched existing records of the same type and
+    name as updates, and only the rest are created or deleted. SOA
+    records are never touched.
+
+    :param existing: Current records, with IDs.
+    :type  existing: iterable (:class:`DomainRecord <.DomainRecord>`)
+    :param desired: Desired records.
+    :type  desired: iterable (:class:`DomainRecord <.DomainRecord>`)
+    :param types: Record types to manage; existing and desired
+                  records of other types are left alone. Defaults
+                  to every type, with NS records (created by
+                  DigitalOcean along with the domain) managed only
+                  when desired holds some.
+    :type  types: iterable (str)
+    :return: Records to create, (existing, desired) pairs to update
+             and records to delete.
+    :rtype: tuple (list, list, list)
+    """
+    desired = list(desired)
+    ignored = set(["SOA"])
+    if types is not None:
+        types = set(type.upper() for type in types)
+    elif not any(record.type == "NS" for record in desired):
+        ignored.add("NS")
+
+    def managed(record):
+        """Whether the diff manages a record's type"""
+        return record.type not in ignored and \
+            (types is None or record.type in types)
+
+    desired = [record for record in desired if managed(record)]
+    by_key = {}
+    for record in existing:
+        if managed(record):
+            by_key.setdefault(record.key, []).append(record)
+
+    updates, unmatched = [], []
+    for record in desired:
+        candidates = by_key.get(record.key)
+        if candidates:
+            current = candidates.pop(0)
+            if current.differs(record):
+                updates.append((current, record))
+        else:
+            unmatched.append(record)
+
+    leftovers = {}
+    for candidates in by_key.values():
+        for record in candidates:
+            leftovers.setdefault((record.type, record.name),
+                                 []).append(record)
+    creates = []
+    for record in unmatched:
+        candidates = leftovers.get((record.type, record.name))
+        if candidates:
+            updates.append((candidates.pop(0), record))
+        else:
+            creates.append(record)
+    deletes = [record for candidates in leftovers.values()
+               for record in candidates]
+    return creates, updates, deletes
+
+
+# Minimum data fields of record types; other types need one.
+_data_fields = {"MX": 2, "SRV": 4, "CAA": 3}
+
+
+def parse_zone_file(zone_file, origin):
+    r"""
+    Parse a BIND zone file into domain records.
+
+    Handles $ORIGIN and $TTL directives, comments, quoted strings,
+    parenthesised multi-line records and owner names carried over
+    from the previous record. Owner names are made relative to the
+    domain ("@" for the domain itself); target names of CNAME, MX,
+    NS and SRV records are made fully qualified, without the
+    trailing dot, except for the domain itself which reads "@".
+
+    :param zone_file: Zone file text.
+    :type  zone_file: str
+    :param origin: Domain name of the zone.
+    :type  origin: str
+    :raises: :class:`InvalidArgumentError <doclient.errors.InvalidArgumentError>`
+    :rtype: list (:class:`DomainRecord <.DomainRecord>`)
+    """
+    zone = origin.rstrip(".").lower()
+    current_origin, default_ttl, owner = zone, None, "@"
+    records = []
+    for line, inherited, tokens in _entries(zone_file or ""):
+        directive = tokens[0].upper()
+        if directive in ("$ORIGIN", "$TTL") and len(tokens) < 2:
+            raise InvalidArgumentError(
+                "Invalid zone file directive on line {0}".format(line))
+        if directive == "$ORIGIN":
+            current_origin = _absolute(tokens[1], current_origin)
+            continue
+        if directive == "$TTL":
+            default_ttl = _number(tokens[1], line)
+            continue
+        if directive.startswith("$"):
+            continue
+
+        if not inherited:
+            owner = _relative(_absolute(tokens.pop(0), current_origin),
+                              zone)
+        ttl = default_ttl
+        while tokens and (tokens[0].isdigit() or
+                          tokens[0].upper() in ("IN", "CH", "HS")):
+            token = tokens.pop(0)
+            if token.isdigit():
+                ttl = int(token)
+        record_type = tokens[0].upper() if tokens else None
+        data = tokens[1:]
+        if len(data) < _data_fields.get(record_type, 1):
+            raise InvalidArgumentError(
+                "Invalid zone file record on line {0}".format(line))
+        record = {"type": record_type, "name": owner, "ttl": ttl}
+
+        def target(name):
+            """Target host name relative to the zone"""
+            return _relative(_absolute(name, current_origin), zone,
+                             qualified=True)
+
+        if record_type in ("CNAME", "NS", "PTR"):
+            record["data"] = target(data[0])
+        elif record_type == "MX":
+            record["priority"] = _number(data[0], line)
+            record["data"] = target(data[1])
+        elif record_type == "SRV":
+            record["priority"] = _number(data[0], line)
+            record["weight"] = _number(data[1], line)
+            record["port"] = _number(data[2], line)
+            record["data"] = target(data[3])
+        elif record_type == "CAA":
+            record["flags"] = _number(data[0], line)
+            record["tag"] = data[1]
+            record["data"] = _unquote(data[2])
+        elif record_type in ("TXT", "SPF"):
+            record["data"] = "".join(_unquote(token) for token in data)
+        else:
+            record["data"] = " ".join(_unquote(token) for token in data)
+        records.append(DomainRecord(**record))
+    return records
+
+
+def _entries(zone_file):
+    r"""
+    Logical zone file entries, as (first line number, owner
+    inherited, tokens) tuples. Comments are dropped and
+    parenthesised lines joined; quoted strings are kept as single
+    tokens with their quotes.
+    """
+    tokens, inherited, depth, start = [], False, 0, 1
+    for number, line in enumerate(zone_file.splitlines(), 1):
+        if not depth:
+            if tokens:
+                yield start, inherited, tokens
+            tokens, inherited = [], line[:1] in (" ", "\t")
+            start = number
+        position, length = 0, len(line)
+        while position < length:
+            char = line[position]
+            if char == ";":
+                break
+            if char in " \t":
+                position += 1
+            elif char == "(":
+                depth += 1
+                position += 1
+            elif char == ")":
+                depth -= 1
+                position += 1
+            elif char == '"':
+                end = position + 1
+                while end < length and line[end] != '"':
+                    end += 2 if line[end] == "\\" else 1
+                tokens.append(line[position:end + 1])
+                position = end + 1
+            else:
+                end = position
+                while end < length and line[end] not in ' \t;()"':
+                    end += 1
+                tokens.append(line[position:end])
+                position = end
+    if tokens:
+        yield start, inherited, tokens
+
+
+def _absolute(name, origin):
+    r"""Fully qualified form of a zone file name, without the dot"""
+    if name == "@":
+        return origin
+    if name.endswith("."):
+        return name[:-1].lower()
+    return "{0}.{1}".format(name, origin).lower()
+
+
+def _relative(name, zone, qualified=False):
+    r"""Record name (or, qualified, target) for a domain"""
+    if name == zone:
+        return "@"
+    if not qualified and name.endswith("." + zone):
+        return name[:-len(zone) - 1]
+    return name
+
+
+def _unquote(token):
+    r"""Text of a possibly quoted zone file string"""
+    if len(token) > 1 and token[0] == token[-1] == '"':
+        token = token[1:-1].replace('\\"', '"').replace("\\\\", "\\")
+    return token
+
+
+def _number(token, line):
+    r"""Integer field of a zone file record"""
+    try:
+        return int(token)
+    except ValueError:
+        raise InvalidArgumentError(
+            "Invalid number {0} in zone file line {1}".format(
+                token, line))
@@ -10,40 +10,176 @@ __all__ = ("Droplet", "Image", "DropletSize")
 
 import sys
 sys.dont_write_bytecode = True
-from time import sleep
+from logging import getLogger
 
-from .base import BaseObject
-from .meta import Snapshot
+from .base import Model
+from .meta import DropletNetwork, Region
+from .actions import Action
 from .errors import InvalidArgumentError, APIError
 
 
-class Droplet(BaseObject):
-    r"""DigitalOcean droplet object"""
+logger = getLogger(__name__)
 
-    client, name, ipv4_ip, ipv6_ip = (None,) * 4
-    networks = []
 
-    droplet_base_url = 'https://api.digitalocean.com/v2/droplets/'
-    droplet_snapshot_url = '{}/snapshots?page=1&per_page=100'.format(
-        droplet_base_url
-    )
-    droplet_neighbours_url = '{}/neighbors'.format(droplet_base_url)
+class Droplet(Model):
+    r"""
+    DigitalOcean droplet object.
+
+    Wraps the droplet's APIv2 payload as is: every server field
+    (status, tags, memory, created_at, ...) reads as an attribute
+    straight from the payload, and the networks, size, region and
+    image models are only decoded on first access, then memoised.
+    The payload is shared, not copied, and must not be modified.
+
+    :property networks: Droplet's v4 and v6 networks.
+    :property ipv4_ip: Public IPv4 address.
+    :property ipv6_ip: Public IPv6 address.
+    :property size: :class:`DropletSize <.DropletSize>`
+    :property region: :class:`Region <doclient.meta.Region>`
+    :property image: :class:`Image <.Image>`
+    """
+
+    fields = ("client",)
+    private_props = ()
+    __slots__ = ("_networks", "_size", "_region", "_image")
+
+    droplet_base_url = "droplets/"
+    droplet_neighbours_url = droplet_base_url + "%s/neighbors"
     droplet_actions_url = "{0}{1}/actions"
 
+    def __init__(self, client=None, **payload):
+        """Droplet init"""
+        self._wrap(payload, client)
+
+    @classmethod
+    def from_payload(cls, payload, client=None):
+        r"""
+        Wrap an APIv2 droplet payload without copying it.
+
+        :param payload: Droplet payload.
+        :type  payload: dict
+        :param client: Client the droplet is managed through.
+        :type  client: :class:`DOClient <doclient.client.DOClient>`
+        :rtype: :class:`Droplet <.Droplet>`
+        """
+        droplet = cls.__new__(cls)
+        droplet._wrap(payload, client)
+        return droplet
+
+    def _wrap(self, payload, client):
+        r"""Set the wrapped payload and clear memoised models"""
+        self.client = client
+        self._extra = payload
+        self._networks = self._size = None
+        self._region = self._image = None
+
+    @property
+    def id(self):
+        """Droplet ID property"""
+        return self._extra.get("id")
+
+    @property
+    def name(self):
+        """Droplet name property"""
+        return self._extra.get("name")
+
+    @property
+    def networks(self):
+        r"""
+        Droplet networks, decoded on first access.
+
+        :rtype: list (:class:`DropletNetwork <doclient.meta.DropletNetwork>`)
+        """
+        networks = self._networks
+        if networks is None:
+            payload = self._extra.get("networks") or {}
+            networks = self._networks = [
+                DropletNetwork(
+                    network_type=network_type,
+                    ip_address=network.get("ip_address"),
+                    netmask=network.get("netmask"),
+                    gateway=network.get("gateway"),
+                    is_public=network.get("type") == "public")
+                for network_type, version in (("ipv4", "v4"),
+                                              ("ipv6", "v6"))
+                for network in payload.get(version) or ()]
+        return networks
+
+    def _public_ip(self, network_type):
+        r"""Public address of a network type"""
+        address = None
+        for network in self.networks:
+            if network.is_public and network.network_type == network_type:
+                address = network.ip_address
+        return address
+
+    @property
+    def ipv4_ip(self):
+        """Droplet public IPv4 address property"""
+        return self._public_ip("ipv4")
+
+    @property
+    def ipv6_ip(self):
+        """Droplet public IPv6 address property"""
+        return self._public_ip("ipv6")
+
+    @property
+    def size(self):
+        r"""
+        Droplet size, decoded on first access.
+
+        :rtype: :class:`DropletSize <.DropletSize>`
+        """
+        size = self._size
+        if size is None:
+            payload = self._extra.get("size") or {}
+            if not payload and self._extra.get("size_slug"):
+                payload = {"slug": self._extra.get("size_slug")}
+            size = self._size = DropletSize(**payload) \
+                if payload else None
+        return size
+
+    @property
+    def region(self):
+        r"""
+        Droplet region, decoded on first access.
+
+        :rtype: :class:`Region <doclient.meta.Region>`
+        """
+        region = self._region
+        if region is None:
+            payload = self._extra.get("region")
+            region = self._region = Region(**payload) \
+                if payload else None
+        return region
+
+    @property
+    def image(self):
+        r"""
+        Droplet image, decoded on first access.
+
+        :rtype: :class:`Image <.Image>`
+        """
+        image = self._image
+        if image is None:
+            payload = self._extra.get("image")
+            image = self._image = Image(**payload) if payload else None
+        return image
+
     def power_off(self):
         """Droplet power off helper method"""
-        print("Powering off droplet {0}".format(self.name))
-        self.client.poweroff_droplet(self.id)
+        logger.info("Powering off droplet %s", self.name)
+        return self.client.poweroff_droplet(self.id)
 
     def power_on(self):
         """Droplet power on helper method"""
-        print("Powering on droplet {0}".format(self.name))
-        self.client.poweron_droplet(self.id)
+        logger.info("Powering on droplet %s", self.name)
+        return self.client.poweron_droplet(self.id)
 
     def power_cycle(self):
         """Droplet power cycle helper method"""
-        print("Power cycling droplet {0}".format(self.name))
-        self.client.powercycle_droplet(self.id)
+        logger.info("Power cycling droplet %s", self.name)
+        return self.client.powercycle_droplet(self.id)
 
     def __repr__(self):
         return "Droplet {0} [ID: {1}]".format(self.name, self.id)
@@ -51,10 +187,6 @@ class Droplet(BaseObject):
     def __str__(self):
         return "Droplet {0} [ID: {1}]".format(self.name, self.id)
 
-    def as_dict(self):
-        """Returns a dictionary representation of a Droplet"""
-        return {"name": self.name, "id": self.id}
-
     def get_kernels(self):
         r"""
         DigitalOcean droplet kernels list helper.
@@ -72,10 +204,11 @@ class Droplet(BaseObject):
 
         :rtype: list (:class:`Droplet <.Droplet>`)
         """
-        url = self.droplet_neighbours_url.format(self.id)
+        url = self.droplet_neighbours_url % self.id
         response = self.client.api_request(url=url)
         droplets = response.get("droplets", [])
-        return [Droplet(**droplet) for droplet in droplets]
+        return [Droplet.from_payload(droplet, self.client)
+                for droplet in droplets]
 
     def delete(self):
         r"""
@@ -92,10 +225,7 @@ class Droplet(BaseObject):
 
         :rtype: list (:class:`Snapshot <doclient.meta.Snapshot>`)
         """
-        url = self.droplet_snapshot_url % self.id
-        response = self.client.api_request(url=url, return_json=True)
-        snapshots = response.get("snapshots")
-        return [Snapshot(**snapshot) for snapshot in snapshots]
+        return list(self.client.iter_snapshots(self.id))
 
     def reset_password(self):
         r"""
@@ -104,60 +234,50 @@ class Droplet(BaseObject):
         """
         url = self.droplet_actions_url.format(
             self.droplet_base_url, self.id)
-        print("Attempting to reset password for droplet {0}".format(
-            self.id
-        ))
+        logger.info("Attempting to reset password for droplet %s",
+                    self.id)
         payload = {
             "type": "password_reset"
         }
         self.client.api_request(url=url, data=payload)
 
-    def resize(self, new_size, disk_resize=False):
+    def resize(self, new_size, disk_resize=False, timeout=None):
         r"""
-        Digitalocean droplet resize helper method
+        Digitalocean droplet resize helper method.
+        Powers the droplet off unless the API reports it already is,
+        resizes it and powers it on, moving to each step once the
+        previous action completes.
 
         :param new_size: New droplet size to be resized to.
         :type  new_size: str
         :param disk_resize: Boolean to indicate disk resizing.
         :type  disk_resize: bool
-        :return: Resized current droplet object.
+        :param timeout: Seconds to wait for each of the power off and
+                        resize actions.
+        :type  timeout: float
+        :return: The droplet as fetched after the resize, also merged
+                 into the client's inventory.
+        :raises: :class:`InvalidArgumentError <doclient.errors.InvalidArgumentError>`
+                 for sizes missing from the cached sizes catalog.
 
         :rtype: :class:`Droplet <.Droplet>`
         """
-        url = self.droplet_actions_url.format(
-            self.droplet_base_url, self.id)
-        print("".join([
-            "Droplet {0} needs to be powered off before resize.",
-            " Caveat emptor: Please power on the droplet",
-            " via the Digitalocean console or the API after "
-            "resizing."]).format(self.id))
-        self.power_off()
-        # Wait for 30 seconds to allow for the droplet to power off
-        # before inititalizing the resizing. This, and the sleep after
-        # resizing, are arbitrary values.
-        # TODO: Use information from the API on the droplet status and
-        # use event triggers/similar to initialize further changes.
-        sleep(30)
-
         if not isinstance(new_size, str):
             raise InvalidArgumentError(
                 "Invalid size specified. Required a valid string "
                 "size representation")
-        # TODO: Move to meta module as a global.
-        # 01-17-2018 - The hardcoded list breaks any future changes
-        # to the sizes. Find a way to better cache this information
-        # with minimal API call load.
-        # This change type needs to be incorporated for other meta
-        # information like zones/images too.
-        # valid_sizes = ("512mb", "1gb", "2gb", "4gb", "8gb", "16gb",
-        #                "32gb", "48gb", "64gb")
-        # if new_size not in valid_sizes:
-        #     raise InvalidArgumentError(
-        #         "Invalid size specified. Size must be an available "
-        #         "size in {0}".format("".join(valid_sizes)))
+        self.client.validate_size(new_size)
         if not isinstance(disk_resize, bool):
             disk_resize = False
 
+        url = self.droplet_actions_url.format(
+            self.droplet_base_url, self.id)
+        if self._fetch().status != "off":
+            logger.info("Droplet %s needs to be powered off before "
+                        "resize. It will be powered on again once "
+                        "resized.", self.id)
+            self._wait(self.power_off(), timeout)
+
         resize_payload = {
             "type": "resize",
             "disk": disk_resize,
@@ -168,19 +288,39 @@ class Droplet(BaseObject):
             url=url, method="post", data=resize_payload)
 
         # Handle errors
-        if response.get("message"):
+        if not response.get("action"):
             raise APIError(response.get("message"))
 
-        # Wait for 30 seconds after resizing to power on the droplet
-        # for usual use. Refer TODO above for the caveat of arbitrary
-        # sleep duration.
-        sleep(30)
+        self.client.wait_for_action(
+            Action(client=self.client, **response.get("action")),
+            timeout=timeout)
         self.power_on()
 
-        return self.client.filter_droplets(self.id)
+        return self._fetch()
+
+    def _fetch(self):
+        r"""
+        Current state of the droplet from the API, merged into the
+        client's inventory
+        """
+        response = self.client.api_request(
+            url="{0}{1}".format(self.droplet_base_url, self.id))
+        payload = response.get("droplet")
+        if not payload:
+            raise APIError(response.get("message"))
+        droplet = Droplet.from_payload(payload, self.client)
+        self.client.merge_droplets([droplet])
+        return droplet
+
+    def _wait(self, result, timeout=None):
+        r"""Wait on the action of a power action result"""
+        action = result.get("action")
+        if action is None:
+            raise APIError(result.get("message"))
+        return self.client.wait_for_action(action, timeout=timeout)
 
 
-class Image(BaseObject):
+class Image(Model):
 
     """
     DigitalOcean droplet base image object
@@ -191,13 +331,15 @@ class Image(BaseObject):
 
     :property name: Human readable identifier name for the image.
 
-    :property _id: Identifier for the image.
+    :property id: Identifier for the image.
 
     :property regions: Regions the image is available in.
 
     """
 
-    min_disk_size, slug, name, _id, regions = (None,) * 5
+    fields = ("id", "name", "slug", "distribution", "type", "public",
+              "regions", "min_disk_size", "size_gigabytes",
+              "created_at")
 
     def __repr__(self):
         return "Image {0} [{1}]".format(self.id, self.name)
@@ -206,12 +348,12 @@ class Image(BaseObject):
         return "Image {0} [{1}]".format(self.id, self.name)
 
 
-class DropletSize(BaseObject):
+class DropletSize(Model):
 
     """DigitalOcean droplet size repr object"""
 
-    price_monthly, price_hourly, memory, disk, slug = (None,) * 5
-    regions, transfer, available, vcplus = (None,) * 4
+    fields = ("slug", "memory", "vcpus", "disk", "transfer",
+              "price_monthly", "price_hourly", "regions", "available")
 
     def __repr__(self):
         available = "Available" if self.available else "Not available"
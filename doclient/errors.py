@@ -2,7 +2,7 @@
 """DigitalOcean APIv2 client errors module"""
 __author__ = "Sriram Velamur<sriram.velamur@gmail.com>"
 __all__ = ("APIAuthError", "InvalidArgumentError",
-           "APIError", "NetworkError")
+           "APIError", "NetworkError", "RateLimitError", "ActionError")
 
 import sys
 sys.dont_write_bytecode = True
@@ -66,3 +66,25 @@ class NetworkError(BaseError):
     """
 
     prefix = "NetworkError"
+
+
+class RateLimitError(APIAuthError):
+    r"""
+    DigitalOcean APIv2 rate limit error class.
+    Raised when a request cannot be placed within the rate limit
+    scheduler's maximum wait, or is still rejected with a HTTP 429
+    after the maximum number of retries.
+    Derives from APIAuthError, which rate limiting raised previously.
+    """
+
+    prefix = "RateLimitError"
+
+
+class ActionError(APIError):
+    r"""
+    DigitalOcean APIv2 action error class.
+    Raised when an awaited action errors or does not complete
+    within the requested timeout.
+    """
+
+    prefix = "ActionError"
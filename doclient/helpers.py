@@ -1,20 +1,19 @@
 #! coding=utf-8
 """DigitalOcean APIv2 helpers module"""
 __author__ = "Sriram Velamur <sriram.velamur@gmail.com>"
-__all__ = ("set_caller",)
+__all__ = ("get_next_page",)
 
 import sys
 sys.dont_write_bytecode = True
 
 
-def set_caller(function):
+def get_next_page(response):
     r"""
-    Decorator to set reference DOClient object to callee object instance.
-    """
-    def wrapper(cls, *args, **kwargs):
-        """Wrapper method"""
-        frame_locals = getattr(sys, "_getframe")(1).f_locals
-        setattr(cls, 'client', frame_locals.get("self"))
-        return function(cls, *args, **kwargs)
+    Extract the next page URL from a paginated APIv2 response.
 
-    return wrapper
+    :param response: Decoded APIv2 listing response.
+    :type  response: dict
+    :rtype: str, NoneType
+    """
+    links = response.get("links") or {}
+    return (links.get("pages") or {}).get("next")
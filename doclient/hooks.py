@@ -0,0 +1,134 @@
+#! coding=utf-8
+"""
+DigitalOcean APIv2 request hooks module.
+Provides the per-client hook registry called around API requests.
+"""
+__author__ = "Sriram Velamur <sriram.velamur@gmail.com>"
+__all__ = ("HookRegistry", "RequestEvent")
+
+import sys
+sys.dont_write_bytecode = True
+from logging import getLogger
+from threading import Lock
+
+from .errors import InvalidArgumentError
+
+
+logger = getLogger(__name__)
+
+
+class RequestEvent(object):
+
+    r"""
+    Details of one API request, passed to request hooks.
+
+    :property method: HTTP method.
+    :property endpoint: Templated endpoint path, with IDs and names
+                        replaced by placeholders (droplets/{id}).
+    :property url: Full request URL.
+    :property status: HTTP status of the final response, if any.
+    :property latency: Seconds from the first attempt to the final
+                       response or error, including retry waits.
+    :property bytes: Response body size.
+    :property retries: Number of HTTP 429 retries.
+    :property error: Exception raised for the request, if any.
+    """
+
+    __slots__ = ("method", "endpoint", "url", "status", "latency",
+                 "bytes", "retries", "error")
+
+    def __init__(self, method, endpoint, url):
+        self.method = method
+        self.endpoint = endpoint
+        self.url = url
+        self.status = self.latency = self.error = None
+        self.bytes = self.retries = 0
+
+    def __repr__(self):
+        return "RequestEvent {0} {1} [{2}]".format(
+            self.method, self.endpoint, self.status)
+
+
+class HookRegistry(object):
+
+    r"""
+    Request hook registry.
+
+    Callbacks are registered per event and called with a
+    :class:`RequestEvent <.RequestEvent>`:
+
+        before_request  before the first attempt of a request
+        after_response  once the final response has arrived
+        on_error        when the request raises
+
+    Exceptions raised by callbacks are logged and otherwise ignored.
+    An empty registry is falsy, so clients skip building events when
+    no hooks are registered.
+    """
+
+    events = ("before_request", "after_response", "on_error")
+
+    def __init__(self):
+        self._callbacks = dict((event, ()) for event in self.events)
+        self._lock = Lock()
+
+    def __bool__(self):
+        return any(self._callbacks.values())
+
+    def __repr__(self):
+        return "HookRegistry [{0} callbacks]".format(
+            sum(len(callbacks) for callbacks in self._callbacks.values()))
+
+    def _check(self, event):
+        r"""Validate an event name"""
+        if event not in self._callbacks:
+            raise InvalidArgumentError(
+                "Unknown hook event {0}. Use one of {1}".format(
+                    event, ", ".join(self.events)))
+
+    def register(self, event, callback):
+        r"""
+        Register a callback for an event.
+
+        :param event: before_request, after_response or on_error.
+        :type  event: str
+        :param callback: Callable taking a RequestEvent.
+        :type  callback: callable
+        :return: The callback.
+        :rtype: callable
+        """
+        self._check(event)
+        with self._lock:
+            self._callbacks[event] += (callback,)
+        return callback
+
+    def unregister(self, event, callback):
+        r"""
+        Remove a callback registered for an event.
+
+        :param event: before_request, after_response or on_error.
+        :type  event: str
+        :param callback: Registered callback.
+        :type  callback: callable
+        """
+        self._check(event)
+        with self._lock:
+            self._callbacks[event] = tuple(
+                registered for registered in self._callbacks[event]
+                if registered != callback)
+
+    def emit(self, event, request):
+        r"""
+        Call the callbacks registered for an event.
+
+        :param event: Event name.
+        :type  event: str
+        :param request: Request details.
+        :type  request: :class:`RequestEvent <.RequestEvent>`
+        """
+        for callback in self._callbacks[event]:
+            try:
+                callback(request)
+            except Exception:
+                logger.exception("Request hook %r failed on %s",
+                                 callback, event)
@@ -0,0 +1,211 @@
+#! coding=utf-8
+"""
+DigitalOcean APIv2 droplet index module.
+Provides constant time droplet lookups by ID and indexed name
+prefix and substring queries over a client's inventory.
+"""
+__author__ = "Sriram Velamur <sriram.velamur@gmail.com>"
+__all__ = ("DropletIndex",)
+
+import sys
+sys.dont_write_bytecode = True
+from bisect import bisect_left, insort
+from itertools import count
+from re import compile as re_compile, error as re_error
+
+from .errors import InvalidArgumentError
+
+
+class DropletIndex(object):
+
+    r"""
+    In-memory index over a droplet inventory.
+
+    Keeps an ID hash map, a sorted name list for prefix queries and
+    an n-gram posting map (all 1 to 3 character substrings of each
+    name) for substring queries. Query results are returned in
+    inventory order.
+    """
+
+    gram_size = 3
+
+    # Regular expression syntax that makes match treat a matcher as
+    # a pattern rather than a plain substring.
+    pattern_chars = frozenset("\\^$*+?{}[]|()")
+
+    def __init__(self, droplets=()):
+        r"""
+        Droplet index init
+
+        :param droplets: Droplets to index.
+        :type  droplets: iterable (:class:`Droplet <doclient.droplet.Droplet>`)
+        """
+        self._by_id = {}
+        self._order = {}
+        self._names = []
+        self._grams = {}
+        self._sequence = count()
+        for droplet in droplets:
+            self.add(droplet)
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __contains__(self, droplet_id):
+        return droplet_id in self._by_id
+
+    def __iter__(self):
+        return iter(self._sorted(self._by_id))
+
+    def __repr__(self):
+        return "DropletIndex [{0} droplets]".format(len(self))
+
+    def _grams_of(self, name):
+        r"""All 1 to gram_size character substrings of a name"""
+        grams = set()
+        for size in range(1, self.gram_size + 1):
+            for start in range(len(name) - size + 1):
+                grams.add(name[start:start + size])
+        return grams
+
+    def _sorted(self, droplet_ids):
+        r"""Droplets for the IDs, in inventory order"""
+        order = self._order
+        return [self._by_id[droplet_id] for droplet_id in
+                sorted(droplet_ids, key=order.__getitem__)]
+
+    def add(self, droplet):
+        r"""
+        Add a droplet to the index, replacing any droplet indexed
+        with the same ID in place.
+
+        :param droplet: Droplet to index.
+        :type  droplet: :class:`Droplet <doclient.droplet.Droplet>`
+        """
+        droplet_id = droplet.id
+        position = self._order.get(droplet_id)
+        if position is not None:
+            self.remove(droplet_id)
+        else:
+            position = next(self._sequence)
+        self._by_id[droplet_id] = droplet
+        self._order[droplet_id] = position
+        name = droplet.name or ""
+        insort(self._names, (name, droplet_id))
+        for gram in self._grams_of(name):
+            self._grams.setdefault(gram, set()).add(droplet_id)
+
+    def remove(self, droplet_id):
+        r"""
+        Remove a droplet from the index.
+
+        :param droplet_id: ID of the droplet to remove.
+        :type  droplet_id: int
+        :return: The removed droplet, if it was indexed.
+        :rtype: :class:`Droplet <doclient.droplet.Droplet>`
+        """
+        droplet = self._by_id.pop(droplet_id, None)
+        if droplet is None:
+            return None
+        self._order.pop(droplet_id)
+        name = droplet.name or ""
+        position = bisect_left(self._names, (name, droplet_id))
+        if position < len(self._names) and \
+                self._names[position] == (name, droplet_id):
+            del self._names[position]
+        for gram in self._grams_of(name):
+            postings = self._grams.get(gram)
+            if postings is not None:
+                postings.discard(droplet_id)
+                if not postings:
+                    del self._grams[gram]
+        return droplet
+
+    def get(self, droplet_id):
+        r"""
+        Droplet lookup by ID.
+
+        :param droplet_id: Droplet ID.
+        :type  droplet_id: int
+        :rtype: :class:`Droplet <doclient.droplet.Droplet>`, NoneType
+        """
+        return self._by_id.get(droplet_id)
+
+    def prefix(self, prefix):
+        r"""
+        Droplets whose name starts with the prefix.
+
+        :param prefix: Name prefix.
+        :type  prefix: str
+        :rtype: list (:class:`Droplet <doclient.droplet.Droplet>`)
+        """
+        names = self._names
+        matches = []
+        position = bisect_left(names, (prefix,))
+        while position < len(names) and \
+                names[position][0].startswith(prefix):
+            matches.append(names[position][1])
+            position += 1
+        return self._sorted(matches)
+
+    def search(self, text):
+        r"""
+        Droplets whose name contains the text.
+
+        :param text: Name substring.
+        :type  text: str
+        :rtype: list (:class:`Droplet <doclient.droplet.Droplet>`)
+        """
+        if not text:
+            return list(self)
+        size = self.gram_size
+        if len(text) <= size:
+            return self._sorted(self._grams.get(text, ()))
+
+        postings = [self._grams.get(text[start:start + size], set())
+                    for start in range(len(text) - size + 1)]
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                return []
+        return self._sorted(
+            droplet_id for droplet_id in candidates
+            if text in (self._by_id[droplet_id].name or ""))
+
+    def match(self, matcher, prefix=False):
+        r"""
+        Droplets matching an ID or a name token.
+
+        Integers and digit strings are looked up as droplet IDs.
+        Other tokens match as a name prefix with prefix set, as a
+        name substring otherwise, or as a regular expression when
+        they hold pattern syntax (other than ".").
+
+        :param matcher: Droplet ID or name token.
+        :type  matcher: int, str
+        :param prefix: Match the token as a name prefix.
+        :type  prefix: bool
+        :raises: :class:`InvalidArgumentError <doclient.errors.InvalidArgumentError>`
+        :rtype: list (:class:`Droplet <doclient.droplet.Droplet>`)
+        """
+        if isinstance(matcher, str) and matcher.strip().isdigit():
+            matcher = int(matcher)
+        if isinstance(matcher, int):
+            droplet = self.get(matcher)
+            return [droplet] if droplet is not None else []
+
+        if prefix:
+            return self.prefix(matcher)
+
+        if not self.pattern_chars.intersection(matcher):
+            return self.search(matcher)
+
+        try:
+            pattern = re_compile(matcher)
+        except re_error:
+            raise InvalidArgumentError(
+                "Invalid droplet name pattern {0}".format(matcher))
+        return [droplet for droplet in self
+                if pattern.search(droplet.name or "") is not None]
@@ -0,0 +1,163 @@
+#! coding=utf-8
+"""
+DigitalOcean APIv2 SSH key registry module.
+Provides constant time SSH key lookups by ID, fingerprint and name
+over an account's keys, kept in step with the API by diffing.
+"""
+__author__ = "Sriram Velamur <sriram.velamur@gmail.com>"
+__all__ = ("SSHKeyRegistry",)
+
+import sys
+sys.dont_write_bytecode = True
+
+from .errors import InvalidArgumentError
+
+
+class SSHKeyRegistry(object):
+
+    r"""
+    In-memory registry of an account's SSH keys.
+
+    Keys are held in an ID hash map with fingerprint and name maps
+    alongside, so a key reference of any of the three kinds resolves
+    without a scan. Names are not unique on DigitalOcean, so a name
+    shared by several keys resolves only through its ID or
+    fingerprint. Keys iterate in the order they were added.
+    """
+
+    def __init__(self, keys=()):
+        r"""
+        SSH key registry init
+
+        :param keys: Keys to register.
+        :type  keys: iterable (:class:`SSHKey <doclient.meta.SSHKey>`)
+        """
+        self._by_id = {}
+        self._by_fingerprint = {}
+        self._by_name = {}
+        for key in keys:
+            self.add(key)
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __iter__(self):
+        return iter(list(self._by_id.values()))
+
+    def __contains__(self, reference):
+        return bool(self.find(reference))
+
+    def __repr__(self):
+        return "SSHKeyRegistry [{0} keys]".format(len(self))
+
+    def add(self, key):
+        r"""
+        Register a key, replacing any registered with the same ID.
+
+        :param key: SSH key.
+        :type  key: :class:`SSHKey <doclient.meta.SSHKey>`
+        """
+        if key.id in self._by_id:
+            self.remove(key.id)
+        self._by_id[key.id] = key
+        if key.fingerprint:
+            self._by_fingerprint[key.fingerprint] = key.id
+        self._by_name.setdefault(key.name, []).append(key.id)
+
+    def remove(self, key_id):
+        r"""
+        Unregister a key.
+
+        :param key_id: ID of the key to remove.
+        :type  key_id: int
+        :return: The removed key, if it was registered.
+        :rtype: :class:`SSHKey <doclient.meta.SSHKey>`
+        """
+        key = self._by_id.pop(key_id, None)
+        if key is None:
+            return None
+        if self._by_fingerprint.get(key.fingerprint) == key_id:
+            del self._by_fingerprint[key.fingerprint]
+        named = self._by_name.get(key.name, [])
+        if key_id in named:
+            named.remove(key_id)
+            if not named:
+                del self._by_name[key.name]
+        return key
+
+    def sync(self, keys):
+        r"""
+        Bring the registry in line with a full key listing, touching
+        only the keys that were added, removed or changed.
+
+        :param keys: Every key of the account.
+        :type  keys: iterable (:class:`SSHKey <doclient.meta.SSHKey>`)
+        :return: Keys added or changed, and keys removed.
+        :rtype: tuple (list, list)
+        """
+        added, seen = [], set()
+        for key in keys:
+            seen.add(key.id)
+            current = self._by_id.get(key.id)
+            if current is None or \
+                    (current.name, current.fingerprint,
+                     current.public_key) != \
+                    (key.name, key.fingerprint, key.public_key):
+                self.add(key)
+                added.append(key)
+        removed = [self.remove(key_id) for key_id in
+                   [key_id for key_id in self._by_id if key_id not in seen]]
+        return added, removed
+
+    def find(self, reference):
+        r"""
+        Keys matching an ID, fingerprint or name.
+
+        :param reference: Key ID, fingerprint or name.
+        :type  reference: int, str
+        :rtype: list (:class:`SSHKey <doclient.meta.SSHKey>`)
+        """
+        if isinstance(reference, int):
+            key = self._by_id.get(reference)
+            return [key] if key is not None else []
+        key_id = self._by_fingerprint.get(reference)
+        if key_id is not None:
+            return [self._by_id[key_id]]
+        return [self._by_id[key_id]
+                for key_id in self._by_name.get(reference, ())]
+
+    def get(self, reference):
+        r"""
+        Key lookup by ID, fingerprint or name.
+
+        :param reference: Key ID, fingerprint or name.
+        :type  reference: int, str
+        :raises: :class:`InvalidArgumentError <doclient.errors.InvalidArgumentError>`
+                 if a name is shared by several keys.
+        :rtype: :class:`SSHKey <doclient.meta.SSHKey>`, NoneType
+        """
+        keys = self.find(reference)
+        if len(keys) > 1:
+            raise InvalidArgumentError(
+                "SSH key name {0} is ambiguous. Use its ID or "
+                "fingerprint".format(reference))
+        return keys[0] if keys else None
+
+    def resolve(self, references):
+        r"""
+        Key IDs for a list of key references.
+
+        :param references: Key IDs, fingerprints or names.
+        :type  references: list (int, str)
+        :return: IDs in reference order, and the references not
+                 registered.
+        :rtype: tuple (list (int), list)
+        """
+        key_ids, missing = [], []
+        for reference in references:
+            key = self.get(reference)
+            if key is None:
+                missing.append(reference)
+            else:
+                key_ids.append(key.id)
+        return key_ids, missing
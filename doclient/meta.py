@@ -6,17 +6,18 @@ Exposes meta classes for meta informtaion.
 
 
 __author__ = "Sriram Velamur <sriram.velamur@gmail.com>"
-__all__ = ("Domain", "Kernel", "Snapshot")
+__all__ = ("Domain", "DomainManager", "Kernel", "Snapshot")
 
 import sys
 sys.dont_write_bytecode = True
 
-from .base import BaseObject
-from .helpers import set_caller
-from .errors import APIAuthError, InvalidArgumentError, APIError
+from .base import Model
+from .dns import DomainRecord, RecordIndex, diff_records, parse_zone_file
+from .errors import APIAuthError, InvalidArgumentError, APIError, \
+    BaseError
 
 
-class Domain(BaseObject):
+class Domain(Model):
 
     r"""
     DigitalOcean droplet domain object
@@ -24,11 +25,17 @@ class Domain(BaseObject):
     :property name: Name of the domain.
     :property ttl:  Time-to-live for the domain.
     :property zone_file: Zone file for the domain.
+    :property client: Client the domain is managed through.
+    :property records: :class:`RecordIndex <doclient.dns.RecordIndex>`
+                       over the domain's records.
 
     """
 
-    name, ttl, zone_file = (None,) * 3
-    base_url = "https://api.digitalocean.com/v2/domains/"
+    fields = ("name", "ttl", "zone_file", "client")
+    __slots__ = ("_records", "_listed")
+    base_url = "domains/"
+    records_url = base_url + "{0}/records"
+    record_url = records_url + "/{1}"
 
     def __repr__(self):
         return "Domain {0}".format(self.name)
@@ -37,118 +44,370 @@ class Domain(BaseObject):
         return "Domain {0}".format(self.name)
 
     @classmethod
-    @set_caller
-    def create(cls, name, ip_address):
+    def create(cls, name, ip_address, client=None):
         r"""
-        Domain creation helper method
+        Domain creation helper method. See
+        :meth:`DomainManager.create <.DomainManager.create>`.
 
-        :param name: Name for the domain
-        :type  name: basestring
-        :param ip_address: IPv4 address for the domain
-        :type  ip_address: basestring
+        :param client: Client of the account owning the domain.
+        :type  client: :class:`DOClient <doclient.client.DOClient>`
+        """
+        return _manager(client).create(name, ip_address)
 
+    @classmethod
+    def get(cls, name, client=None):
+        r"""
+        Domain information fetch helper method. See
+        :meth:`DomainManager.get <.DomainManager.get>`.
         """
-        payload = {
-            "url": cls.base_url,
-            "method": "post",
-            "data": {
-                "name": name,
-                "ip_address": ip_address
-            },
-            "return_json": False
-        }
-        response = cls.client.api_request(**payload)
-        status = response.status_code
-        if status in (401, 403):
-            raise APIAuthError("Invalid authentication bearer")
-        if status == 400:
-            raise InvalidArgumentError("Invalid payload data")
-        if status == 500:
-            raise APIError(
-                "DigitalOcean API error. Please try later.")
-        if status != 201:
-            message = response.json().get("message")
-            raise InvalidArgumentError(message)
-
-        return Domain(**response.json().get("domain"))
+        return _manager(client).get(name)
 
     @classmethod
-    @set_caller
-    def get(cls, name):
-        """Domain information fetch helper method"""
-        url = "{0}{1}".format(cls.base_url, name)
-        response = cls.client.api_request(url=url, return_json=False)
-        status = response.status_code
-        if status in (401, 403):
-            raise APIAuthError("Invalid authentication bearer")
-        if status == 400:
-            raise InvalidArgumentError("Invalid payload data")
-        if status == 500:
-            raise APIError(
-                "DigitalOcean API error. Please try later.")
-        if status != 200:
-            message = response.json().get("message")
-            raise InvalidArgumentError(message)
-
-        return Domain(**response.json().get("domain"))
+    def get_all(cls, client=None):
+        r"""
+        Get all domain maps generated through DigitalOcean's DNS. See
+        :meth:`DomainManager.all <.DomainManager.all>`.
+        """
+        return _manager(client).all()
 
     @classmethod
-    @set_caller
-    def get_all(cls):
+    def delete(cls, name, client=None):
+        r"""
+        Domain mapping delete helper method. See
+        :meth:`DomainManager.delete <.DomainManager.delete>`.
+        """
+        return _manager(client).delete(name)
+
+    def _api(self):
+        r"""Client placing the domain's record requests"""
+        if self.client is None:
+            raise InvalidArgumentError(
+                "Domain {0} is not bound to a client".format(self.name))
+        return self.client
+
+    @property
+    def records(self):
+        r"""
+        Index over the domain's records. Parsed from zone_file on
+        first access and replaced by the API listing once
+        :meth:`get_records` has run. Record writes through the domain
+        update a listed index in place; after a write, an index parsed
+        from zone_file is replaced by the API listing on next access.
+
+        :rtype: :class:`RecordIndex <doclient.dns.RecordIndex>`
+        """
+        records = self._records
+        if records is None:
+            if self._listed:
+                self.get_records()
+                return self._records
+            records = self._records = RecordIndex(
+                parse_zone_file(self.zone_file, self.name))
+        return records
+
+    def get_records(self):
+        r"""
+        Fetch the domain's records across all result pages.
+
+        :rtype: list (:class:`DomainRecord <doclient.dns.DomainRecord>`)
+        """
+        records = [DomainRecord(**record) for record in
+                   self._api().iter_pages(
+                       self.records_url.format(self.name),
+                       "domain_records")]
+        self._records = RecordIndex(records)
+        self._listed = True
+        return records
+
+    def _reindex(self, record=None, removed=None):
+        r"""
+        Apply a record write to the index if it holds the API
+        listing, otherwise drop it to be listed on next access.
+        """
+        records = self._records if self._listed else None
+        self._listed = True
+        if records is None:
+            self._records = None
+            return
+        if removed is not None:
+            records.remove(removed)
+        if record is not None:
+            records.add(record)
+
+    def create_record(self, record):
+        r"""
+        Create a domain record.
+
+        :param record: Record to create.
+        :type  record: :class:`DomainRecord <doclient.dns.DomainRecord>`, dict
+        :rtype: :class:`DomainRecord <doclient.dns.DomainRecord>`
+        """
+        record = self._create_record(record)
+        self._reindex(record)
+        return record
+
+    def _create_record(self, record):
+        r"""Create a domain record, leaving the index alone"""
+        record = DomainRecord.coerce(record)
+        response = self._api().api_request(
+            url=self.records_url.format(self.name), method="POST",
+            data=record.as_payload(), return_json=False)
+        return DomainRecord(
+            **_checked(response, 201).get("domain_record"))
+
+    def update_record(self, record_id, record):
+        r"""
+        Update a domain record.
+
+        :param record_id: ID of the record to update.
+        :type  record_id: int
+        :param record: Desired state of the record.
+        :type  record: :class:`DomainRecord <doclient.dns.DomainRecord>`, dict
+        :rtype: :class:`DomainRecord <doclient.dns.DomainRecord>`
         """
+        record = self._update_record(record_id, record)
+        self._reindex(record)
+        return record
+
+    def _update_record(self, record_id, record):
+        r"""Update a domain record, leaving the index alone"""
+        record = DomainRecord.coerce(record)
+        response = self._api().api_request(
+            url=self.record_url.format(self.name, record_id),
+            method="PUT", data=record.as_payload(), return_json=False)
+        return DomainRecord(
+            **_checked(response, 200).get("domain_record"))
+
+    def delete_record(self, record_id):
+        r"""
+        Delete a domain record.
+
+        :param record_id: ID of the record to delete.
+        :type  record_id: int
+        :rtype: dict
+        """
+        result = self._delete_record(record_id)
+        self._reindex(removed=record_id)
+        return result
+
+    def _delete_record(self, record_id):
+        r"""Delete a domain record, leaving the index alone"""
+        response = self._api().api_request(
+            url=self.record_url.format(self.name, record_id),
+            method="DELETE", return_json=False)
+        _checked(response, 204)
+        return {"message": "Successfully deleted domain record"}
+
+    def sync_records(self, desired, types=None, concurrency=None,
+                     dry_run=False):
+        r"""
+        Bring the domain's records in line with a desired record
+        set, placing only the writes computed by
+        :func:`diff_records <doclient.dns.diff_records>`. Updates and
+        deletes are applied concurrently first, then creates; every
+        request is paced by the client's rate limiter. An unchanged
+        zone costs the record listing and no writes. The listing and
+        the writes placed are kept in :attr:`records`.
+
+        :param desired: Desired records, or zone file text.
+        :type  desired: list (:class:`DomainRecord <doclient.dns.DomainRecord>`, dict), str
+        :param types: Record types to manage. Defaults to every
+                      type but NS, unless desired holds NS records.
+        :type  types: list (str)
+        :param concurrency: Maximum writes in flight. Defaults to
+                            the client's connection pool size.
+        :type  concurrency: int
+        :param dry_run: Compute the writes without placing them.
+        :type  dry_run: bool
+        :return: Records created, updated and deleted (planned ones
+                 on a dry run), and errors of failed writes.
+        :rtype: dict
+        """
+        if isinstance(desired, str):
+            desired = parse_zone_file(desired, self.name)
+        desired = [DomainRecord.coerce(record) for record in desired]
+        creates, updates, deletes = diff_records(
+            self.get_records(), desired, types=types)
+        result = {
+            "created": creates,
+            "updated": [record for _, record in updates],
+            "deleted": deletes,
+            "errors": [],
+        }
+        if dry_run:
+            return result
+
+        client = self._api()
+        writes = [(self._update_record, (current.id, record))
+                  for current, record in updates] + \
+            [(self._delete_record, (record.id,)) for record in deletes]
+        results = client.fan_out(lambda write: write[0](*write[1]),
+                                 writes, concurrency=concurrency)
+        results += client.fan_out(self._create_record, creates,
+                                  concurrency=concurrency)
+        updated = results[:len(updates)]
+        created = results[len(writes):]
+        result.update({
+            "created": [record for record in created
+                        if isinstance(record, DomainRecord)],
+            "updated": [record for record in updated
+                        if isinstance(record, DomainRecord)],
+            "deleted": [record for record, outcome in
+                        zip(deletes, results[len(updates):len(writes)])
+                        if isinstance(outcome, dict)],
+            "errors": [outcome for outcome in results
+                       if isinstance(outcome, BaseError)],
+        })
+        for record in result["deleted"]:
+            self._reindex(removed=record.id)
+        for record in result["updated"] + result["created"]:
+            self._reindex(record)
+        return result
+
+
+class DomainManager(object):
+
+    r"""
+    Domains of one client's account, available as client.domains.
+
+    The manager only holds its client: requests go out on the
+    client's pooled session with its token, rate limiter and hooks,
+    so managers of different clients can be used from any number of
+    threads at once.
+
+    Usage::
+
+        domain = client.domains.create("example.com", "203.0.113.1")
+        for domain in client.domains:
+            ...
+    """
+
+    __slots__ = ("client",)
+
+    def __init__(self, client):
+        r"""
+        Domain manager init
+
+        :param client: Client of the account owning the domains.
+        :type  client: :class:`DOClient <doclient.client.DOClient>`
+        """
+        self.client = client
+
+    def __repr__(self):
+        return "DomainManager [{0}]".format(self.client)
+
+    def __iter__(self):
+        return self.iter()
+
+    def _request(self, url, expected, method="GET", data=None):
+        r"""Place a domain request, mapping unexpected statuses"""
+        response = self.client.api_request(
+            url=url, method=method, data=data, return_json=False)
+        return _checked(response, expected)
+
+    def _domain(self, payload):
+        r"""Domain bound to the manager's client"""
+        return Domain(client=self.client, **payload)
+
+    def create(self, name, ip_address):
+        r"""
+        Create a domain mapped to an IP address.
+
+        :param name: Name for the domain
+        :type  name: str
+        :param ip_address: IPv4 address for the domain
+        :type  ip_address: str
+        :raises: :class:`InvalidArgumentError <doclient.errors.InvalidArgumentError>`
+        :rtype: :class:`Domain <.Domain>`
+        """
+        if not isinstance(name, str) or not name:
+            raise InvalidArgumentError(
+                "name needs to be a valid domain name string")
+        if not isinstance(ip_address, str):
+            raise InvalidArgumentError(
+                "ip_address needs to be a valid IPV4/IPV6 address")
+        response = self._request(
+            Domain.base_url, 201, method="POST",
+            data={"name": name, "ip_address": ip_address})
+        return self._domain(response.get("domain"))
+
+    def get(self, name):
+        r"""
+        Get a domain.
+
+        :param name: Domain name
+        :type  name: str
+        :rtype: :class:`Domain <.Domain>`
+        """
+        url = "{0}{1}".format(Domain.base_url, name)
+        return self._domain(self._request(url, 200).get("domain"))
+
+    def iter(self, concurrency=None):
+        r"""
+        Iterate over the account's domains across all result pages.
+
+        :param concurrency: Maximum number of pages fetched in
+                            parallel.
+        :type  concurrency: int
+        :rtype: generator (:class:`Domain <.Domain>`)
+        """
+        for domain in self.client.iter_pages(
+                Domain.base_url.rstrip("/"), "domains",
+                concurrency=concurrency):
+            yield self._domain(domain)
+
+    def all(self):
+        r"""
         Get all domain maps generated through DigitalOcean's DNS.
-        :rtype: list<Domain>
-        """
-        response = cls.client.api_request(
-            url=cls.base_url, return_json=False)
-        status = response.status_code
-        if status in (401, 403):
-            raise APIAuthError("Invalid authentication bearer")
-        if status == 400:
-            raise InvalidArgumentError("Invalid payload data")
-        if status == 500:
-            raise APIError(
-                "DigitalOcean API error. Please try later.")
-        if status != 200:
-            message = response.json().get("message")
-            raise InvalidArgumentError(message)
-        domains = response.json().get("domains", [])
-        return [Domain(**domain) for domain in domains]
 
-    @classmethod
-    @set_caller
-    def delete(cls, name):
+        :rtype: list (:class:`Domain <.Domain>`)
         """
-        Domain mapping delete helper method
+        return list(self.iter())
+
+    def delete(self, name):
+        r"""
+        Delete a domain mapping.
+
         :param name: Domain name
-        :type  name: basestring
+        :type  name: str
         :rtype: dict
         """
-        url = "{0}{1}".format(cls.base_url, name)
-        response = cls.client.api_request(
-            url=url, method="delete", return_json=False)
-        status = response.status_code
-        if status in (401, 403):
-            raise APIAuthError("Invalid authentication bearer")
-        if status == 400:
-            raise InvalidArgumentError("Invalid payload data")
-        if status == 500:
-            raise APIError(
-                "DigitalOcean API error. Please try later.")
-        if status != 204:
-            message = response.json().get("message")
-            raise InvalidArgumentError(message)
-
+        url = "{0}{1}".format(Domain.base_url, name)
+        self._request(url, 204, method="DELETE")
         return {
             "message": "Successfully initiated domain mapping delete"
         }
 
 
-class Kernel(BaseObject):
+def _manager(client):
+    r"""Domain manager of a client"""
+    if client is None:
+        raise InvalidArgumentError(
+            "A client is needed to manage domains. Use client.domains")
+    return client.domains
+
+
+def _checked(response, expected):
+    r"""Decoded domain response, mapping unexpected statuses"""
+    status = response.status_code
+    if status in (401, 403):
+        raise APIAuthError("Invalid authentication bearer")
+    if status == 400:
+        raise InvalidArgumentError("Invalid payload data")
+    if status == 500:
+        raise APIError(
+            "DigitalOcean API error. Please try later.")
+    if status != expected:
+        message = response.json().get("message")
+        raise InvalidArgumentError(message or "Invalid payload data")
+    return response.json() if status != 204 else {}
+
+
+class Kernel(Model):
 
     """DigitalOcean droplet kernel object"""
 
-    version, name = None, None
+    fields = ("id", "name", "version")
 
     def __repr__(self):
         return "Kernel {0} [Name: {1} | Version: {2}]".format(
@@ -159,13 +418,13 @@ class Kernel(BaseObject):
             self.id, self.name, self.version)
 
 
-class Snapshot(BaseObject):
+class Snapshot(Model):
 
     """DigitalOcean droplet snapshot object"""
 
-    droplet, _id, name, distribution, public = (None,) * 5
-    regions, created_at = None, None
-    _type, min_disk_size = None, None
+    fields = ("id", "name", "droplet", "distribution", "public",
+              "regions", "created_at", "type", "min_disk_size")
+    private_props = ("id", "type")
 
     @property
     def type(self):
@@ -183,11 +442,11 @@ class Snapshot(BaseObject):
                 self.id, self.name, self.droplet, self.distribution)
 
 
-class Region(BaseObject):
+class Region(Model):
 
     """DigitalOcean region object class"""
 
-    available, sizes, features, name, slug = (None,) * 5
+    fields = ("name", "slug", "available", "sizes", "features")
 
     def __repr__(self):
         return "Region {0} [{1} - {2}]" .format(
@@ -200,11 +459,11 @@ class Region(BaseObject):
             "Available" if self.available else "Unavailable")
 
 
-class SSHKey(BaseObject):
+class SSHKey(Model):
 
     """SSH key object associated with a DigitalOcean account"""
 
-    fingerprint, name, public_key = None, None, None
+    fields = ("id", "name", "fingerprint", "public_key")
 
     def __repr__(self):
         return "SSH Key {0} [{1}]".format(self.name, self.fingerprint)
@@ -213,9 +472,9 @@ class SSHKey(BaseObject):
         return "SSH Key {0} [{1}]".format(self.name, self.fingerprint)
 
 
-class DropletNetwork(BaseObject):
+class DropletNetwork(Model):
 
     """DigitalOcean droplet network object"""
 
-    network_type, netmask, ip_address,\
-        gateway, is_public = (None,) * 5
+    fields = ("network_type", "ip_address", "netmask", "gateway",
+              "is_public")
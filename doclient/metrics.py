@@ -0,0 +1,217 @@
+#! coding=utf-8
+"""
+DigitalOcean APIv2 metrics module.
+Aggregates request hook events into per-endpoint metrics.
+"""
+__author__ = "Sriram Velamur <sriram.velamur@gmail.com>"
+__all__ = ("MetricsCollector",)
+
+import sys
+sys.dont_write_bytecode = True
+from bisect import bisect_left
+from threading import Lock
+
+
+class _EndpointStats(object):
+
+    """Running totals for one method and endpoint"""
+
+    __slots__ = ("count", "errors", "latency_sum", "buckets", "bytes",
+                 "retries", "statuses")
+
+    def __init__(self, bucket_count):
+        self.count = self.errors = self.bytes = self.retries = 0
+        self.latency_sum = 0.0
+        self.buckets = [0] * (bucket_count + 1)
+        self.statuses = {}
+
+
+class MetricsCollector(object):
+
+    r"""
+    Request metrics aggregator.
+
+    Attached to one or more clients, it collects per method and
+    templated endpoint request counts, latency histograms, HTTP
+    statuses, error counts (raised requests and HTTP 4xx/5xx
+    replies), response bytes and retries. Read them with snapshot()
+    or render them in the Prometheus text exposition format with
+    prometheus().
+
+    Usage::
+
+        metrics = MetricsCollector().attach(client)
+        ...
+        print(metrics.prometheus())
+    """
+
+    buckets = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+               5.0, 10.0)
+    namespace = "doclient"
+
+    def __init__(self, buckets=None):
+        r"""
+        Metrics collector init
+
+        :param buckets: Latency histogram upper bounds in seconds.
+        :type  buckets: tuple (float)
+        """
+        self.buckets = tuple(sorted(buckets or self.buckets))
+        self._stats = {}
+        self._lock = Lock()
+
+    def __repr__(self):
+        return "MetricsCollector [{0} endpoints]".format(len(self._stats))
+
+    def attach(self, client):
+        r"""
+        Collect the requests of a client.
+
+        :param client: Client to instrument.
+        :type  client: :class:`BaseClient <doclient.client.BaseClient>`
+        :rtype: :class:`MetricsCollector <.MetricsCollector>`
+        """
+        client.hooks.register("after_response", self.record)
+        client.hooks.register("on_error", self.record)
+        return self
+
+    def detach(self, client):
+        r"""
+        Stop collecting the requests of a client.
+
+        :param client: Instrumented client.
+        :type  client: :class:`BaseClient <doclient.client.BaseClient>`
+        """
+        client.hooks.unregister("after_response", self.record)
+        client.hooks.unregister("on_error", self.record)
+
+    def record(self, request):
+        r"""
+        Add a finished request.
+
+        :param request: Request details.
+        :type  request: :class:`RequestEvent <doclient.hooks.RequestEvent>`
+        """
+        key = (request.method, request.endpoint)
+        latency = request.latency or 0.0
+        bucket = bisect_left(self.buckets, latency)
+        status = request.status
+        failed = request.error is not None or \
+            (status is not None and status >= 400)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = _EndpointStats(
+                    len(self.buckets))
+            stats.count += 1
+            stats.errors += failed
+            stats.latency_sum += latency
+            stats.buckets[bucket] += 1
+            stats.bytes += request.bytes or 0
+            stats.retries += request.retries or 0
+            if status is not None:
+                stats.statuses[status] = stats.statuses.get(status, 0) + 1
+
+    def reset(self):
+        r"""Drop all collected metrics"""
+        with self._lock:
+            self._stats.clear()
+
+    def _cumulative(self, stats):
+        r"""Cumulative histogram counts keyed by upper bound"""
+        counts, total = [], 0
+        for bound, count in zip(self.buckets + (float("inf"),),
+                                stats.buckets):
+            total += count
+            counts.append((bound, total))
+        return counts
+
+    def snapshot(self):
+        r"""
+        Collected metrics per "METHOD endpoint".
+
+        :rtype: dict
+        """
+        snapshot = {}
+        with self._lock:
+            for (method, endpoint), stats in self._stats.items():
+                snapshot["{0} {1}".format(method, endpoint)] = {
+                    "method": method,
+                    "endpoint": endpoint,
+                    "count": stats.count,
+                    "errors": stats.errors,
+                    "error_rate": stats.errors / float(stats.count),
+                    "latency": {
+                        "sum": stats.latency_sum,
+                        "mean": stats.latency_sum / stats.count,
+                        "buckets": dict(
+                            ("+Inf" if bound == float("inf") else bound,
+                             count)
+                            for bound, count in self._cumulative(stats)),
+                    },
+                    "bytes": stats.bytes,
+                    "retries": stats.retries,
+                    "statuses": dict(stats.statuses),
+                }
+        return snapshot
+
+    def prometheus(self):
+        r"""
+        Collected metrics in the Prometheus text exposition format.
+
+        :rtype: str
+        """
+        name = self.namespace
+        with self._lock:
+            items = sorted(self._stats.items())
+            items = [(key, stats, self._cumulative(stats),
+                      sorted(stats.statuses.items()))
+                     for key, stats in items]
+        histogram, requests, errors, sizes, retries = [], [], [], [], []
+        for (method, endpoint), stats, cumulative, statuses in items:
+            labels = 'method="{0}",endpoint="{1}"'.format(
+                _escape(method), _escape(endpoint))
+            for bound, count in cumulative:
+                histogram.append(
+                    '{0}_request_duration_seconds_bucket{{{1},le="{2}"}} '
+                    '{3}'.format(name, labels, "+Inf" if bound == float(
+                        "inf") else repr(bound), count))
+            histogram.append("{0}_request_duration_seconds_sum{{{1}}} "
+                             "{2!r}".format(name, labels,
+                                            stats.latency_sum))
+            histogram.append("{0}_request_duration_seconds_count{{{1}}} "
+                             "{2}".format(name, labels, stats.count))
+            for status, count in statuses:
+                requests.append('{0}_requests_total{{{1},status="{2}"}} '
+                                '{3}'.format(name, labels, status, count))
+            errors.append("{0}_request_errors_total{{{1}}} {2}".format(
+                name, labels, stats.errors))
+            sizes.append("{0}_response_bytes_total{{{1}}} {2}".format(
+                name, labels, stats.bytes))
+            retries.append("{0}_request_retries_total{{{1}}} {2}".format(
+                name, labels, stats.retries))
+
+        lines = []
+        for metric, kind, description, samples in (
+                ("request_duration_seconds", "histogram",
+                 "APIv2 request latency in seconds.", histogram),
+                ("requests_total", "counter",
+                 "APIv2 requests by HTTP status.", requests),
+                ("request_errors_total", "counter",
+                 "APIv2 requests raising or answered with HTTP 4xx/5xx.",
+                 errors),
+                ("response_bytes_total", "counter",
+                 "APIv2 response body bytes.", sizes),
+                ("request_retries_total", "counter",
+                 "APIv2 requests retried after HTTP 429.", retries)):
+            lines.append("# HELP {0}_{1} {2}".format(
+                name, metric, description))
+            lines.append("# TYPE {0}_{1} {2}".format(name, metric, kind))
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    r"""Escape a Prometheus label value"""
+    return str(value).replace("\\", "\\\\").replace(
+        '"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,288 @@
+#! coding=utf-8
+"""
+DigitalOcean APIv2 multi-account module.
+Provides a pool of clients, one per account, sharing a connection
+pool and exposing a merged, indexed view of their inventories.
+"""
+__author__ = "Sriram Velamur <sriram.velamur@gmail.com>"
+__all__ = ("DOClientPool",)
+
+import sys
+sys.dont_write_bytecode = True
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+from .client import DOClient
+from .errors import BaseError, InvalidArgumentError
+from .index import DropletIndex
+
+
+class DOClientPool(object):
+
+    r"""
+    Pool of DOClients, one per account.
+
+    Every client places its requests on one shared pooled session,
+    while its droplets, account information, SSH keys, caches and
+    rate limiter stay its own. Inventories are loaded concurrently
+    and merged into one cross-account droplet index, rebuilt only
+    when an account's inventory changes, so finding a droplet in any
+    account is a local lookup.
+
+    Usage::
+
+        with DOClientPool({"prod": prod_token, "staging": token}) as pool:
+            droplet = pool.get_droplet(droplet_id)
+            client = pool[pool.account_of(droplet_id)]
+
+    :property errors: Accounts whose last load or refresh failed,
+                      mapped to the error raised. Their droplets
+                      are left out of the merged view.
+    """
+
+    concurrency = 8
+
+    def __init__(self, tokens, pool_size=None, keep_alive=None,
+                 concurrency=None, lazy=False, **client_kwargs):
+        r"""
+        Client pool init
+
+        :param tokens: API tokens keyed by account name, or a list of
+                       tokens, whose accounts are then named by their
+                       position, "account-0" on. An account may map
+                       to a dict of DOClient keyword arguments holding
+                       its token instead, e.g. to give it its own
+                       api_base.
+        :type  tokens: dict, list (str)
+        :param pool_size: Maximum number of connections in the
+                          shared pool. Defaults to the larger of
+                          DOClient.pool_size and concurrency.
+        :type  pool_size: int
+        :param keep_alive: Reuse connections across requests.
+        :type  keep_alive: bool
+        :param concurrency: Maximum accounts loaded in parallel.
+                            Defaults to 8.
+        :type  concurrency: int
+        :param lazy: Defer loading inventories until first needed.
+                     By default every account is loaded during init.
+        :type  lazy: bool
+        :param client_kwargs: DOClient keyword arguments applied to
+                              every account.
+        """
+        if isinstance(tokens, dict):
+            accounts = list(tokens.items())
+        elif isinstance(tokens, (list, tuple)):
+            accounts = [("account-{0}".format(idx), token)
+                        for idx, token in enumerate(tokens)]
+        else:
+            raise InvalidArgumentError(
+                "tokens needs to be a dict or a list of API tokens")
+        if not accounts:
+            raise InvalidArgumentError("tokens needs at least one token")
+        if concurrency is not None:
+            if not isinstance(concurrency, int) or concurrency < 1:
+                raise InvalidArgumentError(
+                    "concurrency needs to be a positive integer")
+            self.concurrency = concurrency
+        for name in ("lazy", "session"):
+            client_kwargs.pop(name, None)
+
+        self.session = DOClient.make_session(
+            pool_size or max(DOClient.pool_size, self.concurrency),
+            keep_alive)
+        self._clients = {}
+        for name, account in accounts:
+            kwargs = dict(client_kwargs, keep_alive=keep_alive)
+            if isinstance(account, dict):
+                kwargs.update(account)
+            else:
+                kwargs["token"] = account
+            self._clients[name] = DOClient(
+                lazy=True, session=self.session, **kwargs)
+
+        self.errors = {}
+        self._index = DropletIndex()
+        self._owners = {}
+        self._versions = None
+        self._lock = Lock()
+        if not lazy:
+            self.load()
+
+    def __repr__(self):
+        return "DOClientPool [{0} accounts]".format(len(self._clients))
+
+    def __len__(self):
+        return len(self._clients)
+
+    def __iter__(self):
+        return iter(self._clients)
+
+    def __contains__(self, name):
+        return name in self._clients
+
+    def __getitem__(self, name):
+        r"""
+        Client of an account.
+
+        :param name: Account name.
+        :type  name: str
+        :rtype: :class:`DOClient <doclient.client.DOClient>`
+        """
+        try:
+            return self._clients[name]
+        except KeyError:
+            raise InvalidArgumentError(
+                "Unknown account {0}".format(name))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def items(self):
+        r"""
+        Account names and clients.
+
+        :rtype: list (tuple (str, :class:`DOClient <doclient.client.DOClient>`))
+        """
+        return list(self._clients.items())
+
+    def _each(self, method, names):
+        r"""Call a client method for the named accounts in parallel"""
+        names = list(names)
+
+        def call(name):
+            """Call the method, recording the account's error"""
+            try:
+                getattr(self._clients[name], method)()
+            except BaseError as error:
+                self.errors[name] = error
+            else:
+                self.errors.pop(name, None)
+
+        workers = min(self.concurrency, len(names))
+        if workers < 2:
+            for name in names:
+                call(name)
+            return
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            list(executor.map(call, names))
+        finally:
+            executor.shutdown(wait=True)
+
+    def load(self, names=None):
+        r"""
+        Load the droplets, account information and SSH keys of
+        accounts in parallel. Failures are recorded in errors
+        rather than raised.
+
+        :param names: Accounts to load. Defaults to all accounts.
+        :type  names: list (str)
+        :return: Accounts that failed to load.
+        :rtype: dict
+        """
+        self._each("load", self._clients if names is None else names)
+        return dict(self.errors)
+
+    def refresh(self, names=None):
+        r"""
+        Reconcile the droplet inventories of accounts with the API
+        in parallel. Failures are recorded in errors rather than
+        raised.
+
+        :param names: Accounts to refresh. Defaults to all accounts.
+        :type  names: list (str)
+        :return: Accounts that failed to refresh.
+        :rtype: dict
+        """
+        self._each("refresh", self._clients if names is None else names)
+        return dict(self.errors)
+
+    def _view(self):
+        r"""
+        Merged index and droplet owners over every account. Accounts
+        not yet loaded are loaded first; both are rebuilt only when
+        an account's inventory has changed since the last build.
+        """
+        pending = [name for name, client in self._clients.items()
+                   if client._droplets is None and name not in self.errors]
+        if pending:
+            self.load(pending)
+
+        with self._lock:
+            versions = tuple(client.inventory_version
+                             for client in self._clients.values())
+            if versions != self._versions:
+                index, owners = DropletIndex(), {}
+                for name, client in self._clients.items():
+                    for droplet in client._droplets or ():
+                        index.add(droplet)
+                        owners[droplet.id] = name
+                self._index, self._owners = index, owners
+                self._versions = versions
+            return self._index, self._owners
+
+    @property
+    def droplet_index(self):
+        r"""
+        Index over the droplets of every account.
+
+        :rtype: :class:`DropletIndex <doclient.index.DropletIndex>`
+        """
+        return self._view()[0]
+
+    @property
+    def droplets(self):
+        r"""
+        Droplets of every account.
+
+        :rtype: list (:class:`Droplet <doclient.droplet.Droplet>`)
+        """
+        return list(self.droplet_index)
+
+    def get_droplet(self, droplet_id):
+        r"""
+        Droplet lookup by ID across every account.
+
+        :param droplet_id: Droplet ID.
+        :type  droplet_id: int
+        :rtype: :class:`Droplet <doclient.droplet.Droplet>`, NoneType
+        """
+        return self.droplet_index.get(droplet_id)
+
+    def account_of(self, droplet_id):
+        r"""
+        Name of the account owning a droplet.
+
+        :param droplet_id: Droplet ID.
+        :type  droplet_id: int
+        :rtype: str, NoneType
+        """
+        return self._view()[1].get(droplet_id)
+
+    def filter_droplets(self, matcher, prefix=False):
+        r"""
+        Droplets of every account matching an ID or a name token.
+        See :meth:`DropletIndex.match
+        <doclient.index.DropletIndex.match>`.
+
+        :param matcher: Droplet ID or name token.
+        :type  matcher: int, str
+        :param prefix: Match the token as a name prefix.
+        :type  prefix: bool
+        :rtype: list (:class:`Droplet <doclient.droplet.Droplet>`)
+        """
+        if not isinstance(matcher, (str, int)):
+            raise InvalidArgumentError(
+                "matcher needs to be a droplet ID or name token")
+        return self.droplet_index.match(matcher, prefix=prefix)
+
+    def close(self):
+        r"""
+        Close the shared connection pool.
+
+        :rtype: NoneType
+        """
+        self.session.close()
@@ -0,0 +1,177 @@
+#! coding=utf-8
+"""
+DigitalOcean APIv2 rate limit module.
+Provides the client-side request scheduler used by api_request.
+"""
+__author__ = "Sriram Velamur <sriram.velamur@gmail.com>"
+__all__ = ("RateLimiter",)
+
+import sys
+sys.dont_write_bytecode = True
+from email.utils import parsedate_tz, mktime_tz
+from random import uniform
+from threading import Lock
+from time import time, monotonic
+
+
+class RateLimiter(object):
+
+    r"""
+    Client-side request scheduler for the DigitalOcean APIv2.
+
+    Runs a token bucket sized on the API's per-minute limit (250
+    requests a minute by default) so bursts are spread out instead
+    of tripping the limit. The bucket is kept in step with the
+    server through the ratelimit-remaining and ratelimit-reset
+    response headers: local tokens never exceed the server's
+    remaining budget, the refill rate is lowered to spread that
+    budget evenly over the time left until the reset, and an
+    exhausted budget holds all requests until the reset time.
+    HTTP 429 replies hold requests for the Retry-After period, or
+    an exponential backoff when the header is missing, with jitter
+    so waiting callers do not retry in lockstep.
+
+    A single limiter may be shared by several clients using the same
+    token.
+    """
+
+    def __init__(self, rate=250 / 60.0, burst=250, max_wait=3600.0,
+                 backoff_base=1.0, backoff_cap=60.0):
+        r"""
+        Rate limiter init
+
+        :param rate: Sustained requests per second.
+        :type  rate: float
+        :param burst: Requests that may be placed back to back.
+        :type  burst: int
+        :param max_wait: Longest wait, in seconds, a request may be
+                         held for before the scheduler gives up.
+        :type  max_wait: float
+        :param backoff_base: First retry delay without Retry-After.
+        :type  backoff_base: float
+        :param backoff_cap: Longest retry delay without Retry-After.
+        :type  backoff_cap: float
+        """
+        self.rate = self.base_rate = float(rate)
+        self.burst = burst
+        self.max_wait = max_wait
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.tokens = float(burst)
+        self.remaining = None
+        self.limit = None
+        self.reset_at = None
+        self._updated = monotonic()
+        self._held_until = 0.0
+        self._lock = Lock()
+
+    def __repr__(self):
+        return "RateLimiter [{0:.2f}/s, {1} remaining]".format(
+            self.rate, self.remaining)
+
+    def _refill(self, now):
+        r"""Add tokens accrued since the last update"""
+        elapsed = now - self._updated
+        self._updated = now
+        self.tokens = min(float(self.burst),
+                          self.tokens + elapsed * self.rate)
+
+    def reserve(self):
+        r"""
+        Reserve a slot for one request.
+
+        :return: Seconds the caller needs to wait before placing the
+                 request.
+        :rtype: float
+        """
+        with self._lock:
+            now = monotonic()
+            self._refill(now)
+            self.tokens -= 1
+            delay = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(delay, self._held_until - now)
+
+    def refund(self):
+        r"""
+        Return the slot of a reserved request that was not placed.
+
+        :rtype: NoneType
+        """
+        with self._lock:
+            self.tokens = min(float(self.burst), self.tokens + 1)
+
+    def update(self, headers):
+        r"""
+        Synchronise the scheduler with rate limit response headers.
+        Missing or malformed headers are ignored.
+
+        :param headers: HTTP response headers
+        :type  headers: dict, requests.structures.CaseInsensitiveDict
+        """
+        limit = _number(headers.get("ratelimit-limit"), int)
+        remaining = _number(headers.get("ratelimit-remaining"), int)
+        reset_at = _number(headers.get("ratelimit-reset"), float)
+        with self._lock:
+            if limit is not None:
+                self.limit = limit
+            if reset_at is not None:
+                self.reset_at = reset_at
+            if remaining is None:
+                return
+            self.remaining = remaining
+            now = monotonic()
+            self._refill(now)
+            self.tokens = min(self.tokens, float(remaining))
+            window = self.reset_at - time() \
+                if self.reset_at is not None else 0
+            if remaining >= 1 and window > 0:
+                self.rate = min(self.base_rate, remaining / window)
+            else:
+                self.rate = self.base_rate
+            if remaining < 1 and self.reset_at is not None:
+                self._held_until = max(
+                    self._held_until, now + self.reset_at - time())
+
+    def backoff(self, attempt, retry_after=None):
+        r"""
+        Hold requests after a HTTP 429 reply.
+
+        :param attempt: 0-based retry attempt for the request.
+        :type  attempt: int
+        :param retry_after: Retry-After header value, in seconds or
+                            as a HTTP date.
+        :type  retry_after: str
+        :return: Seconds the caller needs to wait before retrying.
+        :rtype: float
+        """
+        delay = _retry_after(retry_after)
+        if delay is None:
+            delay = min(self.backoff_cap,
+                        self.backoff_base * (2 ** attempt))
+            delay = uniform(delay / 2.0, delay)
+        else:
+            delay += uniform(0, self.backoff_base)
+        with self._lock:
+            now = monotonic()
+            self._held_until = max(self._held_until, now + delay)
+            self.tokens = min(self.tokens, 0.0)
+            return self._held_until - now
+
+
+def _number(value, cast):
+    r"""Cast a header value, returning None when it is unusable"""
+    try:
+        return cast(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _retry_after(value):
+    r"""Parse a Retry-After header into seconds from now"""
+    seconds = _number(value, float)
+    if seconds is not None:
+        return max(seconds, 0.0)
+    date = parsedate_tz(value) if value else None
+    if date is None:
+        return None
+    return max(mktime_tz(date) - time(), 0.0)
@@ -0,0 +1,114 @@
+#! coding=utf-8
+"""
+DigitalOcean APIv2 request coalescing module.
+Lets concurrent identical GETs share a single in-flight request.
+"""
+__author__ = "Sriram Velamur <sriram.velamur@gmail.com>"
+__all__ = ("AsyncSingleFlight", "SingleFlight")
+
+import sys
+sys.dont_write_bytecode = True
+import asyncio
+from concurrent.futures import Future
+from threading import Lock
+
+
+class SingleFlight(object):
+
+    r"""
+    Thread-safe single-flight call coalescing.
+
+    The first caller for a key runs the call; callers arriving while
+    it is in flight wait for it and receive the same result (or
+    exception) instead of running their own. Nothing is cached once
+    the call completes.
+
+    :property leaders: Calls actually run.
+    :property shared: Calls answered from another caller's run.
+    """
+
+    def __init__(self):
+        self.leaders = 0
+        self.shared = 0
+        self._calls = {}
+        self._lock = Lock()
+
+    def __repr__(self):
+        return "SingleFlight [{0} run, {1} shared]".format(
+            self.leaders, self.shared)
+
+    def do(self, key, function):
+        r"""
+        Run function for key, or wait on its in-flight run.
+
+        :param key: Call identity, e.g. the request URL.
+        :type  key: str
+        :param function: Zero argument callable.
+        :type  function: callable
+        :return: The function's result.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = Future()
+                self.leaders += 1
+            else:
+                self.shared += 1
+        if not leader:
+            return call.result()
+
+        try:
+            result = function()
+        except BaseException as error:
+            call.set_exception(error)
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+
+class AsyncSingleFlight(object):
+
+    r"""
+    asyncio single-flight call coalescing, for use within one event
+    loop. See :class:`SingleFlight <.SingleFlight>`.
+    """
+
+    def __init__(self):
+        self.leaders = 0
+        self.shared = 0
+        self._calls = {}
+
+    def __repr__(self):
+        return "AsyncSingleFlight [{0} run, {1} shared]".format(
+            self.leaders, self.shared)
+
+    async def do(self, key, coroutine_function):
+        r"""
+        Await coroutine_function() for key, or its in-flight run.
+
+        :param key: Call identity, e.g. the request URL.
+        :type  key: str
+        :param coroutine_function: Zero argument coroutine function.
+        :type  coroutine_function: callable
+        :return: The coroutine's result.
+        """
+        task = self._calls.get(key)
+        if task is None:
+            self.leaders += 1
+            task = self._calls[key] = asyncio.ensure_future(
+                coroutine_function())
+
+            def forget(done):
+                if self._calls.get(key) is done:
+                    del self._calls[key]
+            task.add_done_callback(forget)
+        else:
+            self.shared += 1
+        # Shielded so a cancelled waiter does not cancel the call
+        # other waiters share.
+        return await asyncio.shield(task)
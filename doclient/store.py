@@ -0,0 +1,321 @@
+#! coding=utf-8
+"""
+DigitalOcean APIv2 inventory store module.
+Persists hydrated inventories (droplets, account information and
+SSH keys) and catalogs to a local SQLite database, so new processes
+start warm from a timestamped snapshot instead of the API.
+"""
+__author__ = "Sriram Velamur <sriram.velamur@gmail.com>"
+__all__ = ("InventoryStore", "StoredCatalogCache")
+
+import sys
+sys.dont_write_bytecode = True
+import sqlite3
+from hashlib import sha256
+from os.path import expanduser
+from threading import Lock
+from time import time
+
+from .cache import CatalogCache
+from .codec import dumps, loads
+from .errors import InvalidArgumentError
+
+
+class InventoryStore(object):
+
+    r"""
+    SQLite backed store of per-account inventory snapshots.
+
+    Each account's resources (account, ssh_keys, droplets and
+    catalog entries) are stored as one JSON payload per resource,
+    along with the time they were fetched; droplets and catalog
+    entries take one row each, so that writing one through does not
+    rewrite the others. Snapshots older than
+    max_age are not served, which bounds how stale a warm started
+    client can be. Accounts are keyed by a hash of their token and
+    API endpoint; tokens themselves are never written. One store
+    may be shared by several clients, threads and processes.
+
+    Usage::
+
+        store = InventoryStore("~/.cache/doclient.db", max_age=900)
+        client = DOClient(token, store=store)
+        client.inventory_age        # seconds since the snapshot
+        client.reconcile()          # refresh it from the API
+
+    :property path: Database file path.
+    :property max_age: Maximum snapshot age in seconds served.
+    """
+
+    schema = """
+        CREATE TABLE IF NOT EXISTS inventory (
+            account TEXT NOT NULL,
+            resource TEXT NOT NULL,
+            stored_at REAL NOT NULL,
+            payload TEXT NOT NULL,
+            PRIMARY KEY (account, resource)
+        )
+    """
+
+    # Seconds a writer waits on another process's write lock.
+    busy_timeout = 5.0
+
+    def __init__(self, path, max_age=3600):
+        r"""
+        Inventory store init
+
+        :param path: Database file path, created if missing.
+                     ":memory:" keeps the store in process memory.
+        :type  path: str
+        :param max_age: Maximum age in seconds of snapshots served.
+                        Defaults to an hour.
+        :type  max_age: int, float
+        """
+        if not isinstance(path, str) or not path:
+            raise InvalidArgumentError("path needs to be a file path")
+        if not isinstance(max_age, (int, float)) or max_age < 0:
+            raise InvalidArgumentError(
+                "max_age needs to be a non-negative number of seconds")
+        self.path = path = expanduser(path)
+        self.max_age = max_age
+        self._lock = Lock()
+        self._connection = sqlite3.connect(
+            path, timeout=self.busy_timeout, check_same_thread=False,
+            isolation_level=None)
+        if path != ":memory:":
+            self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(self.schema)
+
+    def __repr__(self):
+        return "InventoryStore [{0}]".format(self.path)
+
+    @staticmethod
+    def account_key(token, api_base):
+        r"""
+        Store key of the account a token authenticates, on an API
+        endpoint.
+
+        :param token: API token.
+        :type  token: str
+        :param api_base: Base URL of the APIv2 endpoint.
+        :type  api_base: str
+        :rtype: str
+        """
+        return sha256("{0}\n{1}".format(api_base, token).encode(
+            "utf-8")).hexdigest()
+
+    def get(self, account, resource, max_age=None):
+        r"""
+        Stored payload of an account's resource, if fresh.
+
+        :param account: Account key.
+        :type  account: str
+        :param resource: Resource name.
+        :type  resource: str
+        :param max_age: Maximum age in seconds, overriding the
+                        store's.
+        :type  max_age: int, float
+        :return: Time the payload was stored and the payload.
+        :rtype: tuple (float, object), NoneType
+        """
+        max_age = self.max_age if max_age is None else max_age
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT stored_at, payload FROM inventory "
+                "WHERE account = ? AND resource = ?",
+                (account, resource)).fetchone()
+        if row is None or time() - row[0] > max_age:
+            return None
+        return row[0], loads(row[1])
+
+    def get_many(self, account, prefix, max_age=None):
+        r"""
+        Fresh stored payloads of an account's resources starting
+        with a prefix.
+
+        :param account: Account key.
+        :type  account: str
+        :param prefix: Resource name prefix.
+        :type  prefix: str
+        :param max_age: Maximum age in seconds, overriding the
+                        store's.
+        :type  max_age: int, float
+        :return: Resource names mapped to (stored_at, payload).
+        :rtype: dict
+        """
+        max_age = self.max_age if max_age is None else max_age
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT resource, stored_at, payload FROM inventory "
+                "WHERE account = ? AND resource >= ? AND resource < ? "
+                "AND stored_at >= ? ORDER BY stored_at",
+                (account, prefix, prefix + "\uffff",
+                 time() - max_age)).fetchall()
+        return dict((resource, (stored_at, loads(payload)))
+                    for resource, stored_at, payload in rows)
+
+    def set(self, account, resource, payload, stored_at=None):
+        r"""
+        Store a JSON serialisable payload for an account's resource.
+
+        :param account: Account key.
+        :type  account: str
+        :param resource: Resource name.
+        :type  resource: str
+        :param payload: Payload to store.
+        :type  payload: list, dict
+        :param stored_at: Time the payload was fetched. Defaults to
+                          now.
+        :type  stored_at: float
+        """
+        self.set_many(account, {resource: (
+            time() if stored_at is None else stored_at, payload)})
+
+    def set_many(self, account, entries, drop=(), prefix=None):
+        r"""
+        Store several payloads of an account in one transaction.
+
+        :param account: Account key.
+        :type  account: str
+        :param entries: Resource names mapped to (stored_at, payload).
+        :type  entries: dict
+        :param drop: Resources of the account to drop in the same
+                     transaction.
+        :type  drop: iterable (str)
+        :param prefix: Also drop the account's other resources
+                       starting with this prefix.
+        :type  prefix: str
+        """
+        rows = [(account, resource, stored_at, dumps(payload))
+                for resource, (stored_at, payload) in entries.items()]
+        with self._lock:
+            connection = self._connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                if prefix is not None:
+                    connection.execute(
+                        "DELETE FROM inventory WHERE account = ? "
+                        "AND resource >= ? AND resource < ?",
+                        (account, prefix, prefix + "\uffff"))
+                connection.executemany(
+                    "DELETE FROM inventory WHERE account = ? "
+                    "AND resource = ?",
+                    [(account, resource) for resource in drop])
+                connection.executemany(
+                    "INSERT OR REPLACE INTO inventory "
+                    "(account, resource, stored_at, payload) "
+                    "VALUES (?, ?, ?, ?)", rows)
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def invalidate(self, account=None, resource=None):
+        r"""
+        Drop stored payloads.
+
+        :param account: Account to drop payloads of. Drops every
+                        account's when omitted.
+        :type  account: str
+        :param resource: Resource to drop. Drops every resource when
+                         omitted.
+        :type  resource: str
+        """
+        clauses, arguments = [], []
+        if account is not None:
+            clauses.append("account = ?")
+            arguments.append(account)
+        if resource is not None:
+            clauses.append("resource = ?")
+            arguments.append(resource)
+        query = "DELETE FROM inventory"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        with self._lock:
+            self._connection.execute(query, arguments)
+
+    def catalog_cache(self, account, ttls=None, max_entries=256):
+        r"""
+        Catalog cache for an account, written through to the store.
+
+        :param account: Account key.
+        :type  account: str
+        :param ttls: Per-resource TTLs in seconds, overriding the
+                     CatalogCache defaults.
+        :type  ttls: dict
+        :param max_entries: Maximum entries held.
+        :type  max_entries: int
+        :rtype: :class:`StoredCatalogCache <.StoredCatalogCache>`
+        """
+        return StoredCatalogCache(self, account, ttls=ttls,
+                                  max_entries=max_entries)
+
+    def close(self):
+        r"""
+        Close the database connection.
+
+        :rtype: NoneType
+        """
+        with self._lock:
+            self._connection.close()
+
+
+class StoredCatalogCache(CatalogCache):
+
+    r"""
+    Catalog cache written through to an :class:`InventoryStore
+    <.InventoryStore>` instead of a JSON file. Entries are stored
+    as the account's "catalog:<key>" resources and keep their own
+    TTLs, independent of the store's max_age.
+    """
+
+    prefix = "catalog:"
+
+    def __init__(self, store, account, ttls=None, max_entries=256):
+        r"""
+        Stored catalog cache init
+
+        :param store: Backing store.
+        :type  store: :class:`InventoryStore <.InventoryStore>`
+        :param account: Account key.
+        :type  account: str
+        :param ttls: Per-resource TTLs in seconds.
+        :type  ttls: dict
+        :param max_entries: Maximum entries held.
+        :type  max_entries: int
+        """
+        self.store = store
+        self.account = account
+        self._stored = set()
+        super(StoredCatalogCache, self).__init__(
+            ttls=ttls, max_entries=max_entries)
+        self._load()
+
+    def _load(self):
+        r"""Load fresh entries from the store"""
+        entries = self.store.get_many(
+            self.account, self.prefix,
+            max_age=max(list(self.ttls.values()) + [self.default_ttl]))
+        now = time()
+        for resource, (stored_at, value) in entries.items():
+            key = resource[len(self.prefix):]
+            if now - stored_at <= self.ttl(key):
+                self._entries[key] = (stored_at, value)
+        self._stored = set(self._entries)
+
+    def _save(self, key=None):
+        r"""
+        Write the set key through to the store, dropping the rows of
+        keys evicted, expired or invalidated since the last write.
+
+        :param key: Key just set, if the write follows a set.
+        :type  key: str
+        """
+        entries = {}
+        if key in self._entries:
+            entries[self.prefix + key] = self._entries[key]
+        dropped = self._stored.difference(self._entries)
+        self.store.set_many(
+            self.account, entries,
+            drop=[self.prefix + key for key in dropped])
+        self._stored = set(self._entries)
@@ -0,0 +1,873 @@
+#! coding=utf-8
+"""
+DigitalOcean APIv2 testing module.
+Provides a local stand-in APIv2 server serving synthetic accounts,
+for use with offline tests and benchmarks.
+"""
+__author__ = "Sriram Velamur <sriram.velamur@gmail.com>"
+__all__ = ("FakeAPIServer", "make_droplet")
+
+import sys
+sys.dont_write_bytecode = True
+from hashlib import md5
+from io import BytesIO
+from json import dumps, loads
+from re import compile as re_compile
+from argparse import ArgumentParser
+from threading import Event, Lock, Thread
+from time import monotonic, sleep, time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import urlsplit, parse_qs
+
+from requests.structures import CaseInsensitiveDict
+
+from .transport import InMemoryTransport, Response
+
+
+def make_droplet(index, name=None, region="nyc3", size="s-1vcpu-1gb",
+                 image="ubuntu-18-04-x64"):
+    r"""
+    Build a synthetic APIv2 droplet payload.
+
+    :param index: Droplet sequence number. Used to derive the ID
+                  and addresses.
+    :type  index: int
+    :rtype: dict
+    """
+    droplet_id = 100000 + index
+    octets = (index >> 8) & 0xff, index & 0xff
+    return {
+        "id": droplet_id,
+        "name": name or "droplet-{0:05d}".format(index),
+        "memory": 1024,
+        "vcpus": 1,
+        "disk": 25,
+        "locked": False,
+        "status": "active",
+        "created_at": "2019-07-23T06:14:38Z",
+        "kernel": None,
+        "features": ["virtio"],
+        "backup_ids": [],
+        "snapshot_ids": [],
+        "image": {"id": 50000, "slug": image, "name": image,
+                  "distribution": "Ubuntu"},
+        "size_slug": size,
+        "size": {"slug": size, "memory": 1024, "vcpus": 1,
+                 "disk": 25, "transfer": 1.0,
+                 "price_monthly": 5.0, "price_hourly": 0.00744},
+        "region": {"slug": region, "name": region.upper(),
+                   "available": True, "features": [],
+                   "sizes": [size]},
+        "networks": {
+            "v4": [{
+                "ip_address": "10.{0}.{1}.2".format(*octets),
+                "netmask": "255.255.0.0",
+                "gateway": "10.{0}.0.1".format(octets[0]),
+                "type": "private"
+            }, {
+                "ip_address": "203.0.{0}.{1}".format(*octets),
+                "netmask": "255.255.240.0",
+                "gateway": "203.0.0.1",
+                "type": "public"
+            }],
+            "v6": [{
+                "ip_address": "2604:a880::{0:x}".format(droplet_id),
+                "netmask": 64,
+                "gateway": "2604:a880::1",
+                "type": "public"
+            }]
+        },
+        "tags": ["fleet", "pool-{0}".format(index % 4)],
+        "volume_ids": []
+    }
+
+
+class FakeAPIServer(object):
+
+    r"""
+    Local stand-in for the DigitalOcean APIv2, serving a synthetic
+    account over HTTP/1.1 keep-alive connections.
+
+    Usage::
+
+        with FakeAPIServer(droplets=250) as server:
+            client = DOClient(server.token, api_base=server.api_base)
+
+    :property api_base: Base URL to point a client at.
+    :property requests: Log of (method, path) tuples served.
+    :property latency: Seconds to wait before answering a request.
+    :property throttle: Number of upcoming requests to reject with
+                        HTTP 429 and a Retry-After of retry_after.
+    :property not_modified: Number of GETs answered with HTTP 304.
+                            GET replies carry an ETag of their body.
+    :property neighbours: Groups of IDs of droplets sharing a
+                          physical server.
+    """
+
+    token = "fake-token"
+
+    def __init__(self, droplets=0, images=0, snapshots=0, domains=0,
+                 ssh_keys=0, latency=0.0, max_per_page=200,
+                 rate_limit=5000, action_duration=0.0):
+        r"""
+        Local stand-in APIv2 server init
+
+        :param droplets: Number of synthetic droplets in the account.
+        :type  droplets: int
+        :param images: Number of synthetic images.
+        :type  images: int
+        :param snapshots: Number of snapshots per droplet.
+        :type  snapshots: int
+        :param domains: Number of synthetic domains.
+        :type  domains: int
+        :param ssh_keys: Number of SSH keys in the account.
+        :type  ssh_keys: int
+        :param latency: Seconds to wait before answering a request.
+        :type  latency: float
+        :param max_per_page: Page size cap, mirroring the API's.
+        :type  max_per_page: int
+        :param rate_limit: Requests allowed per hour, reported
+                           through the ratelimit-* headers.
+        :type  rate_limit: int
+        :param action_duration: Seconds an action stays in-progress.
+        :type  action_duration: float
+        """
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.throttle = 0
+        self.retry_after = 0
+        self.not_modified = 0
+        self.max_per_page = max_per_page
+        self.requests = []
+        self.peers = set()
+        self.lock = Lock()
+        self._next_id = 100000 + droplets
+        self._next_action = 1
+        self.actions = {}
+        self.action_duration = action_duration
+        self.droplets = [make_droplet(idx) for idx in range(droplets)]
+        self.neighbours = []
+        self.images = [{
+            "id": 50000 + idx,
+            "name": "image-{0}".format(idx),
+            "slug": "image-{0}".format(idx),
+            "distribution": "Ubuntu",
+            "public": True,
+            "regions": ["nyc3", "ams3"],
+            "min_disk_size": 20,
+            "type": "snapshot"
+        } for idx in range(images)]
+        self.sizes = [{
+            "slug": slug, "memory": memory, "vcpus": vcpus,
+            "disk": disk, "transfer": 1.0, "price_monthly": price,
+            "price_hourly": round(price / 672.0, 5),
+            "regions": ["nyc3", "ams3"], "available": True
+        } for slug, memory, vcpus, disk, price in (
+            ("s-1vcpu-1gb", 1024, 1, 25, 5.0),
+            ("s-1vcpu-2gb", 2048, 1, 50, 10.0),
+            ("s-2vcpu-4gb", 4096, 2, 80, 20.0),
+        )]
+        self.regions = [{
+            "slug": slug, "name": name, "available": True,
+            "features": ["private_networking", "ipv6"],
+            "sizes": [size["slug"] for size in self.sizes]
+        } for slug, name in (("nyc3", "New York 3"),
+                             ("ams3", "Amsterdam 3"))]
+        self.kernels = [{
+            "id": 7000 + idx,
+            "name": "Ubuntu 18.04 x64 vmlinuz-4.15.0-{0}".format(idx),
+            "version": "4.15.0-{0}-generic".format(idx)
+        } for idx in range(3)]
+        self.snapshots_per_droplet = snapshots
+        self.ssh_keys = [{
+            "id": 900 + idx,
+            "name": "key-{0}".format(idx),
+            "fingerprint": ":".join(
+                ["{0:02x}".format((idx + offset) % 256)
+                 for offset in range(16)]),
+            "public_key": "ssh-rsa AAAA{0} key-{0}".format(idx)
+        } for idx in range(ssh_keys)]
+        self.domains = []
+        self.domain_records = {}
+        self._next_record = 1
+        for idx in range(domains):
+            self.add_domain("example-{0}.com".format(idx),
+                            "203.0.113.{0}".format(idx % 256))
+        self.account = {
+            "uuid": "b6fr89dbf6d9156cace5f3c78dc9851d957381ef",
+            "email": "fake@example.com",
+            "email_verified": True,
+            "droplet_limit": 1000,
+            "status": "active"
+        }
+        self._server = None
+        self._thread = None
+
+    memory_api_base = "http://doclient.memory/v2/"
+
+    @property
+    def api_base(self):
+        r"""Base URL for the running server"""
+        host, port = self._server.server_address[:2]
+        return "http://{0}:{1}/v2/".format(host, port)
+
+    def start(self, host="127.0.0.1", port=0):
+        r"""
+        Start serving, on an ephemeral localhost port by default.
+
+        :param host: Address to listen on.
+        :type  host: str
+        :param port: Port to listen on.
+        :type  port: int
+        """
+        handler = type("FakeAPIHandler", (FakeAPIHandler,),
+                       {"api": self})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._thread = Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def transport(self):
+        r"""
+        Transport serving the stand-in API in-process, without
+        sockets or server threads, for measuring client-side cost
+        alone. Needs no start(); point clients at memory_api_base.
+
+        :rtype: :class:`InMemoryTransport
+                <doclient.transport.InMemoryTransport>`
+        """
+        handler = type("InMemoryAPIHandler", (InMemoryAPIHandler,),
+                       {"api": self})
+
+        def handle(request):
+            """Run the request through the stand-in handler"""
+            handler_instance = handler(request)
+            handler_instance.dispatch(request.method)
+            return handler_instance.response
+        return InMemoryTransport(handler=handle)
+
+    def stop(self):
+        r"""Stop serving and close the listening socket"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def reset_log(self):
+        r"""Clear the request log and the HTTP 304 counter"""
+        with self.lock:
+            del self.requests[:]
+            self.not_modified = 0
+
+    def count(self, method=None, path=None):
+        r"""
+        Number of served requests matching a method and path prefix.
+
+        :rtype: int
+        """
+        return len([
+            1 for _method, _path in list(self.requests)
+            if (method is None or method == _method) and
+            (path is None or _path.startswith(path))
+        ])
+
+    def add_domain(self, name, ip_address=None):
+        r"""
+        Add a domain with the SOA and NS records DigitalOcean
+        creates, plus an apex A record for ip_address if given.
+        """
+        records = [{"type": "SOA", "name": "@", "data": "1800",
+                    "ttl": 1800}]
+        records.extend({"type": "NS", "name": "@",
+                        "data": "ns{0}.digitalocean.com".format(idx),
+                        "ttl": 1800} for idx in (1, 2, 3))
+        if ip_address:
+            records.append({"type": "A", "name": "@",
+                            "data": ip_address, "ttl": 1800})
+        domain = {"name": name, "ttl": 1800, "zone_file": None}
+        with self.lock:
+            self.domains.append(domain)
+            self.domain_records[name] = []
+        for record in records:
+            self.add_record(name, record)
+        return domain
+
+    def add_record(self, name, record):
+        r"""Add a record to a domain, assigning it an ID"""
+        fields = ("type", "name", "data", "priority", "port", "ttl",
+                  "weight", "flags", "tag")
+        with self.lock:
+            record = dict((field, record.get(field)) for field in fields)
+            record["id"] = self._next_record
+            self._next_record += 1
+            self.domain_records[name].append(record)
+        return record
+
+    def zone_file(self, name):
+        r"""BIND zone file rendering of a domain's records"""
+        lines = ["$ORIGIN {0}.".format(name), "$TTL 1800"]
+        for record in list(self.domain_records.get(name, ())):
+            rtype, data = record["type"], record["data"]
+            target = data if data == "@" else data + "."
+            if rtype == "SOA":
+                rdata = "ns1.digitalocean.com. hostmaster.{0}. " \
+                    "1 10800 3600 604800 {1}".format(name, data)
+            elif rtype in ("CNAME", "NS"):
+                rdata = target
+            elif rtype == "MX":
+                rdata = "{0} {1}".format(record["priority"], target)
+            elif rtype == "SRV":
+                rdata = "{0} {1} {2} {3}".format(
+                    record["priority"], record["weight"],
+                    record["port"], target)
+            elif rtype == "CAA":
+                rdata = '{0} {1} "{2}"'.format(
+                    record["flags"], record["tag"], data)
+            elif rtype == "TXT":
+                rdata = '"{0}"'.format(data.replace('"', '\\"'))
+            else:
+                rdata = data
+            lines.append("{0} {1} IN {2} {3}".format(
+                record["name"], record["ttl"], rtype, rdata))
+        return "\n".join(lines) + "\n"
+
+    def new_action(self, action_type, resource_id=None, data=None):
+        r"""
+        Record a synthetic APIv2 action. Actions complete once
+        action_duration seconds have passed, applying their effect
+        to the droplet acted upon.
+        """
+        with self.lock:
+            action_id = self._next_action
+            self._next_action += 1
+            action = {
+                "id": action_id,
+                "status": "in-progress",
+                "type": action_type,
+                "started_at": "2019-07-23T06:14:38Z",
+                "completed_at": None,
+                "resource_id": resource_id,
+                "resource_type": "droplet",
+                "region_slug": "nyc3"
+            }
+            self.actions[action_id] = (action, monotonic() +
+                                       self.action_duration, data or {})
+        return dict(action)
+
+    def get_action(self, action_id):
+        r"""Find an action payload by ID, settling it if due"""
+        with self.lock:
+            if action_id not in self.actions:
+                return None
+            action, done_at, data = self.actions[action_id]
+            if action["status"] == "in-progress" \
+                    and monotonic() >= done_at:
+                action["status"] = "completed"
+                action["completed_at"] = "2019-07-23T06:15:38Z"
+                self._apply_action(action, data)
+            return dict(action)
+
+    def _apply_action(self, action, data):
+        r"""Apply a completed action's effect to its droplet"""
+        droplet = self.find_droplet(action["resource_id"])
+        if droplet is None:
+            return
+        status = {"power_off": "off", "shutdown": "off",
+                  "power_on": "active", "power_cycle": "active",
+                  "reboot": "active"}.get(action["type"])
+        if status:
+            droplet["status"] = status
+        if action["type"] == "resize" and data.get("size"):
+            droplet["size_slug"] = data["size"]
+            droplet["size"] = dict(droplet["size"], slug=data["size"])
+
+    def create_droplet(self, name, region, size, image):
+        r"""Add a synthetic droplet to the account"""
+        with self.lock:
+            index = self._next_id - 100000
+            self._next_id += 1
+            droplet = make_droplet(index, name=name, region=region,
+                                   size=size, image=image)
+            droplet["status"] = "new"
+            self.droplets.append(droplet)
+        return droplet
+
+    def find_droplet(self, droplet_id):
+        r"""Find a droplet payload by ID"""
+        for droplet in self.droplets:
+            if droplet["id"] == droplet_id:
+                return droplet
+        return None
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+
+    """Threaded HTTP server for the stand-in API"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class FakeAPIHandler(BaseHTTPRequestHandler):
+
+    """Request handler for the stand-in APIv2 server"""
+
+    protocol_version = "HTTP/1.1"
+    api = None
+
+    routes = (
+        ("GET", re_compile(r"^account$"), "account"),
+        ("GET", re_compile(r"^account/keys$"), "ssh_keys"),
+        ("GET", re_compile(r"^droplets$"), "droplets"),
+        ("POST", re_compile(r"^droplets$"), "droplet_create"),
+        ("POST", re_compile(r"^droplets/actions$"), "tag_action"),
+        ("GET", re_compile(r"^droplets/(\d+)$"), "droplet"),
+        ("DELETE", re_compile(r"^droplets/(\d+)$"), "droplet_delete"),
+        ("POST", re_compile(r"^droplets/(\d+)/actions$"),
+         "droplet_action"),
+        ("GET", re_compile(r"^droplets/(\d+)/snapshots$"), "snapshots"),
+        ("GET", re_compile(r"^droplets/(\d+)/kernels$"), "kernels"),
+        ("GET", re_compile(r"^droplets/(\d+)/neighbors$"),
+         "neighbours"),
+        ("GET", re_compile(r"^reports/droplet_neighbors_ids$"),
+         "neighbour_report"),
+        ("GET", re_compile(r"^actions$"), "actions"),
+        ("GET", re_compile(r"^actions/(\d+)$"), "action"),
+        ("GET", re_compile(r"^images$"), "images"),
+        ("GET", re_compile(r"^sizes$"), "sizes"),
+        ("GET", re_compile(r"^regions$"), "regions"),
+        ("GET", re_compile(r"^domains$"), "domains"),
+        ("POST", re_compile(r"^domains$"), "domain_create"),
+        ("GET", re_compile(r"^domains/([^/]+)$"), "domain"),
+        ("DELETE", re_compile(r"^domains/([^/]+)$"), "domain_delete"),
+        ("GET", re_compile(r"^domains/([^/]+)/records$"),
+         "domain_records"),
+        ("POST", re_compile(r"^domains/([^/]+)/records$"),
+         "domain_record_create"),
+        ("PUT", re_compile(r"^domains/([^/]+)/records/(\d+)$"),
+         "domain_record_update"),
+        ("DELETE", re_compile(r"^domains/([^/]+)/records/(\d+)$"),
+         "domain_record_delete"),
+    )
+
+    def log_message(self, *args):
+        """Silence per-request logging"""
+        pass
+
+    def do_GET(self):
+        """GET handler"""
+        self.dispatch("GET")
+
+    def do_POST(self):
+        """POST handler"""
+        self.dispatch("POST")
+
+    def do_DELETE(self):
+        """DELETE handler"""
+        self.dispatch("DELETE")
+
+    def do_PUT(self):
+        """PUT handler"""
+        self.dispatch("PUT")
+
+    def dispatch(self, method):
+        """Route a request to its handler method"""
+        parts = urlsplit(self.path)
+        path = parts.path.rstrip("/")
+        if path.startswith("/v2/"):
+            path = path[len("/v2/"):]
+        self.query = parse_qs(parts.query)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        self.payload = loads(body.decode("utf-8")) if body else {}
+
+        api = self.api
+        with api.lock:
+            api.requests.append((method, path))
+            api.peers.add(self.client_address)
+        if api.latency:
+            sleep(api.latency)
+
+        with api.lock:
+            throttled = api.throttle > 0
+            api.throttle -= 1 if throttled else 0
+        if throttled:
+            return self.reply(429, {
+                "id": "too_many_requests",
+                "message": "API Rate limit exceeded."},
+                {"Retry-After": str(api.retry_after)})
+
+        expected = "Bearer {0}".format(api.token)
+        if self.headers.get("Authorization") != expected:
+            return self.reply(401, {
+                "id": "unauthorized",
+                "message": "Unable to authenticate you."})
+
+        for _method, pattern, name in self.routes:
+            match = pattern.match(path)
+            if match and _method == method:
+                return getattr(self, "handle_" + name)(*match.groups())
+        return self.reply(404, {
+            "id": "not_found",
+            "message": "The resource you were accessing "
+                       "could not be found."})
+
+    def reply(self, status, payload=None, headers=None):
+        """Write a JSON response"""
+        body = dumps(payload).encode("utf-8") \
+            if payload is not None else b""
+        api = self.api
+        headers = dict(headers or {})
+        if self.command == "GET" and status == 200:
+            etag = '"{0}"'.format(md5(body).hexdigest())
+            headers["ETag"] = etag
+            if self.headers.get("If-None-Match") == etag:
+                status, body = 304, b""
+                with api.lock:
+                    api.not_modified += 1
+        remaining = max(api.rate_limit - len(api.requests), 0)
+        headers = dict({
+            "Content-Type": "application/json",
+            "Content-Length": str(len(body)),
+            "ratelimit-limit": str(api.rate_limit),
+            "ratelimit-remaining": str(remaining),
+            "ratelimit-reset": str(int(time()) + 3600),
+        }, **headers)
+        self.respond(status, headers, body)
+
+    def respond(self, status, headers, body):
+        """Write a response to the connection"""
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def api_root(self):
+        """Base URL of the API, for listing page links"""
+        return "http://{0}:{1}/v2/".format(
+            self.server.server_address[0], self.server.server_address[1])
+
+    def paginate(self, key, items):
+        """Reply with one page of a listing"""
+        page = int(self.query.get("page", ["1"])[0])
+        per_page = int(self.query.get("per_page", ["20"])[0])
+        per_page = max(1, min(per_page, self.api.max_per_page))
+        total = len(items)
+        last = max(1, (total + per_page - 1) // per_page)
+        start = (page - 1) * per_page
+        base = self.api_root() + urlsplit(self.path).path[len("/v2/"):]
+        pages = {}
+        if page < last:
+            pages["next"] = "{0}?page={1}&per_page={2}".format(
+                base, page + 1, per_page)
+            pages["last"] = "{0}?page={1}&per_page={2}".format(
+                base, last, per_page)
+        if page > 1:
+            pages["first"] = "{0}?page=1&per_page={1}".format(
+                base, per_page)
+            pages["prev"] = "{0}?page={1}&per_page={2}".format(
+                base, page - 1, per_page)
+        return self.reply(200, {
+            key: items[start:start + per_page],
+            "links": {"pages": pages},
+            "meta": {"total": total}
+        })
+
+    def handle_account(self):
+        """Account information"""
+        return self.reply(200, {"account": self.api.account})
+
+    def handle_ssh_keys(self):
+        """Account SSH keys listing"""
+        return self.paginate("ssh_keys", list(self.api.ssh_keys))
+
+    def handle_droplets(self):
+        """Droplets listing"""
+        return self.paginate("droplets", list(self.api.droplets))
+
+    def handle_droplet(self, droplet_id):
+        """Single droplet"""
+        droplet = self.api.find_droplet(int(droplet_id))
+        if droplet is None:
+            return self.reply(404, {"id": "not_found",
+                                    "message": "Droplet not found"})
+        return self.reply(200, {"droplet": droplet})
+
+    def handle_droplet_create(self):
+        """Droplet create, single and multiple"""
+        payload = self.payload
+        names = payload.get("names") or [payload.get("name")]
+        droplets = [
+            self.api.create_droplet(name, payload.get("region"),
+                                    payload.get("size"),
+                                    payload.get("image"))
+            for name in names
+        ]
+        actions = [{"id": 0, "rel": "create", "href": ""}]
+        if "names" in payload:
+            return self.reply(202, {"droplets": droplets,
+                                    "links": {"actions": actions}})
+        return self.reply(202, {"droplet": droplets[0],
+                                "links": {"actions": actions}})
+
+    def handle_droplet_delete(self, droplet_id):
+        """Droplet delete"""
+        droplet = self.api.find_droplet(int(droplet_id))
+        if droplet is None:
+            return self.reply(404, {"id": "not_found",
+                                    "message": "Droplet not found"})
+        with self.api.lock:
+            self.api.droplets.remove(droplet)
+        return self.reply(204)
+
+    def handle_droplet_action(self, droplet_id):
+        """Droplet action create"""
+        droplet = self.api.find_droplet(int(droplet_id))
+        if droplet is None:
+            return self.reply(404, {"id": "not_found",
+                                    "message": "Droplet not found"})
+        action_type = self.payload.get("type")
+        if action_type in ("power_off", "shutdown") \
+                and droplet["status"] == "off":
+            return self.reply(422, {
+                "id": "unprocessable_entity",
+                "message": "Droplet is already powered off."})
+        return self.reply(201, {"action": self.api.new_action(
+            action_type, droplet["id"], self.payload)})
+
+    def handle_tag_action(self):
+        """Tagged droplets action create"""
+        tag_name = self.query.get("tag_name", [""])[0]
+        droplets = [droplet for droplet in list(self.api.droplets)
+                    if tag_name in droplet["tags"]]
+        action_type = self.payload.get("type")
+        return self.reply(201, {"actions": [
+            self.api.new_action(action_type, droplet["id"], self.payload)
+            for droplet in droplets]})
+
+    def handle_actions(self):
+        """Actions listing, newest first"""
+        api = self.api
+        actions = [api.get_action(action_id) for action_id in
+                   sorted(api.actions, reverse=True)]
+        return self.paginate("actions", actions)
+
+    def handle_action(self, action_id):
+        """Single action"""
+        action = self.api.get_action(int(action_id))
+        if action is None:
+            return self.reply(404, {"id": "not_found",
+                                    "message": "Action not found"})
+        return self.reply(200, {"action": action})
+
+    def handle_snapshots(self, droplet_id):
+        """Droplet snapshots listing"""
+        droplet_id = int(droplet_id)
+        snapshots = [{
+            "id": droplet_id * 100 + idx,
+            "name": "snapshot-{0}-{1}".format(droplet_id, idx),
+            "distribution": "Ubuntu",
+            "public": False,
+            "regions": ["nyc3"],
+            "created_at": "2019-07-23T06:14:38Z",
+            "type": "snapshot",
+            "min_disk_size": 25
+        } for idx in range(self.api.snapshots_per_droplet)]
+        return self.paginate("snapshots", snapshots)
+
+    def handle_kernels(self, droplet_id):
+        """Droplet kernels listing"""
+        return self.paginate("kernels", list(self.api.kernels))
+
+    def handle_neighbours(self, droplet_id):
+        """Droplet neighbours listing"""
+        droplet_id = int(droplet_id)
+        group = next((group for group in self.api.neighbours
+                      if droplet_id in group), ())
+        return self.reply(200, {"droplets": [
+            self.api.find_droplet(neighbour) for neighbour in group
+            if neighbour != droplet_id]})
+
+    def handle_neighbour_report(self):
+        """Account-wide droplet neighbours report"""
+        return self.reply(200, {"neighbor_ids": [
+            list(group) for group in self.api.neighbours]})
+
+    def handle_images(self):
+        """Images listing"""
+        return self.paginate("images", list(self.api.images))
+
+    def handle_sizes(self):
+        """Sizes listing"""
+        return self.paginate("sizes", list(self.api.sizes))
+
+    def handle_regions(self):
+        """Regions listing"""
+        return self.paginate("regions", list(self.api.regions))
+
+    def handle_domains(self):
+        """Domains listing"""
+        return self.paginate("domains", [
+            dict(domain, zone_file=self.api.zone_file(domain["name"]))
+            for domain in list(self.api.domains)])
+
+    def find_domain(self, name):
+        """Find a domain payload by name"""
+        for domain in self.api.domains:
+            if domain["name"] == name:
+                return domain
+        return None
+
+    def handle_domain_create(self):
+        """Domain create"""
+        name = self.payload.get("name")
+        if not name or self.find_domain(name) is not None:
+            return self.reply(422, {"id": "unprocessable_entity",
+                                    "message": "Invalid domain name"})
+        domain = self.api.add_domain(name, self.payload.get("ip_address"))
+        return self.reply(201, {"domain": domain})
+
+    def handle_domain(self, name):
+        """Single domain"""
+        domain = self.find_domain(name)
+        if domain is None:
+            return self.reply(404, {"id": "not_found",
+                                    "message": "Domain not found"})
+        return self.reply(200, {"domain": dict(
+            domain, zone_file=self.api.zone_file(name))})
+
+    def handle_domain_delete(self, name):
+        """Domain delete"""
+        domain = self.find_domain(name)
+        if domain is None:
+            return self.reply(404, {"id": "not_found",
+                                    "message": "Domain not found"})
+        with self.api.lock:
+            self.api.domains.remove(domain)
+            self.api.domain_records.pop(name, None)
+        return self.reply(204)
+
+    def find_record(self, name, record_id):
+        """Find a domain record payload by domain name and ID"""
+        for record in self.api.domain_records.get(name, ()):
+            if record["id"] == int(record_id):
+                return record
+        return None
+
+    def handle_domain_records(self, name):
+        """Domain records listing"""
+        if self.find_domain(name) is None:
+            return self.reply(404, {"id": "not_found",
+                                    "message": "Domain not found"})
+        return self.paginate("domain_records",
+                             list(self.api.domain_records[name]))
+
+    def handle_domain_record_create(self, name):
+        """Domain record create"""
+        if self.find_domain(name) is None:
+            return self.reply(404, {"id": "not_found",
+                                    "message": "Domain not found"})
+        payload = self.payload
+        if not all(payload.get(field) for field in
+                   ("type", "name", "data")) or payload["type"] == "SOA":
+            return self.reply(422, {"id": "unprocessable_entity",
+                                    "message": "Invalid domain record"})
+        record = self.api.add_record(name, dict(
+            payload, ttl=payload.get("ttl") or 1800))
+        return self.reply(201, {"domain_record": record})
+
+    def handle_domain_record_update(self, name, record_id):
+        """Domain record update"""
+        record = self.find_record(name, record_id)
+        if record is None:
+            return self.reply(404, {"id": "not_found",
+                                    "message": "Record not found"})
+        with self.api.lock:
+            record.update((field, value) for field, value in
+                          self.payload.items()
+                          if field in record and field != "id")
+        return self.reply(200, {"domain_record": record})
+
+    def handle_domain_record_delete(self, name, record_id):
+        """Domain record delete"""
+        record = self.find_record(name, record_id)
+        if record is None:
+            return self.reply(404, {"id": "not_found",
+                                    "message": "Record not found"})
+        with self.api.lock:
+            self.api.domain_records[name].remove(record)
+        return self.reply(204)
+
+
+class InMemoryAPIHandler(FakeAPIHandler):
+
+    """Stand-in APIv2 request handler run without a connection"""
+
+    def __init__(self, request):
+        parts = urlsplit(request.url)
+        body = request.body or b""
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.command = request.method
+        self.path = parts.path + ("?" + parts.query if parts.query else "")
+        self.headers = CaseInsensitiveDict(
+            request.headers, **{"Content-Length": str(len(body))})
+        self.rfile = BytesIO(body)
+        self.client_address = ("memory", 0)
+        self.root = "{0}://{1}/v2/".format(parts.scheme, parts.netloc)
+        self.response = None
+
+    def respond(self, status, headers, body):
+        """Keep the response for the transport"""
+        self.response = Response(status, headers, body)
+
+    def api_root(self):
+        """Base URL of the API, for listing page links"""
+        return self.root
+
+
+def main():
+    r"""
+    Serve a synthetic account until interrupted, for pointing
+    clients and benchmarks in other processes at::
+
+        python -m doclient.testing --droplets 5000 --latency 0.05
+    """
+    parser = ArgumentParser(description="Local stand-in DigitalOcean "
+                                        "APIv2 server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    for name in ("droplets", "images", "snapshots", "domains",
+                 "ssh_keys"):
+        parser.add_argument("--" + name.replace("_", "-"), type=int,
+                            default=0)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--action-duration", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = FakeAPIServer(
+        droplets=args.droplets, images=args.images,
+        snapshots=args.snapshots, domains=args.domains,
+        ssh_keys=args.ssh_keys, latency=args.latency,
+        action_duration=args.action_duration).start(args.host, args.port)
+    print("Serving {0} with token {1}".format(server.api_base,
+                                              server.token))
+    try:
+        Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,405 @@
+#! coding=utf-8
+"""
+DigitalOcean APIv2 transport module.
+Provides the HTTP transports DOClient places its requests through:
+requests (the default), raw urllib3, and an in-memory transport
+serving canned or generated responses without any network I/O.
+"""
+__author__ = "Sriram Velamur <sriram.velamur@gmail.com>"
+__all__ = ("InMemoryTransport", "RequestsTransport", "Response",
+           "Transport", "Urllib3Transport")
+
+import sys
+sys.dont_write_bytecode = True
+from re import compile as re_compile
+from threading import Lock
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+try:
+    import urllib3
+except ImportError:  # pragma: no cover - installed along with requests
+    urllib3 = None
+
+from .codec import dumps, loads
+from .errors import InvalidArgumentError, NetworkError
+
+
+_network_error = "".join([
+    "No available network to ",
+    "connect to DigitalOcean API."
+])
+
+
+class Transport(object):
+
+    r"""
+    HTTP transport interface.
+
+    A transport places one HTTP request and returns a response
+    exposing status_code, headers (a case-insensitive mapping),
+    content, json(), iter_content(chunk_size) and close(), as
+    requests.Response does. Connection failures raise
+    :class:`NetworkError <doclient.errors.NetworkError>`.
+    """
+
+    def request(self, method, url, headers, data=None, stream=False):
+        r"""
+        Place an HTTP request.
+
+        :param method: HTTP method.
+        :type  method: str
+        :param url: Absolute request URL.
+        :type  url: str
+        :param headers: Request headers.
+        :type  headers: dict
+        :param data: Encoded request body.
+        :type  data: str, bytes
+        :param stream: Leave the body unread until iterated.
+        :type  stream: bool
+        :rtype: :class:`Response <.Response>`, requests.Response
+        """
+        raise NotImplementedError
+
+    def close(self):
+        r"""Release the transport's connections"""
+        pass
+
+
+class Response(object):
+
+    r"""
+    Transport response, a minimal stand-in for requests.Response.
+
+    :property status_code: HTTP status.
+    :property headers: Case-insensitive response headers.
+    :property content: Response body, read on first access for
+                       streamed responses.
+    """
+
+    __slots__ = ("status_code", "headers", "_content", "_raw")
+
+    def __init__(self, status_code, headers=None, content=b"", raw=None):
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers or {})
+        self._content = content if raw is None else None
+        self._raw = raw
+
+    def __repr__(self):
+        return "<Response [{0}]>".format(self.status_code)
+
+    @property
+    def content(self):
+        """Response body property"""
+        if self._content is None:
+            self._content = self._raw.read()
+            self.close()
+        return self._content
+
+    def json(self):
+        r"""Decoded JSON body"""
+        return loads(self.content)
+
+    def iter_content(self, chunk_size=1):
+        r"""
+        Iterate over the body in chunks.
+
+        :param chunk_size: Maximum chunk size in bytes.
+        :type  chunk_size: int
+        :rtype: generator (bytes)
+        """
+        if self._content is None:
+            for chunk in self._raw.stream(chunk_size):
+                yield chunk
+            return
+        content = self._content
+        for start in range(0, len(content), chunk_size):
+            yield content[start:start + chunk_size]
+
+    def close(self):
+        r"""Release the connection of a streamed response"""
+        raw, self._raw = self._raw, None
+        if raw is not None:
+            raw.release_conn()
+
+
+class RequestsTransport(Transport):
+
+    r"""
+    Transport placing requests on a pooled requests.Session.
+
+    :property session: The pooled session. Created on first use and
+                       after close, unless it was passed in.
+    """
+
+    def __init__(self, session=None, pool_size=10, keep_alive=True):
+        r"""
+        requests transport init
+
+        :param session: Session to place requests on, left open by
+                        close. Defaults to a new pooled session.
+        :type  session: requests.Session
+        :param pool_size: Maximum number of pooled connections.
+        :type  pool_size: int
+        :param keep_alive: Reuse connections across requests.
+        :type  keep_alive: bool
+        """
+        if session is not None \
+                and not isinstance(session, requests.Session):
+            raise InvalidArgumentError(
+                "session needs to be a requests.Session instance")
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self.shared = session is not None
+        self._session = session
+
+    def __repr__(self):
+        return "RequestsTransport [{0} connections]".format(self.pool_size)
+
+    @staticmethod
+    def make_session(pool_size=10, keep_alive=True):
+        r"""
+        Create a pooled HTTP session.
+
+        :param pool_size: Maximum number of pooled connections.
+        :type  pool_size: int
+        :param keep_alive: Reuse connections across requests.
+        :type  keep_alive: bool
+        :rtype: requests.Session
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        if not keep_alive:
+            session.headers["Connection"] = "close"
+        return session
+
+    @property
+    def session(self):
+        """Pooled session property"""
+        if self._session is None:
+            self._session = self.make_session(self.pool_size,
+                                              self.keep_alive)
+        return self._session
+
+    def request(self, method, url, headers, data=None, stream=False):
+        kwargs = {"method": method, "url": url, "headers": headers}
+        if data:
+            kwargs["data"] = data
+        if stream:
+            kwargs["stream"] = True
+        try:
+            return self.session.request(**kwargs)
+        except requests.exceptions.ConnectionError:
+            raise NetworkError(_network_error)
+
+    def close(self):
+        if self.shared:
+            return
+        session, self._session = self._session, None
+        if session is not None:
+            session.close()
+
+
+class Urllib3Transport(Transport):
+
+    r"""
+    Transport placing requests on a urllib3 PoolManager, skipping
+    the requests layer.
+    """
+
+    def __init__(self, pool_size=10, keep_alive=True, retries=False):
+        r"""
+        urllib3 transport init
+
+        :param pool_size: Maximum number of pooled connections per
+                          host.
+        :type  pool_size: int
+        :param keep_alive: Reuse connections across requests.
+        :type  keep_alive: bool
+        :param retries: urllib3 retry configuration. HTTP 429s are
+                        retried by the client, so defaults to none.
+        """
+        if urllib3 is None:
+            raise ImportError("Urllib3Transport requires urllib3")
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self.retries = retries
+        self._pool = None
+        self._lock = Lock()
+
+    def __repr__(self):
+        return "Urllib3Transport [{0} connections]".format(self.pool_size)
+
+    @property
+    def pool(self):
+        """Connection pool manager property"""
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = urllib3.PoolManager(
+                        maxsize=self.pool_size, block=False,
+                        retries=self.retries)
+        return self._pool
+
+    def request(self, method, url, headers, data=None, stream=False):
+        if not self.keep_alive:
+            headers = dict(headers, Connection="close")
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        try:
+            response = self.pool.urlopen(
+                method, url, body=data or None, headers=headers,
+                preload_content=not stream, redirect=False)
+        except urllib3.exceptions.HTTPError:
+            raise NetworkError(_network_error)
+        if stream:
+            return Response(response.status, response.headers,
+                            raw=response)
+        return Response(response.status, response.headers,
+                        response.data)
+
+    def close(self):
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.clear()
+
+
+class InMemoryTransport(Transport):
+
+    r"""
+    Zero-network transport serving canned or generated responses.
+
+    Routes match a method and a regular expression over the request
+    path, with the API base path (/v2/ by default) stripped. A route
+    serves a canned payload, encoded once when it is added, or calls
+    a function with the request to generate one. Requests no route
+    matches go to the fallback handler, or get HTTP 404.
+
+    Usage::
+
+        transport = InMemoryTransport()
+        transport.add("GET", "account", {"account": {"uuid": "u-1"}})
+        transport.add("GET", r"droplets/(\d+)", lambda request: (
+            200, {"droplet": {"id": int(request.groups[0])}}))
+        client = DOClient(token, transport=transport, lazy=True)
+
+    :property requests: Log of (method, path) tuples served.
+    """
+
+    def __init__(self, handler=None, base_path="/v2/"):
+        r"""
+        In-memory transport init
+
+        :param handler: Fallback called with a
+                        :class:`Request <.InMemoryTransport.Request>`,
+                        returning a Response or a (status, payload
+                        [, headers]) tuple.
+        :type  handler: callable
+        :param base_path: Path prefix stripped before route matching.
+        :type  base_path: str
+        """
+        self.handler = handler
+        self.base_path = base_path
+        self.routes = []
+        self.requests = []
+        self._lock = Lock()
+
+    def __repr__(self):
+        return "InMemoryTransport [{0} routes]".format(len(self.routes))
+
+    class Request(object):
+
+        """In-memory request passed to generating routes"""
+
+        __slots__ = ("method", "url", "path", "query", "headers", "body",
+                     "groups")
+
+        def __init__(self, method, url, path, query, headers, body):
+            self.method = method
+            self.url = url
+            self.path = path
+            self.query = query
+            self.headers = headers
+            self.body = body
+            self.groups = ()
+
+        def json(self):
+            r"""Decoded JSON request body, {} when empty"""
+            return loads(self.body) if self.body else {}
+
+    def add(self, method, path, payload=None, status=200, headers=None):
+        r"""
+        Add a route.
+
+        :param method: HTTP method.
+        :type  method: str
+        :param path: Regular expression matched against the whole
+                     request path, without the base path.
+        :type  path: str
+        :param payload: JSON payload to serve, or a function taking
+                        the request and returning a Response or a
+                        (status, payload[, headers]) tuple.
+        :type  payload: dict, list, callable
+        :param status: HTTP status of a canned payload.
+        :type  status: int
+        :param headers: Response headers of a canned payload.
+        :type  headers: dict
+        :return: The transport, for chaining.
+        :rtype: :class:`InMemoryTransport <.InMemoryTransport>`
+        """
+        if not callable(payload):
+            payload = self._canned(status, payload, headers)
+        self.routes.append((method.upper(), re_compile(path), payload))
+        return self
+
+    @staticmethod
+    def _canned(status, payload, headers):
+        r"""Route function serving a pre-encoded payload"""
+        content = dumps(payload).encode("utf-8") \
+            if payload is not None else b""
+        headers = dict(headers or {},
+                       **{"Content-Type": "application/json"})
+
+        def serve(request):
+            """Serve the canned payload"""
+            return Response(status, headers, content)
+        return serve
+
+    @staticmethod
+    def _response(result):
+        r"""Response for a route or handler result"""
+        if isinstance(result, Response):
+            return result
+        status, payload = result[0], result[1]
+        headers = result[2] if len(result) > 2 else None
+        content = payload if isinstance(payload, bytes) else \
+            dumps(payload).encode("utf-8") if payload is not None else b""
+        return Response(status, headers, content)
+
+    def request(self, method, url, headers, data=None, stream=False):
+        parts = urlsplit(url)
+        path = parts.path
+        if path.startswith(self.base_path):
+            path = path[len(self.base_path):]
+        path = path.rstrip("/")
+        with self._lock:
+            self.requests.append((method, path))
+        request = self.Request(method, url, path, parse_qs(parts.query),
+                               headers, data)
+        for route_method, pattern, serve in self.routes:
+            if route_method != method:
+                continue
+            match = pattern.fullmatch(path)
+            if match is not None:
+                request.groups = match.groups()
+                return self._response(serve(request))
+        if self.handler is not None:
+            return self._response(self.handler(request))
+        return Response(404, {"Content-Type": "application/json"},
+                        b'{"id": "not_found", "message": "The resource '
+                        b'you were accessing could not be found."}')
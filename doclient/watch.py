@@ -0,0 +1,392 @@
+#! coding=utf-8
+"""
+DigitalOcean APIv2 droplet watch module.
+Provides a change feed over a client's droplet inventory: one
+adaptive poller diffs inventory snapshots and fans typed events out
+to callbacks and iterators.
+"""
+__author__ = "Sriram Velamur <sriram.velamur@gmail.com>"
+__all__ = ("DropletEvent", "DropletWatcher")
+
+import sys
+sys.dont_write_bytecode = True
+from logging import getLogger
+from queue import Empty, Full, Queue
+from threading import Event, Lock, Thread
+
+from .codec import dumps
+from .errors import BaseError, InvalidArgumentError
+
+
+logger = getLogger(__name__)
+
+
+class DropletEvent(object):
+
+    r"""
+    One change to a droplet, passed to watchers' subscribers.
+
+    Event types:
+
+        added      the droplet appeared
+        removed    the droplet disappeared
+        status     its status changed, e.g. from new to active
+        addresses  its IPv4 or IPv6 addresses changed
+        changed    any other field changed
+
+    A droplet whose status and addresses both changed yields one
+    event of each type.
+
+    :property type: Event type.
+    :property droplet: Droplet after the change; for removed events,
+                       the droplet as last seen.
+    :property previous: Droplet before the change, None for added.
+    :property old: Previous status or addresses, for status and
+                   addresses events.
+    :property new: New status or addresses, for status and addresses
+                   events.
+    """
+
+    types = ("added", "removed", "status", "addresses", "changed")
+
+    __slots__ = ("type", "droplet", "previous", "old", "new")
+
+    def __init__(self, type, droplet, previous=None, old=None, new=None):
+        self.type = type
+        self.droplet = droplet
+        self.previous = previous
+        self.old = old
+        self.new = new
+
+    def __repr__(self):
+        if self.type in ("status", "addresses"):
+            return "DropletEvent {0} {1} [{2} -> {3}]".format(
+                self.type, self.droplet.id, self.old, self.new)
+        return "DropletEvent {0} {1}".format(self.type, self.droplet.id)
+
+
+def _addresses(payload):
+    r"""Sorted IP addresses of a droplet payload"""
+    networks = payload.get("networks") or {}
+    return tuple(sorted(
+        network.get("ip_address") for version in ("v4", "v6")
+        for network in networks.get(version) or ()
+        if network.get("ip_address")))
+
+
+class DropletWatcher(object):
+
+    r"""
+    Change feed over a client's droplet inventory.
+
+    One background poller refreshes the client's inventory and
+    diffs it against the previous snapshot by droplet ID, comparing
+    a content hash per droplet so that only droplets whose payload
+    changed are inspected further; payloads served unchanged from
+    the client's validator cache are skipped without hashing. The
+    resulting :class:`DropletEvent <.DropletEvent>` s are handed to
+    every subscriber, however many there are.
+
+    Polling is adaptive. It runs every busy_interval seconds while
+    work is in flight, i.e. after the client placed a droplet write
+    (create, delete or action), after a poll saw changes, or while
+    any droplet is still new, then backs off by backoff per quiet
+    poll up to idle_interval.
+
+    Usage::
+
+        watcher = client.watcher
+        watcher.subscribe(print, types=("status",))
+        for event in watcher.events(timeout=300):
+            ...
+
+    The poller starts with the first subscriber and stops after the
+    last one leaves. Exceptions raised by callbacks are logged and
+    otherwise ignored. Failed polls are logged and back off like
+    quiet ones; the poller keeps running.
+
+    :property interval: Seconds until the next poll.
+    :property errors: Consecutive failed polls.
+    """
+
+    busy_interval = 2.0
+    idle_interval = 30.0
+    backoff = 1.5
+    # Events queued per events() iterator before new ones are dropped.
+    max_queued = 1000
+
+    def __init__(self, client, busy_interval=None, idle_interval=None):
+        r"""
+        Droplet watcher init
+
+        :param client: Client whose inventory is watched.
+        :type  client: :class:`DOClient <doclient.client.DOClient>`
+        :param busy_interval: Seconds between polls while work is in
+                              flight. Defaults to 2.
+        :type  busy_interval: int, float
+        :param idle_interval: Longest interval between polls.
+                              Defaults to 30.
+        :type  idle_interval: int, float
+        """
+        for name, value in (("busy_interval", busy_interval),
+                            ("idle_interval", idle_interval)):
+            if value is None:
+                continue
+            if not isinstance(value, (int, float)) or value <= 0:
+                raise InvalidArgumentError(
+                    "{0} needs to be a positive number".format(name))
+            setattr(self, name, value)
+        if self.idle_interval < self.busy_interval:
+            raise InvalidArgumentError(
+                "idle_interval needs to be at least busy_interval")
+        self.client = client
+        self.interval = self.idle_interval
+        self.errors = 0
+        self._snapshot = None
+        self._subscribers = ()
+        self._lock = Lock()
+        self._poll_lock = Lock()
+        self._wake = Event()
+        self._stop = Event()
+        self._thread = None
+
+    def __repr__(self):
+        return "DropletWatcher [{0} subscribers]".format(
+            len(self._subscribers))
+
+    @property
+    def running(self):
+        r"""Whether the poller is running"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def subscribe(self, callback, types=None):
+        r"""
+        Call a callback with every event of the given types,
+        starting the poller if it is not running.
+
+        :param callback: Callable taking a DropletEvent.
+        :type  callback: callable
+        :param types: Event types to receive. Defaults to all.
+        :type  types: iterable (str)
+        :return: The callback, for :meth:`unsubscribe`.
+        :rtype: callable
+        """
+        if not callable(callback):
+            raise InvalidArgumentError("callback needs to be callable")
+        types = self._types(types)
+        with self._lock:
+            self._subscribers += ((callback, types),)
+            self._start()
+        return callback
+
+    def unsubscribe(self, callback):
+        r"""
+        Remove a subscribed callback, stopping the poller after the
+        last one.
+
+        :param callback: Subscribed callback.
+        :type  callback: callable
+        """
+        with self._lock:
+            self._subscribers = tuple(
+                subscriber for subscriber in self._subscribers
+                if subscriber[0] != callback)
+            if not self._subscribers:
+                self._halt()
+
+    @staticmethod
+    def _types(types):
+        r"""Validated event types, None for all"""
+        if types is None:
+            return None
+        types = frozenset(types)
+        unknown = types.difference(DropletEvent.types)
+        if unknown:
+            raise InvalidArgumentError(
+                "Unknown event types {0}. Use {1}".format(
+                    ", ".join(sorted(unknown)),
+                    ", ".join(DropletEvent.types)))
+        return types
+
+    def events(self, types=None, timeout=None):
+        r"""
+        Iterate over events as they happen. Events are queued from
+        the first next() on, up to max_queued of them; events arriving
+        while the queue is full are dropped. Close the iterator to
+        unsubscribe early.
+
+        :param types: Event types to receive. Defaults to all.
+        :type  types: iterable (str)
+        :param timeout: Stop after this many seconds without an
+                        event. Defaults to never.
+        :type  timeout: int, float
+        :rtype: generator (:class:`DropletEvent <.DropletEvent>`)
+        """
+        return self._iterate(self._types(types), timeout)
+
+    def _iterate(self, types, timeout):
+        r"""Subscribe a queue and yield its events until done"""
+        queue = Queue(self.max_queued)
+
+        def put(event):
+            """Queue an event, dropping it if the queue is full"""
+            try:
+                queue.put_nowait(event)
+            except Full:
+                logger.warning("Droplet watch iterator is %d events "
+                               "behind, dropping %r", queue.maxsize, event)
+
+        self.subscribe(put, types=types)
+        try:
+            while True:
+                try:
+                    yield queue.get(timeout=timeout)
+                except Empty:
+                    return
+        finally:
+            self.unsubscribe(put)
+
+    def poke(self):
+        r"""
+        Poll at the busy interval from now on, waking the poller
+        if it is waiting longer.
+        """
+        self.interval = self.busy_interval
+        self._wake.set()
+
+    def poll(self):
+        r"""
+        Refresh the inventory once, diff it against the previous
+        snapshot and deliver the resulting events. The first poll
+        without a loaded inventory only takes the snapshot.
+
+        :return: Events of the poll.
+        :rtype: list (:class:`DropletEvent <.DropletEvent>`)
+        """
+        with self._poll_lock:
+            if self._snapshot is None and \
+                    self.client._droplets is not None:
+                self._snapshot = self._take(self.client._droplets, {})
+            droplets = self.client.get_droplets()
+            snapshot = self._take(droplets, self._snapshot or {})
+            events = [] if self._snapshot is None else \
+                self._diff(self._snapshot, snapshot)
+            self._snapshot = snapshot
+
+            busy = bool(events) or any(
+                droplet.status == "new" for droplet in droplets)
+            self.interval = self.busy_interval if busy else min(
+                self.interval * self.backoff, self.idle_interval)
+        self._deliver(events)
+        return events
+
+    @staticmethod
+    def _take(droplets, previous):
+        r"""
+        Snapshot of droplets, mapping IDs to (droplet, payload,
+        content hash). Hashes are reused for unchanged payloads.
+        """
+        snapshot = {}
+        for droplet in droplets:
+            payload = droplet._extra
+            entry = previous.get(droplet.id)
+            if entry is not None and entry[1] is payload:
+                snapshot[droplet.id] = (droplet, payload, entry[2])
+            else:
+                snapshot[droplet.id] = (droplet, payload,
+                                        hash(dumps(payload)))
+        return snapshot
+
+    @staticmethod
+    def _diff(previous, current):
+        r"""Events turning one snapshot into another"""
+        events = []
+        for droplet_id, (droplet, payload, digest) in current.items():
+            entry = previous.get(droplet_id)
+            if entry is None:
+                events.append(DropletEvent("added", droplet))
+                continue
+            before, before_payload, before_digest = entry
+            if digest == before_digest:
+                continue
+            count = len(events)
+            status = payload.get("status")
+            if status != before_payload.get("status"):
+                events.append(DropletEvent(
+                    "status", droplet, before,
+                    before_payload.get("status"), status))
+            addresses = _addresses(payload)
+            if addresses != _addresses(before_payload):
+                events.append(DropletEvent(
+                    "addresses", droplet, before,
+                    _addresses(before_payload), addresses))
+            if len(events) == count:
+                events.append(DropletEvent("changed", droplet, before))
+        for droplet_id, (droplet, _, _) in previous.items():
+            if droplet_id not in current:
+                events.append(DropletEvent("removed", droplet, droplet))
+        return events
+
+    def _deliver(self, events):
+        r"""Hand events to the subscribers"""
+        subscribers = self._subscribers
+        for event in events:
+            for callback, types in subscribers:
+                if types is not None and event.type not in types:
+                    continue
+                try:
+                    callback(event)
+                except Exception:
+                    logger.exception("Droplet watch callback %r failed "
+                                     "on %r", callback, event)
+
+    def _on_response(self, request):
+        r"""Request hook switching to busy polling on droplet writes"""
+        if request.method != "GET" and \
+                request.endpoint.startswith("droplets"):
+            self.poke()
+
+    def _run(self, stop):
+        r"""Poller loop"""
+        while not stop.is_set():
+            try:
+                self.poll()
+                self.errors = 0
+            except (BaseError, Exception) as error:
+                self.errors += 1
+                self.interval = min(self.interval * self.backoff,
+                                    self.idle_interval)
+                logger.warning("Droplet watch poll failed: %s", error,
+                               exc_info=not isinstance(error, BaseError))
+            self._wake.clear()
+            self._wake.wait(self.interval)
+
+    def _start(self):
+        r"""Start the poller unless it is running"""
+        if self.running and not self._stop.is_set():
+            return
+        self._stop = Event()
+        self.client.hooks.register("after_response", self._on_response)
+        self._thread = Thread(target=self._run, args=(self._stop,),
+                              name="doclient-droplet-watcher",
+                              daemon=True)
+        self._thread.start()
+
+    def _halt(self):
+        r"""Signal the poller to stop after its current poll"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        self.client.hooks.unregister("after_response", self._on_response)
+        self._thread = None
+
+    def close(self):
+        r"""
+        Drop every subscriber and stop the poller.
+
+        :rtype: NoneType
+        """
+        with self._lock:
+            self._subscribers = ()
+            self._halt()
@@ -12,5 +12,6 @@ setup(
     url='https://github.com/techiev2/doclient',
     packages=['doclient',],
     license='Creative Commons Attribution-Noncommercial-Share Alike license',
-    install_requires=['requests','pyopenssl>=0.13','ndg-httpsclient','pyasn1']
+    install_requires=['requests','pyopenssl>=0.13','ndg-httpsclient','pyasn1'],
+    extras_require={'async': ['aiohttp>=3.6'], 'fast': ['orjson>=3']}
 )
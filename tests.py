@@ -2,12 +2,34 @@
 
 import sys
 sys.dont_write_bytecode = True
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from json import dumps, loads
 from os import environ
+from os.path import join
+from re import compile as re_compile
+from tempfile import TemporaryDirectory
+from time import sleep, time
 import unittest
 
-from doclient import DOClient, Droplet
-from doclient.errors import InvalidArgumentError, APIAuthError, APIError
-from doclient.meta import Domain, Snapshot
+from doclient import AsyncDOClient, DOClient, DOClientPool, Droplet
+from doclient.aio import aiohttp
+from doclient import codec
+from doclient.cache import CatalogCache
+from doclient.codec import ArrayStreamDecoder
+from doclient.dns import DomainRecord, RecordIndex, diff_records, \
+    parse_zone_file
+from doclient.metrics import MetricsCollector
+from doclient.errors import InvalidArgumentError, APIAuthError, APIError, \
+    RateLimitError
+from doclient.meta import Domain, DropletNetwork, Snapshot
+from doclient.store import InventoryStore
+from doclient.testing import FakeAPIServer, make_droplet
+from doclient.transport import InMemoryTransport, Response, \
+    Urllib3Transport
+from doclient.watch import DropletEvent
+from doclient.ratelimit import RateLimiter
+from doclient.user import DOUser
 
 
 NoneType = type(None)
@@ -36,6 +58,18 @@ class DOClientTest(unittest.TestCase):
             for droplet in self.client.droplets:
                 self.assertIsInstance(droplet, Droplet)
 
+    def test_session_pool(self):
+        """Test pooled session reuse and explicit close"""
+        if self.client:
+            session = self.client.session
+            self.client.get_ssh_keys()
+            self.assertIs(self.client.session, session)
+            self.client.close()
+            self.assertIsNot(self.client.session, session)
+            with self.client as client:
+                self.assertIs(client, self.client)
+            self.assertIsNone(self.client.transport._session)
+
     def test_invalid_client(self):
         """Test invalid DOClient instance initalization"""
         try:
@@ -79,5 +113,1032 @@ class DOClientTest(unittest.TestCase):
             for neighbour in neighbours:
                 self.assertIsInstance(neighbour, Droplet)
 
+
+class ModelTest(unittest.TestCase):
+
+    """Tests for schema-declared models"""
+
+    def test_slotted_models(self):
+        """Test models keep fields in slots and extras in one dict"""
+        snapshot = Snapshot(id=7, type="snapshot", name="nightly",
+                            size_gigabytes=1.5)
+        self.assertFalse(hasattr(snapshot, "__dict__"))
+        self.assertEqual((snapshot.id, snapshot.type), (7, "snapshot"))
+        self.assertEqual(snapshot.size_gigabytes, 1.5)
+        self.assertIsNone(snapshot.missing)
+        self.assertIsNone(Domain().name)
+        self.assertEqual(snapshot.as_dict()["size_gigabytes"], 1.5)
+        self.assertRaises(AttributeError, setattr, snapshot, "id", 8)
+
+    def test_model_as_dict(self):
+        """Test as_dict returns fields and extra payload keys"""
+        network = DropletNetwork(ip_address="10.0.0.2", is_public=True,
+                                 type="private")
+        self.assertEqual(network.as_dict(), {
+            "network_type": None, "ip_address": "10.0.0.2",
+            "netmask": None, "gateway": None, "is_public": True,
+            "type": "private"})
+        self.assertEqual(loads(Snapshot(id=1).as_json())["id"], 1)
+
+    def test_lazy_droplet(self):
+        """Test droplets wrap their payload and decode on access"""
+        payload = make_droplet(3)
+        droplet = Droplet.from_payload(payload)
+        self.assertIs(droplet.as_dict()["networks"], payload["networks"])
+        self.assertEqual((droplet.id, droplet.status), (100003, "active"))
+        self.assertEqual(droplet.tags, ["fleet", "pool-3"])
+        self.assertIsNone(droplet._networks)
+        self.assertEqual(droplet.ipv4_ip,
+                         payload["networks"]["v4"][1]["ip_address"])
+        self.assertIs(droplet.networks, droplet.networks)
+        self.assertEqual(droplet.size.slug, payload["size_slug"])
+        self.assertEqual(droplet.region.slug, payload["region"]["slug"])
+        self.assertEqual(droplet.image.id, payload["image"]["id"])
+        self.assertIs(droplet.image, droplet.image)
+
+    def test_zone_file(self):
+        """Test zone files parse into a relative record index"""
+        zone = "\n".join([
+            "$ORIGIN example.com.",
+            "$TTL 3600",
+            "@ IN SOA ns1.digitalocean.com. hostmaster.example.com. (",
+            "        1 10800 3600 604800 1800 ) ; serial and timers",
+            "@ 1800 IN A 203.0.113.1",
+            "        IN MX 10 mail",
+            "www IN CNAME @",
+            "api.example.com. 300 IN A 203.0.113.2",
+            '@ IN TXT "v=spf1 include:_spf.example.net" " ~all"',
+            "_sip._tcp IN SRV 10 5 5060 sip.example.net.",
+            '@ IN CAA 0 issue "letsencrypt.org"',
+        ])
+        records = RecordIndex(parse_zone_file(zone, "example.com"))
+        self.assertEqual(len(records), 8)
+        self.assertEqual([r.type for r in records.find(name="@")],
+                         ["SOA", "A", "MX", "TXT", "CAA"])
+        mx = records.find(type="mx")[0]
+        self.assertEqual((mx.priority, mx.data, mx.ttl),
+                         (10, "mail.example.com", 3600))
+        self.assertEqual(records.find(name="www")[0].data, "@")
+        self.assertEqual(records.find(name="api")[0].ttl, 300)
+        self.assertEqual(records.find(type="TXT")[0].data,
+                         "v=spf1 include:_spf.example.net ~all")
+        srv = records.find(name="_sip._tcp")[0]
+        self.assertEqual((srv.weight, srv.port, srv.data),
+                         (5, 5060, "sip.example.net"))
+        self.assertEqual(records.find(type="CAA")[0].tag, "issue")
+        self.assertEqual(Domain(name="example.com", zone_file=zone)
+                         .records.find(name="api")[0].data, "203.0.113.2")
+        for record in ("@ IN CAA 0 issue", "@ IN MX 10",
+                       "_sip._tcp IN SRV 10 5 5060", "@ IN A"):
+            with self.assertRaisesRegex(InvalidArgumentError, "line 13"):
+                parse_zone_file(zone + "\n; broken\n" + record,
+                                "example.com")
+        with self.assertRaisesRegex(InvalidArgumentError, "line 12"):
+            parse_zone_file(zone + "\n@ IN MX (\n ten mail )",
+                            "example.com")
+
+    def test_record_diff(self):
+        """Test record diffs place the fewest writes"""
+        existing = [DomainRecord(id=idx + 1, **record) for idx, record in
+                    enumerate([
+                        {"type": "A", "name": "@", "data": "10.0.0.1",
+                         "ttl": 1800},
+                        {"type": "A", "name": "www", "data": "10.0.0.2",
+                         "ttl": 1800},
+                        {"type": "A", "name": "old", "data": "10.0.0.3",
+                         "ttl": 1800},
+                        {"type": "NS", "name": "@",
+                         "data": "ns1.digitalocean.com", "ttl": 1800}])]
+        desired = [DomainRecord.coerce(record) for record in [
+            {"type": "a", "name": "@", "data": "10.0.0.1"},
+            {"type": "A", "name": "www", "data": "10.0.0.9"},
+            {"type": "A", "name": "api", "data": "10.0.0.4", "ttl": 60}]]
+        creates, updates, deletes = diff_records(existing, desired)
+        self.assertEqual([r.name for r in creates], ["api"])
+        self.assertEqual([(c.id, r.data) for c, r in updates],
+                         [(2, "10.0.0.9")])
+        self.assertEqual([r.id for r in deletes], [3])
+        self.assertEqual(diff_records(existing, existing[:3]),
+                         ([], [], []))
+        existing.append(DomainRecord(id=5, type="CNAME", name="docs",
+                                     data="www", ttl=1800))
+        self.assertEqual(diff_records(existing, existing, types=["A"]),
+                         ([], [], []))
+        self.assertEqual(diff_records(existing[:3], existing,
+                                      types=["a"]), ([], [], []))
+
+
+class CodecTest(unittest.TestCase):
+
+    """Tests for the JSON backend and incremental listing decoder"""
+
+    def test_stream_decoder(self):
+        """Test listing items decode across arbitrary chunk splits"""
+        body = dumps({"droplets": [make_droplet(idx) for idx in range(3)],
+                      "links": {}, "meta": {"total": 3}}).encode("utf-8")
+        decoder = ArrayStreamDecoder("droplets")
+        items = []
+        for start in range(0, len(body), 7):
+            items.extend(decoder.feed(body[start:start + 7]))
+        self.assertEqual(len(items), 3)
+        items.extend(decoder.close())
+        self.assertEqual([item["id"] for item in items],
+                         [100000, 100001, 100002])
+        self.assertEqual(decoder.rest, {"links": {}, "meta": {"total": 3}})
+        decoder = ArrayStreamDecoder("droplets")
+        decoder.feed(body[:-5])
+        self.assertRaises(ValueError, decoder.close)
+
+    def test_backends(self):
+        """Test switching JSON backends"""
+        try:
+            codec.set_backend("json")
+            self.assertEqual(codec.backend, "json")
+            self.assertEqual(codec.loads(b'{"a": [1]}'), {"a": [1]})
+            user = DOUser(uuid="u-1", email="a@example.com")
+            self.assertEqual(loads(user.as_json())["uuid"], "u-1")
+        finally:
+            codec.set_backend()
+
+
+class OfflineDOClientTest(unittest.TestCase):
+
+    """Tests for DigitalOcean client class against a local stand-in API"""
+
+    server = None
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeAPIServer(droplets=250, images=130,
+                                   snapshots=3, ssh_keys=2).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.client = DOClient(self.server.token,
+                               api_base=self.server.api_base)
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_full_pagination(self):
+        """Test list methods return every page of a listing"""
+        self.assertEqual(len(self.client.droplets), 250)
+        ids = [droplet.id for droplet in self.client.droplets]
+        self.assertEqual(ids, sorted(set(ids)))
+        self.assertEqual(len(self.client.get_images()), 130)
+        self.assertEqual(len(self.client.get_droplet_kernels(100000)), 3)
+        self.assertEqual(len(self.client.get_droplet_snapshots(100000)), 3)
+
+    def test_iterators(self):
+        """Test streaming iterators yield in page order"""
+        serial = [d.id for d in self.client.iter_droplets(concurrency=1)]
+        parallel = [d.id for d in self.client.iter_droplets(concurrency=8)]
+        self.assertEqual(serial, parallel)
+        droplets = self.client.iter_droplets()
+        self.assertIsInstance(next(droplets), Droplet)
+        droplets.close()
+
+    def test_lazy_client(self):
+        """Test lazy client defers start-up calls to first access"""
+        before = len(self.server.requests)
+        client = DOClient(self.server.token, lazy=True,
+                          api_base=self.server.api_base)
+        self.assertEqual(len(self.server.requests), before)
+        self.assertEqual(len(client.droplets), 250)
+        self.assertEqual(client.user.droplet_count, 250)
+        self.assertEqual(len(client.ssh_keys), 2)
+        self.assertEqual(client.id, self.client.id)
+        client.close()
+
+    def test_eager_client(self):
+        """Test eager client init loads account state"""
+        self.assertEqual(self.client.user.droplet_count, 250)
+        self.assertEqual(len(self.client.ssh_keys), 2)
+
+    def test_rate_limit_retry(self):
+        """Test 429 replies are retried after Retry-After"""
+        self.server.throttle = 2
+        self.client.rate_limiter.backoff_base = 0.01
+        before = self.server.count(path="account")
+        self.assertEqual(self.client.get_user_information().uuid,
+                         self.client.id)
+        self.assertEqual(self.server.count(path="account") - before, 3)
+        self.assertEqual(self.client.api_calls_left,
+                         self.server.rate_limit - len(self.server.requests))
+
+    def test_rate_limiter(self):
+        """Test token bucket pacing and server budget tracking"""
+        limiter = RateLimiter(rate=100, burst=2)
+        delays = [limiter.reserve() for _ in range(3)]
+        self.assertEqual(delays[:2], [0.0, 0.0])
+        self.assertAlmostEqual(delays[2], 0.01, places=3)
+        limiter = RateLimiter()
+        limiter.update({"ratelimit-remaining": "0",
+                        "ratelimit-reset": str(time() + 30)})
+        self.assertGreater(limiter.reserve(), 29)
+        self.assertGreaterEqual(limiter.backoff(0, "2"), 2)
+
+        limiter = RateLimiter(rate=10, burst=1)
+        limiter.update({"ratelimit-limit": "5000",
+                        "ratelimit-remaining": "100",
+                        "ratelimit-reset": str(time() + 100)})
+        self.assertAlmostEqual(limiter.rate, 1.0, places=2)
+        limiter.reserve()
+        self.assertAlmostEqual(limiter.reserve(), 1.0, places=1)
+        limiter.update({"ratelimit-remaining": "5000",
+                        "ratelimit-reset": str(time() + 100)})
+        self.assertEqual(limiter.rate, 10)
+
+        client = DOClient("token", lazy=True,
+                          rate_limiter=RateLimiter(max_wait=1))
+        client.rate_limiter.update({"ratelimit-remaining": "0",
+                                    "ratelimit-reset": str(time() + 30)})
+        tokens = client.rate_limiter.tokens
+        with self.assertRaises(RateLimitError):
+            client.reserve_request()
+        self.assertAlmostEqual(client.rate_limiter.tokens, tokens, places=1)
+
+    def test_wait_all_batches_polling(self):
+        """Test waiting on many actions polls the action listing"""
+        self.server.action_duration = 0.05
+        self.client.action_poll_interval = 0.02
+        actions = [self.client.poweroff_droplet(100010 + idx)["action"]
+                   for idx in range(6)]
+        before = self.server.count("GET", "actions")
+        self.client.wait_all(actions, timeout=5)
+        self.assertTrue(all(action.status == "completed"
+                            for action in actions))
+        self.assertLess(self.server.count("GET", "actions") - before, 6)
+        self.assertEqual(self.server.find_droplet(100010)["status"], "off")
+        self.server.action_duration = 0.0
+
+    def test_resize_follows_actions(self):
+        """Test resize chains power off, resize and power on"""
+        self.client.action_poll_interval = 0.01
+        droplet = self.client.get_droplet(100020)
+        resized = droplet.resize("s-2vcpu-4gb", timeout=5)
+        payload = self.server.find_droplet(100020)
+        self.assertEqual(payload["size_slug"], "s-2vcpu-4gb")
+        self.assertEqual(resized.size_slug, "s-2vcpu-4gb")
+        self.assertIs(self.client.get_droplet(100020), resized)
+        types = [action[0]["type"] for action in
+                 self.server.actions.values()
+                 if action[0]["resource_id"] == 100020]
+        self.assertEqual(types, ["power_off", "resize", "power_on"])
+
+        self.server.find_droplet(100030)["status"] = "off"
+        stale = Droplet.from_payload(dict(
+            self.server.find_droplet(100030), status="active"),
+            self.client)
+        known = set(self.server.actions)
+        stale.resize("s-2vcpu-4gb", timeout=5)
+        types = [action[0]["type"] for action_id, action in
+                 self.server.actions.items() if action_id not in known]
+        self.assertEqual(types, ["resize", "power_on"])
+
+    def test_catalog_cache(self):
+        """Test catalogs are fetched once and validated locally"""
+        before = self.server.count("GET", "sizes")
+        sizes = self.client.get_sizes()
+        self.assertEqual([size.slug for size in self.client.get_sizes()],
+                         [size.slug for size in sizes])
+        self.client.validate_size("s-1vcpu-1gb")
+        self.client.validate_region("ams3", "s-2vcpu-4gb")
+        self.assertEqual(self.server.count("GET", "sizes") - before, 1)
+        self.assertEqual(self.client.validate_image(50000).id, 50000)
+        self.assertRaises(InvalidArgumentError,
+                          self.client.validate_size, "512mb")
+        self.assertRaises(InvalidArgumentError,
+                          self.client.get_droplet(100021).resize, "512mb")
+        self.assertEqual(self.server.find_droplet(100021)["status"],
+                         "active")
+        self.client.invalidate_catalog("sizes")
+        self.client.get_sizes()
+        self.assertEqual(self.server.count("GET", "sizes") - before, 2)
+
+    def test_catalog_cache_expiry(self):
+        """Test catalog cache TTL expiry, LRU eviction and warm start"""
+        cache = CatalogCache(ttls={"images": 0}, max_entries=2)
+        cache.set("images", [1])
+        sleep(0.01)
+        self.assertIsNone(cache.get("images"))
+        for key in ("sizes", "regions", "kernels:1"):
+            cache.set(key, [key])
+        self.assertIsNone(cache.get("sizes"))
+        self.assertEqual(cache.get("kernels:1"), ["kernels:1"])
+        with TemporaryDirectory() as directory:
+            path = join(directory, "catalog.json")
+            CatalogCache(path=path).set("sizes", [{"slug": "s-1"}])
+            warm = CatalogCache(path=path)
+            self.assertEqual(warm.get("sizes"), [{"slug": "s-1"}])
+            client = DOClient(self.server.token, lazy=True,
+                              api_base=self.server.api_base,
+                              catalog_cache=warm)
+            before = self.server.count("GET", "sizes")
+            self.assertEqual(client.validate_size("s-1").slug, "s-1")
+            self.assertEqual(self.server.count("GET", "sizes"), before)
+            client.close()
+
+    def test_conditional_requests(self):
+        """Test unchanged GETs are revalidated and served from store"""
+        validators = self.client.validator_cache
+        before, misses = self.server.not_modified, validators.misses
+        droplets = self.client.get_droplets()
+        self.assertEqual(len(droplets), 250)
+        self.assertEqual(self.server.not_modified - before, 3)
+        self.assertEqual(validators.misses, misses)
+        self.client.action_poll_interval = 0.01
+        self.client.wait_for_action(
+            self.client.poweroff_droplet(100030)["action"], timeout=5)
+        hits, misses = validators.hits, validators.misses
+        self.client.get_droplets()
+        self.assertEqual(validators.hits - hits, 2)
+        self.assertEqual(validators.misses - misses, 1)
+
+    def test_streamed_listing(self):
+        """Test incrementally decoded listings match paged ones"""
+        streamed = list(self.client.iter_droplets(stream=True))
+        self.assertEqual([droplet.id for droplet in streamed],
+                         [droplet.id for droplet in self.client.droplets])
+        self.assertEqual(len(list(self.client.iter_images(stream=True))),
+                         130)
+
+    def test_request_hooks(self):
+        """Test hooks see templated endpoints and metrics aggregate"""
+        events = []
+        self.client.hooks.register("before_request", events.append)
+        metrics = MetricsCollector().attach(self.client)
+        self.client.poweroff_droplet(100040)
+        self.client.get_droplet_snapshots(100040)
+        self.client.api_request("droplets/1/crash")
+        self.client.max_retries, self.server.throttle = 0, 1
+        self.assertRaises(RateLimitError, self.client.api_request,
+                          "domains/example.com")
+        self.assertEqual([(event.method, event.endpoint)
+                          for event in events], [
+            ("POST", "droplets/{id}/actions"),
+            ("GET", "droplets/{id}/snapshots"),
+            ("GET", "droplets/{id}/crash"),
+            ("GET", "domains/{name}")])
+        snapshot = metrics.snapshot()
+        actions = snapshot["POST droplets/{id}/actions"]
+        self.assertEqual((actions["count"], actions["errors"],
+                          actions["statuses"]), (1, 0, {201: 1}))
+        self.assertGreater(actions["bytes"], 0)
+        self.assertEqual(snapshot["GET droplets/{id}/crash"]["error_rate"],
+                         1.0)
+        self.assertEqual(snapshot["GET domains/{name}"]["errors"], 1)
+        text = metrics.prometheus()
+        self.assertIn('doclient_requests_total{method="POST",'
+                      'endpoint="droplets/{id}/actions",status="201"} 1',
+                      text)
+        self.assertIn('endpoint="droplets/{id}/snapshots",le="+Inf"} 1',
+                      text)
+        metrics.detach(self.client)
+        self.client.hooks.unregister("before_request", events.append)
+        self.assertFalse(self.client.hooks)
+
+    def test_coalesced_gets(self):
+        """Test concurrent identical GETs share one request"""
+        before = self.server.count("GET", "sizes")
+        self.server.latency = 0.1
+        try:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                results = list(executor.map(
+                    lambda _: self.client.get_sizes(), range(8)))
+        finally:
+            self.server.latency = 0.0
+        self.assertEqual(self.server.count("GET", "sizes") - before, 1)
+        self.assertEqual(self.client.single_flight.shared, 7)
+        self.assertTrue(all(len(sizes) == 3 for sizes in results))
+
+    def test_droplet_lookups(self):
+        """Test indexed ID, prefix, substring and pattern lookups"""
+        client = self.client
+        self.assertEqual(client.get_droplet("100007").name, "droplet-00007")
+        self.assertIsNone(client.get_droplet(1))
+        self.assertEqual(client.filter_droplets(100007),
+                         client.filter_droplets("100007"))
+        self.assertEqual(len(client.filter_droplets("droplet-001")), 100)
+        self.assertEqual(len(client.filter_droplets("t-0012", prefix=True)), 0)
+        self.assertEqual(len(client.filter_droplets("droplet-0012",
+                                                    prefix=True)), 10)
+        self.assertEqual([d.name for d in client.filter_droplets("t-00249")],
+                         ["droplet-00249"])
+        self.assertEqual(len(client.filter_droplets("002[0-4]9$")), 5)
+        self.assertEqual(client.filter_droplets("nomatch"), [])
+        self.assertRaises(InvalidArgumentError,
+                          client.filter_droplets, "(")
+
+    def test_incremental_inventory(self):
+        """Test create and delete write through to the inventory"""
+        client = self.client
+        before = self.server.count("GET", "droplets")
+        created = [client.create_droplet("web-{0}".format(idx), "nyc3",
+                                         "s-1vcpu-1gb", "ubuntu")
+                   for idx in range(3)]
+        created += client.create_droplets(["db-1", "db-2"], "nyc3",
+                                          "s-1vcpu-1gb", "ubuntu")
+        self.assertEqual(len(client.droplets), 255)
+        self.assertEqual(client.user.droplet_count, 255)
+        self.assertIs(client.get_droplet(created[0].id), created[0])
+        self.assertEqual(client.filter_droplets("db-", prefix=True),
+                         created[3:])
+        for droplet in created:
+            self.assertIn("Successfully", droplet.delete()["message"])
+        self.assertEqual(self.server.count("GET", "droplets"), before)
+        self.assertEqual(len(client.droplets), 250)
+        self.assertEqual(client.filter_droplets("web-"), [])
+        self.assertEqual(len(client.refresh()), 250)
+
+    def test_bulk_power_actions(self):
+        """Test tag-scoped and concurrent ID list power actions"""
+        before = self.server.count("POST")
+        result = self.client.poweroff_tag("pool-1")
+        self.assertEqual(self.server.count("POST") - before, 1)
+        self.assertEqual(len(result["actions"]), 63)
+        results = self.client.powercycle_droplets([100001, 1, 100002],
+                                                  concurrency=3)
+        self.assertEqual(results[0]["action"].resource_id, 100001)
+        self.assertEqual(results[1], {"message": "Droplet not found"})
+        self.assertEqual(results[2]["action"].type, "power_cycle")
+
+    def test_session_reuse(self):
+        """Test requests share pooled keep-alive connections"""
+        self.server.peers.clear()
+        for _ in range(5):
+            self.client.get_ssh_keys()
+        self.assertEqual(len(self.server.peers), 1)
+
+    def test_domain_manager(self):
+        """Test client-bound domain managers under concurrent use"""
+        other = FakeAPIServer(domains=3)
+        other.token = "other-token"
+        with other.start():
+            second = DOClient(other.token, api_base=other.api_base,
+                              lazy=True)
+            clients = [self.client, second] * 10
+            executor = ThreadPoolExecutor(max_workers=8)
+            try:
+                counts = list(executor.map(
+                    lambda client: len(client.domains.all()), clients))
+            finally:
+                executor.shutdown(wait=True)
+            self.assertEqual(counts, [0, 3] * 10)
+            domain = second.domains.get("example-1.com")
+            self.assertIs(domain.client, second)
+            self.assertEqual([d.name for d in second.domains][:1],
+                             ["example-0.com"])
+            self.assertRaises(InvalidArgumentError, Domain.get,
+                              "example-1.com")
+            self.assertEqual(Domain.get("example-1.com", client=second)
+                             .name, "example-1.com")
+            self.assertRaises(InvalidArgumentError,
+                              self.client.domains.get, "example-1.com")
+            second.close()
+
+    def test_domain_record_sync(self):
+        """Test zone syncs write only the difference"""
+        domain = self.client.create_domain("sync.example.com",
+                                           "203.0.113.10")
+        domain = self.client.get_domain("sync.example.com")
+        try:
+            self.assertEqual(len(domain.records.find(type="NS")), 3)
+            desired = [
+                {"type": "A", "name": "@", "data": "203.0.113.10"},
+                {"type": "A", "name": "www", "data": "203.0.113.11"},
+                {"type": "CNAME", "name": "api", "data": "@"},
+                {"type": "MX", "name": "@", "data": "mail.example.net",
+                 "priority": 10},
+            ]
+            result = domain.sync_records(desired)
+            self.assertEqual(len(result["created"]), 3)
+            self.assertEqual(result["errors"], [])
+            self.assertEqual(len(domain.records), 8)
+            for record in result["created"]:
+                self.assertIs(domain.records.get(record.id), record)
+
+            before = self.server.count() - self.server.count("GET")
+            result = domain.sync_records(desired)
+            self.assertEqual(self.server.count() - self.server.count("GET"),
+                             before)
+            self.assertEqual((result["created"], result["updated"],
+                              result["deleted"]), ([], [], []))
+
+            desired[1]["data"] = "203.0.113.12"
+            desired[3]["priority"] = 20
+            del desired[2]
+            plan = domain.sync_records(desired, dry_run=True)
+            self.assertEqual(len(plan["updated"]), 2)
+            self.assertEqual([r.name for r in plan["deleted"]], ["api"])
+            result = domain.sync_records(desired)
+            self.assertEqual(self.server.count("PUT"), 2)
+            self.assertEqual(len(result["deleted"]), 1)
+            zone = self.client.get_domain("sync.example.com").records
+            self.assertEqual(zone.find(name="www")[0].data,
+                             "203.0.113.12")
+            self.assertEqual(zone.find(type="MX")[0].priority, 20)
+            self.assertEqual(len(zone.find(type="NS")), 3)
+            self.assertEqual(zone.find(name="api"), [])
+            self.assertEqual(len(domain.records.find(name="www")), 1)
+            self.assertEqual(domain.records.find(name="api"), [])
+
+            fresh = self.client.get_domain("sync.example.com")
+            record = fresh.create_record(
+                {"type": "TXT", "name": "@", "data": "v=spf1 -all"})
+            self.assertEqual(fresh.records.get(record.id).data,
+                             "v=spf1 -all")
+            before = self.server.count("GET")
+            fresh.delete_record(record.id)
+            self.assertIsNone(fresh.records.get(record.id))
+            self.assertEqual(len(fresh.records), 7)
+            self.assertEqual(self.server.count("GET"), before)
+        finally:
+            self.client.delete_domain("sync.example.com")
+
+    def test_ssh_key_registry(self):
+        """Test SSH key lookups, incremental sync and name resolution"""
+        client = self.client
+        keys = list(self.server.ssh_keys)
+        fingerprint = keys[1]["fingerprint"]
+        self.assertEqual(client.get_ssh_key("key-0").id, 900)
+        self.assertEqual(client.get_ssh_key(fingerprint).name, "key-1")
+        self.assertIsNone(client.get_ssh_key("key-9"))
+        self.assertEqual(len(client.get_ssh_keys()), 2)
+
+        before = self.server.count("GET", "account/keys")
+        self.assertEqual(client.resolve_ssh_keys(["key-1", 900]),
+                         [901, 900])
+        droplet = client.create_droplet("keyed", "nyc3", "s-1vcpu-1gb",
+                                        "ubuntu", ssh_keys=["key-0"])
+        self.assertEqual(self.server.count("GET", "account/keys"), before)
+        droplet.delete()
+
+        try:
+            self.server.ssh_keys = [dict(keys[0], name="key-zero"), {
+                "id": 950, "name": "key-new", "fingerprint": "ff:ee",
+                "public_key": "ssh-rsa BBBB key-new"}]
+            added, removed = client.ssh_key_registry.sync(
+                client.iter_ssh_keys())
+            self.assertEqual([key.id for key in added], [900, 950])
+            self.assertEqual([key.id for key in removed], [901])
+            self.assertIsNone(client.get_ssh_key("key-0"))
+            self.assertIsNone(client.get_ssh_key(fingerprint))
+            self.server.ssh_keys.append(dict(keys[1], id=951))
+            self.assertEqual(client.resolve_ssh_keys(["key-1"]), [951])
+            self.assertRaises(InvalidArgumentError,
+                              client.resolve_ssh_keys, ["missing"])
+        finally:
+            self.server.ssh_keys = keys
+
+    def test_client_pool(self):
+        """Test accounts stay separate behind one merged view"""
+        other = FakeAPIServer(ssh_keys=1, domains=2)
+        other.token = "other-token"
+        other.droplets = [make_droplet(5000 + idx) for idx in range(3)]
+        with other.start():
+            pool = DOClientPool({
+                "main": {"token": self.server.token,
+                         "api_base": self.server.api_base},
+                "other": {"token": other.token,
+                          "api_base": other.api_base},
+                "revoked": {"token": "revoked",
+                            "api_base": other.api_base}
+            }, concurrency=3)
+            with pool:
+                self.assertEqual(sorted(pool.errors), ["revoked"])
+                self.assertIsInstance(pool.errors["revoked"], APIAuthError)
+                self.assertEqual(len(pool["main"].ssh_keys), 2)
+                self.assertEqual(len(pool["other"].ssh_keys), 1)
+                self.assertIs(pool["main"].session, pool["other"].session)
+                self.assertEqual(len(pool["other"].get_domains()), 2)
+
+                before = self.server.count() + other.count()
+                self.assertEqual(len(pool.droplets), 253)
+                self.assertEqual(pool.get_droplet(105001).name,
+                                 "droplet-05001")
+                self.assertEqual(pool.account_of(105001), "other")
+                self.assertEqual(pool.account_of(100001), "main")
+                self.assertEqual(
+                    len(pool.filter_droplets("droplet-050", prefix=True)),
+                    3)
+                self.assertEqual(self.server.count() + other.count(),
+                                 before)
+
+                pool["other"].forget_droplets([105001])
+                self.assertIsNone(pool.account_of(105001))
+                self.assertEqual(len(pool.droplets), 252)
+                pool["main"].close()
+                self.assertIs(pool["main"].session, pool.session)
+
+            pool = DOClientPool([self.server.token, "revoked"],
+                                api_base=self.server.api_base)
+            with pool:
+                self.assertEqual(list(pool), ["account-0", "account-1"])
+                self.assertEqual(list(pool.errors), ["account-1"])
+                self.assertEqual(pool.account_of(100001), "account-0")
+
+    def test_inventory_store(self):
+        """Test warm starts from a persisted inventory snapshot"""
+        with TemporaryDirectory() as directory:
+            path = join(directory, "inventory.db")
+            client = DOClient(self.server.token, store=InventoryStore(path),
+                              api_base=self.server.api_base)
+            client.get_sizes()
+            client.close()
+
+            sizes = len(self.client.get_sizes())
+            before = self.server.count()
+            store = InventoryStore(path, max_age=60)
+            client = DOClient(self.server.token, store=store,
+                              api_base=self.server.api_base)
+            self.assertEqual(len(client.droplets), 250)
+            self.assertEqual(client.user.droplet_count, 250)
+            self.assertEqual(client.get_ssh_key(901).id, 901)
+            self.assertEqual(client.id, self.client.id)
+            self.assertEqual(len(client.get_sizes()), sizes)
+            self.assertLess(client.inventory_age, 60)
+            self.assertEqual(self.server.count(), before)
+
+            client.reconcile(background=True).result()
+            self.assertGreater(self.server.count(), before)
+            client.forget_droplets([100001])
+            rows = store.get_many(client._store_key, "droplet:")
+            self.assertEqual(len(rows), 249)
+            self.assertNotIn("droplet:100001", rows)
+            restored = DOClient(self.server.token, store=store, lazy=True,
+                                api_base=self.server.api_base)
+            self.assertEqual(len(restored.droplets), 249)
+
+            stale = DOClient(self.server.token, lazy=True,
+                             store=InventoryStore(path, max_age=0),
+                             api_base=self.server.api_base)
+            self.assertIsNone(stale._droplets)
+            self.assertIsNone(stale.inventory_age)
+            other = DOClient("other-token", store=store, lazy=True,
+                             api_base=self.server.api_base)
+            self.assertIsNone(other._droplets)
+
+            catalog = store.catalog_cache("cache-account", max_entries=2)
+            for key in ("sizes", "regions", "kernels:1"):
+                catalog.set(key, [key])
+            store._connection.execute(
+                "UPDATE inventory SET payload = '[\"kept\"]' "
+                "WHERE resource = 'catalog:kernels:1'")
+            catalog.set("images", ["images"])
+            self.assertEqual(
+                sorted(store.get_many("cache-account", "catalog:")),
+                ["catalog:images", "catalog:kernels:1"])
+            self.assertEqual(store.get("cache-account",
+                                       "catalog:kernels:1")[1],
+                             ["kept"])
+            catalog.invalidate("kernels")
+            self.assertEqual(list(store.get_many("cache-account",
+                                                 "catalog:")),
+                             ["catalog:images"])
+            store.close()
+
+    def test_droplet_watcher(self):
+        """Test watchers diff polls into typed droplet events"""
+        server = FakeAPIServer(droplets=20)
+        client = DOClient(server.token, api_base=server.memory_api_base,
+                          transport=server.transport())
+        watcher = client.watcher
+        self.assertIs(client.watcher, watcher)
+        self.assertEqual(watcher.poll(), [])
+        self.assertEqual(watcher.interval, watcher.idle_interval)
+
+        server.droplets[0]["status"] = "off"
+        server.droplets[1]["networks"]["v4"][0]["ip_address"] = "10.9.9.9"
+        server.droplets[2]["memory"] = 4096
+        del server.droplets[3]
+        server.create_droplet("added", "nyc3", "s-1vcpu-1gb", "ubuntu")
+        events = dict(((event.type, event.droplet.id), event)
+                      for event in watcher.poll())
+        self.assertEqual(sorted(events), [
+            ("added", 100020), ("addresses", 100001), ("changed", 100002),
+            ("removed", 100003), ("status", 100000)])
+        self.assertEqual((events["status", 100000].old,
+                          events["status", 100000].new), ("active", "off"))
+        self.assertIn("10.9.9.9", events["addresses", 100001].new)
+        self.assertEqual(watcher.interval, watcher.busy_interval)
+        self.assertEqual(watcher.poll(), [])
+        self.assertEqual(watcher.interval, watcher.busy_interval)
+        server.droplets[-1]["status"] = "active"
+        self.assertEqual([event.type for event in watcher.poll()],
+                         ["status"])
+        self.assertEqual(watcher.poll(), [])
+        self.assertGreater(watcher.interval, watcher.busy_interval)
+
+        watcher.busy_interval, watcher.idle_interval = 0.01, 0.05
+        seen = []
+        watcher.subscribe(seen.append, types=("removed",))
+        events = watcher.events(types=("status",), timeout=2)
+        self.assertEqual(len(watcher._subscribers), 1)
+
+        def change():
+            """Change droplets once the iterator is subscribed"""
+            while len(watcher._subscribers) < 2:
+                sleep(0.001)
+            client.poweroff_droplet(100005)
+            server.find_droplet(100004)["status"] = "off"
+
+        with ThreadPoolExecutor(1) as executor:
+            executor.submit(change)
+            changed = set()
+            while 100004 not in changed:
+                event = next(events)
+                changed.add(event.droplet.id)
+                self.assertEqual(event.new, "off")
+        events.close()
+        self.assertTrue(watcher.running)
+        self.assertEqual(seen, [])
+
+        watcher.max_queued = 1
+        events = watcher.events(types=("removed",), timeout=0.1)
+
+        def removed(droplet_id):
+            """Hand the iterator a removed event"""
+            watcher._subscribers[-1][0](DropletEvent(
+                "removed", client.get_droplet(droplet_id)))
+
+        def first():
+            """Queue the first event once the iterator is subscribed"""
+            while len(watcher._subscribers) < 2:
+                sleep(0.001)
+            removed(100006)
+
+        with ThreadPoolExecutor(1) as executor:
+            executor.submit(first)
+            self.assertEqual(next(events).droplet.id, 100006)
+        removed(100007)
+        removed(100008)
+        self.assertEqual([event.droplet.id for event in events], [100007])
+        self.assertEqual(len(watcher._subscribers), 1)
+
+        client.transport.routes.insert(0, (
+            "GET", re_compile("droplets"),
+            lambda request: (502, b"<html>Bad Gateway</html>")))
+        watcher.poke()
+        deadline = time() + 5
+        while watcher.errors < 2 and time() < deadline:
+            sleep(0.01)
+        self.assertGreaterEqual(watcher.errors, 2)
+        self.assertTrue(watcher.running)
+        del client.transport.routes[0]
+        watcher.poke()
+        while watcher.errors and time() < deadline:
+            sleep(0.01)
+        self.assertEqual(watcher.errors, 0)
+        client.close()
+        self.assertFalse(watcher.running)
+        with self.assertRaises(InvalidArgumentError):
+            watcher.subscribe(print, types=("moved",))
+
+    def test_map_droplets(self):
+        """Test fleet-wide per-droplet queries and neighbour reports"""
+        server = FakeAPIServer(droplets=60, snapshots=2)
+        server.neighbours = [[100001, 100002], [100010, 100011, 100099]]
+        client = DOClient(server.token, api_base=server.memory_api_base,
+                          transport=server.transport())
+        done = []
+        results = client.map_droplets(
+            lambda droplet: droplet.get_snapshots(), concurrency=8,
+            progress=lambda count, total: done.append((count, total)))
+        self.assertEqual([result[0].name for result in results],
+                         ["snapshot-{0}-0".format(droplet.id)
+                          for droplet in client.droplets])
+        self.assertEqual(done, [(count, 60) for count in range(1, 61)])
+
+        def fail(droplet):
+            """Fail for odd droplet IDs"""
+            if droplet.id % 2:
+                raise APIError("odd droplet")
+            return droplet.id
+        results = client.map_droplets(fail, client.droplets[:4])
+        self.assertEqual(results[0], 100000)
+        self.assertIsInstance(results[1], APIError)
+
+        before = server.count()
+        neighbours = client.get_all_neighbours()
+        self.assertEqual(server.count(), before + 1)
+        self.assertEqual(sorted(neighbours), [100001, 100002, 100010,
+                                              100011])
+        self.assertEqual([droplet.id for droplet in neighbours[100001]],
+                         [100002])
+        self.assertEqual([droplet.id for droplet in
+                          client.get_droplet(100001).get_neighbours()],
+                         [100002])
+
+        reserve = client.rate_limiter.remaining - 3
+        results = client.map_droplets(lambda droplet: droplet.id,
+                                      reserve=reserve)
+        self.assertEqual(results, [droplet.id
+                                   for droplet in client.droplets])
+        results = client.map_droplets(
+            lambda droplet: droplet.get_kernels(), concurrency=1,
+            reserve=reserve)
+        self.assertEqual(len([result for result in results
+                              if isinstance(result, RateLimitError)]), 57)
+
+    def test_transports(self):
+        """Test clients over in-memory and urllib3 transports"""
+        server = FakeAPIServer(droplets=30, ssh_keys=1)
+        client = DOClient(server.token, api_base=server.memory_api_base,
+                          transport=server.transport())
+        self.assertEqual(len(client.droplets), 30)
+        self.assertEqual(len(client.ssh_keys), 1)
+        self.assertEqual(client.get_droplet(100003).name, "droplet-00003")
+        self.assertEqual(len(list(client.iter_droplets(stream=True))), 30)
+        client.close()
+
+        transport = InMemoryTransport()
+        transport.add("GET", "account", {"account": {"uuid": "u-1"}})
+        transport.add("GET", r"droplets/(\d+)", lambda request: (
+            200, {"droplet": {"id": int(request.groups[0])}}))
+        client = DOClient("token", transport=transport, lazy=True)
+        self.assertEqual(client.id, "u-1")
+        response = client.api_request(url="droplets/100007")
+        self.assertEqual(response["droplet"]["id"], 100007)
+        self.assertEqual(client.api_request(url="images")["id"],
+                         "not_found")
+        self.assertEqual(transport.requests[-1], ("GET", "images"))
+
+        released = []
+
+        class Raw(object):
+            """Streamed body recording connection releases"""
+            def read(self):
+                return b"{}"
+
+            def release_conn(self):
+                released.append(self)
+
+        replies = [Response(429, {"retry-after": "0"}, raw=Raw()),
+                   Response(401, raw=Raw())]
+        client = DOClient("token", lazy=True, transport=InMemoryTransport(
+            handler=lambda request: replies.pop(0)))
+        self.assertRaises(APIAuthError, client.api_request, "droplets",
+                          stream=True)
+        self.assertEqual(len(released), 2)
+
+        client = DOClient(self.server.token, api_base=self.server.api_base,
+                          transport=Urllib3Transport())
+        self.assertEqual(len(client.droplets), 250)
+        self.assertEqual(client.user.droplet_count, 250)
+        client.close()
+        with self.assertRaises(InvalidArgumentError):
+            DOClient(self.server.token, transport=object())
+
+
+@unittest.skipIf(aiohttp is None, "aiohttp is not installed")
+class AsyncDOClientTest(unittest.TestCase):
+
+    """Tests for the asyncio client against a local stand-in API"""
+
+    server = None
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeAPIServer(droplets=250, snapshots=2,
+                                   ssh_keys=2, domains=1).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def run_client(self, coroutine_function, **kwargs):
+        """Run a coroutine function with an entered client"""
+        async def runner():
+            async with AsyncDOClient(self.server.token,
+                                     api_base=self.server.api_base,
+                                     **kwargs) as client:
+                return await coroutine_function(client)
+        return asyncio.run(runner())
+
+    def test_load(self):
+        """Test async client loads account state on entry"""
+        async def check(client):
+            self.assertEqual(len(client.droplets), 250)
+            self.assertEqual(client.user.droplet_count, 250)
+            self.assertEqual(len(client.ssh_keys), 2)
+            ids = [droplet.id async for droplet in
+                   client.iter_droplets(concurrency=1)]
+            self.assertEqual(ids, [d.id for d in client.droplets])
+        self.run_client(check)
+
+    def test_bulk_power_actions(self):
+        """Test gather-friendly bulk power helpers"""
+        async def check(client):
+            ids = [100000, 100001, 999]
+            return await client.poweroff_droplets(ids, concurrency=2)
+        results = self.run_client(check, lazy=True)
+        self.assertEqual(results[0]["message"], "Initiated droplet poweroff")
+        self.assertEqual(results[0]["action"].type, "power_off")
+        self.assertEqual(results[2], {"message": "Droplet not found"})
+
+    def test_action_waits(self):
+        """Test awaiting action handles of the async client"""
+        self.server.action_duration = 0.02
+
+        async def check(client):
+            client.action_poll_interval = 0.01
+            result = await client.poweron_droplet(100002)
+            action = await result["action"].wait(timeout=5)
+            self.assertEqual(action.status, "completed")
+            await action.refresh()
+            self.assertTrue(action.done)
+            results = await client.poweron_droplets(
+                [100003, 100004, 100005])
+            actions = await client.wait_all(
+                [result["action"] for result in results], timeout=5)
+            self.assertTrue(all(action.done for action in actions))
+            action = await client.wait_for_action(action.id)
+            self.assertEqual(action.type, "power_on")
+        try:
+            self.run_client(check, lazy=True)
+        finally:
+            self.server.action_duration = 0.0
+
+    def test_snapshots_kernels_domains(self):
+        """Test per-droplet listings and domain helpers"""
+        async def check(client):
+            snapshots, kernels, domains = await asyncio.gather(
+                client.get_droplet_snapshots(100000),
+                client.get_droplet_kernels(100000),
+                client.get_domains())
+            self.assertEqual(len(snapshots), 2)
+            self.assertEqual(len(kernels), 3)
+            self.assertIsInstance(domains[0], Domain)
+            await client.create_domain("async.example.com", "1.2.3.4")
+            domain = await client.get_domain("async.example.com")
+            self.assertEqual(domain.name, "async.example.com")
+            await client.delete_domain("async.example.com")
+        self.run_client(check, lazy=True)
+
+    def test_coalesced_gets(self):
+        """Test concurrent identical GETs share one request"""
+        async def check(client):
+            before = self.server.count("GET", "regions")
+            results = await asyncio.gather(
+                *[client.get_regions() for _ in range(5)])
+            self.assertEqual(self.server.count("GET", "regions") - before,
+                             1)
+            self.assertEqual(client.single_flight.shared, 4)
+            self.assertTrue(all(len(regions) == 2 for regions in results))
+        self.run_client(check, lazy=True)
+
+    def test_domain_record_sync(self):
+        """Test async zone syncs write only the difference"""
+        async def check(client):
+            await client.create_domain("records.example.com",
+                                       "203.0.113.20")
+            desired = "www 300 IN A 203.0.113.21\n" \
+                "@ IN A 203.0.113.20\n"
+            result = await client.sync_domain_records(
+                "records.example.com", desired)
+            self.assertEqual([r.name for r in result["created"]], ["www"])
+            result = await client.sync_domain_records(
+                "records.example.com", desired, dry_run=True)
+            self.assertEqual((result["created"], result["updated"],
+                              result["deleted"]), ([], [], []))
+            records = await client.get_domain_records("records.example.com")
+            self.assertEqual(len(records), 6)
+            await client.delete_domain("records.example.com")
+        self.run_client(check, lazy=True)
+
+    def test_create_droplets(self):
+        """Test droplet create helpers"""
+        async def check(client):
+            droplets = await client.create_droplets(
+                ["a-1", "a-2"], "nyc3", "s-1vcpu-1gb", "ubuntu")
+            self.assertEqual([d.name for d in droplets], ["a-1", "a-2"])
+            for droplet in droplets:
+                await client.delete_droplet(droplet.id)
+        self.run_client(check, lazy=True)
+
+    def test_delete_droplet(self):
+        """Test droplet deletes check the reply and the inventory"""
+        async def check(client):
+            droplets = await client.create_droplets(
+                ["d-1", "d-2"], "nyc3", "s-1vcpu-1gb", "ubuntu")
+            count = len(client.droplets)
+            self.assertIn("Successfully", (await client.delete_droplet(
+                str(droplets[0].id)))["message"])
+            self.assertEqual(len(client.droplets), count - 1)
+            self.assertNotIn(droplets[0].id,
+                             [droplet.id for droplet in client.droplets])
+            with self.assertRaises(InvalidArgumentError):
+                await client.delete_droplet(999999)
+            client.droplets = None
+            self.assertNotIn("Successfully", (await client.delete_droplet(
+                999999))["message"])
+            await client.delete_droplet(droplets[1].id)
+        self.run_client(check)
+
+
 if __name__ == "__main__":
     unittest.main()